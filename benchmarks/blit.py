@@ -0,0 +1,67 @@
+"""
+Замер blit'ов и поворотов картинок в исходном формате и после ImageManager.convert_all. Окно создается с
+драйвером SDL dummy. Запуск из корня проекта:
+
+python -m benchmarks.blit
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import random
+
+from time import perf_counter
+from typing import List
+
+import pygame
+
+from utils.image import ImageManager
+
+BLITS = 20000
+ROTATIONS = 500
+IMAGE_NAMES = [
+    'level.simple_planet.wall',
+    'level.simple_planet.floor2',
+    'enemy.simple.range',
+    'moving_objects.bullet.shotgun_bullet',
+    'moving_objects.particles.particle23',
+    'level_objects.boxes.box_wood',
+]
+
+
+def measure(images: List[pygame.Surface], screen: pygame.Surface) -> (float, float):
+    """
+    :return: (blit'ов в миллисекунду, поворотов в миллисекунду)
+    """
+    random.seed(1)
+    positions = [(random.randint(0, screen.get_width()), random.randint(0, screen.get_height()))
+                 for i in range(BLITS)]
+
+    start = perf_counter()
+    for k in range(BLITS):
+        screen.blit(images[k % len(images)], positions[k])
+    blits = BLITS / ((perf_counter() - start) * 1000)
+
+    start = perf_counter()
+    for k in range(ROTATIONS):
+        ImageManager.rotate(images[k % len(images)], k * 0.1)
+    rotations = ROTATIONS / ((perf_counter() - start) * 1000)
+    return blits, rotations
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((1000, 700))
+    ImageManager.load_dir(ImageManager.IMAGE_PATH)
+
+    raw = [ImageManager.source_images[name][0] for name in IMAGE_NAMES]
+    ImageManager.convert_all()
+    converted = [ImageManager.get_image(name) for name in IMAGE_NAMES]
+
+    for name, images in (('raw', raw), ('converted', converted)):
+        blits, rotations = measure(images, screen)
+        print('{:<10} {:8.1f} blits/ms   {:6.2f} rotations/ms'.format(name, blits, rotations))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Замер накладных расходов отрисовки спрайта: то же, что делает Bullet.process_draw (ширина картинки,
+is_out_of_screen и process_draw), по названию картинки, по ее handle'у и с разбором пути через get_image на
+каждый вызов, как было до handle'ов. Рисуется на поверхность 1x1, чтобы blit почти ничего не стоил и
+замерялся только поиск картинки. Запуск из корня проекта:
+
+python -m benchmarks.image_handle
+"""
+import random
+
+from time import perf_counter
+from typing import List
+
+import pygame
+
+from benchmarks.path_finder import report
+from geometry.point import Point
+from geometry.rectangle import intersect, Rectangle
+from utils.image import ImageManager
+
+FRAMES = 200
+SCREEN_SIZE = (1280, 720)
+SPRITES = [
+    ('moving_objects.bullet.rifle_bullet', 0.6, 300),
+    ('enemy.simple.range', 1.2, 50),
+]
+
+
+def draw_by_path(image_name: str, zoom: float, pos: Point, screen: pygame.Surface, screen_rectangle: Rectangle):
+    """
+    Отрисовка, в которой каждый запрос размера и картинки разбирает путь заново.
+    """
+    pos = pos - Point(ImageManager.get_image(image_name).get_width() * zoom // 2, 0)
+    rectangle = Rectangle(0, 0, ImageManager.get_image(image_name).get_width() * zoom,
+                          ImageManager.get_image(image_name).get_height() * zoom)
+    rectangle.center = pos
+    if intersect(rectangle, screen_rectangle).is_empty():
+        return
+    ImageManager.get_image(image_name)
+    ImageManager.draw_surface(ImageManager.get_transformed_image(image_name, zoom, 0), pos, screen)
+
+
+def draw(image, zoom: float, pos: Point, screen: pygame.Surface, screen_rectangle: Rectangle):
+    pos = pos - Point(ImageManager.get_width(image, zoom) // 2, 0)
+    if ImageManager.is_out_of_screen(image, zoom, pos, screen_rectangle):
+        return
+    ImageManager.process_draw(image, pos, screen, zoom, 0)
+
+
+def draw_frames(draw_function, images: List, zooms: List[float], positions: List[Point]) -> List[float]:
+    """
+    :param images: названия картинок или их handle'ы
+    :return: время каждого кадра в миллисекундах
+    """
+    screen = pygame.Surface((1, 1))
+    screen_rectangle = Rectangle(0, 0, *SCREEN_SIZE)
+    result = []
+    for frame in range(FRAMES):
+        start = perf_counter()
+        for image, zoom, pos in zip(images, zooms, positions):
+            draw_function(image, zoom, pos, screen, screen_rectangle)
+        result.append((perf_counter() - start) * 1000)
+    return result
+
+
+def main():
+    ImageManager.load_all()
+    random.seed(1)
+    names, zooms, positions = [], [], []
+    for image_name, zoom, count in SPRITES:
+        for k in range(count):
+            names.append(image_name)
+            zooms.append(zoom)
+            positions.append(Point(random.uniform(0, SCREEN_SIZE[0]), random.uniform(0, SCREEN_SIZE[1])))
+    handles = [ImageManager.get_handle(name) for name in names]
+
+    report('frame with dotted paths', draw_frames(draw_by_path, names, zooms, positions))
+    report('frame by names', draw_frames(draw, names, zooms, positions))
+    report('frame by handles', draw_frames(draw, handles, zooms, positions))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Замер GridIntersectionManager: проход по клеткам вдоль отрезка (DDA) против bfs на коротких и длинных
+отрезках и пакетное пересечение (intersect_segments_walls) против запросов по одному. Запуск из корня проекта:
+
+python -m benchmarks.intersections
+"""
+import random
+
+import numpy as np
+
+from math import cos, sin, pi
+from time import perf_counter
+from typing import List, Callable
+
+from benchmarks.level_stub import StubLevel
+from geometry.point import Point
+from geometry.segment import Segment
+from map.collision_grid.intersection_manager import GridIntersectionManager
+
+SEGMENTS_COUNT = 3000
+
+
+def generate_segments(level: StubLevel, length: float) -> List[Segment]:
+    """
+    Отрезки из клеток пола в случайном направлении, не выходящие за пределы уровня.
+    """
+    floor = level.get_floor_cells()
+    width = len(level.arr[0]) * level.cell_width
+    height = len(level.arr) * level.cell_height
+    result = []
+    while len(result) < SEGMENTS_COUNT:
+        p1 = random.choice(floor) + Point(random.uniform(-5, 5), random.uniform(-5, 5))
+        angle = random.uniform(0, 2 * pi)
+        p2 = p1 + Point(cos(angle), sin(angle)) * length
+        if 0 < p2.x < width and 0 < p2.y < height:
+            result.append(Segment(p1, p2))
+    return result
+
+
+def measure(intersect: Callable[[Segment], Point], segments: List[Segment]) -> float:
+    """
+    :return: среднее время одного запроса в микросекундах
+    """
+    start = perf_counter()
+    for seg in segments:
+        intersect(seg)
+    return (perf_counter() - start) / len(segments) * 10 ** 6
+
+
+def main():
+    level = StubLevel(100, 100, seed=1)
+    manager = GridIntersectionManager(level)
+    random.seed(1)
+
+    # пуля за тик, отрезок до ствола, луч зрения enemy
+    for length in (30, 150, 600):
+        segments = generate_segments(level, length)
+        dda = measure(manager.intersect_seg_walls, segments)
+        bfs = measure(manager.intersect_seg_walls_bfs, segments)
+        print('length {:>4}:   dda {:8.2f} us   bfs {:8.2f} us   x{:.1f}'.format(length, dda, bfs, bfs / dda))
+
+    # залп дробовика с частицами - от десятков до сотен коротких отрезков за тик
+    for count in (20, 100, 500):
+        segments = generate_segments(level, 60)[:count]
+        start = perf_counter()
+        for seg in segments:
+            manager.intersect_seg_walls(seg)
+        one_by_one = (perf_counter() - start) * 10 ** 6
+
+        start = perf_counter()
+        starts = np.array([(seg.p1.x, seg.p1.y) for seg in segments])
+        ends = np.array([(seg.p2.x, seg.p2.y) for seg in segments])
+        manager.intersect_segments_walls(starts, ends)
+        batch = (perf_counter() - start) * 10 ** 6
+        print('{:>4} segments:   one by one {:8.1f} us   batch {:8.1f} us'.format(count, one_by_one, batch))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Облегченная сетка уровня для замеров: сгенерированный LevelGenerator'ом список клеток без сцены, картинок
+и окна. Отвечает на те же запросы, что и LevelGrid, которые нужны поиску пути и пересечениям.
+"""
+import random
+
+import numpy as np
+
+from typing import List
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+from constants.grid import CELL_SIZE
+from geometry.point import Point
+from geometry.rectangle import Rectangle, create_rectangle_with_left_top
+from map.grid_index_manager import GridIndexManager
+from map.level.map_generator import LevelGenerator
+
+
+class StubPlayer:
+    def __init__(self, pos: Point):
+        self.pos = pos
+
+
+class StubScene:
+    def __init__(self, player: StubPlayer):
+        self.player = player
+
+
+class StubEnemy:
+    def __init__(self, pos: Point):
+        self.pos = pos
+
+
+class StubLevel:
+    """
+    :param width: ширина уровня в клетках
+    :param height: высота уровня в клетках
+    :param seed: зерно генерации
+    """
+
+    def __init__(self, width: int = 100, height: int = 100, seed: int = 0):
+        random.seed(seed)  # замеры дальше выбирают случайные клетки глобальным random
+        self.arr = [[0] * width for i in range(height)]
+        LevelGenerator(self.arr, random.Random(seed)).generate()
+        self.fill_passability()
+
+        self.pos = Point(0, 0)
+        self.cell_width = CELL_SIZE
+        self.cell_height = CELL_SIZE
+        self.scene = StubScene(StubPlayer(Point(0, 0)))
+        self.index_manager = GridIndexManager(self, self.pos, CELL_SIZE, CELL_SIZE)
+
+    def fill_passability(self):
+        """
+        Карта проходимости, как в CollisionGrid. Нужно вызвать заново, если arr поменялся.
+        """
+        self.passability = bytearray(bool(item) for row in self.arr for item in row)
+        self.passability_map = np.frombuffer(self.passability, dtype=np.uint8).reshape(len(self.arr), len(self.arr[0]))
+
+    def is_passable(self, i: int, j: int) -> bool:
+        return self.passability[i * len(self.arr[0]) + j] == 1
+
+    def get_collision_rect(self, i: int, j: int) -> Rectangle:
+        return create_rectangle_with_left_top(Point(j * self.cell_width, i * self.cell_height) + self.pos,
+                                              self.cell_width, self.cell_height)
+
+    def get_center_of_cell_by_indexes(self, i: int, j: int) -> Point:
+        return self.index_manager.get_center_of_cell_by_indexes(i, j)
+
+    def get_index_by_pos(self, pos: Point):
+        return self.index_manager.get_index_by_pos(pos)
+
+    def get_floor_cells(self) -> List[Point]:
+        """
+        Центры всех клеток пола, вокруг которых нет стен.
+        """
+        result = []
+        for i in range(1, len(self.arr) - 1):
+            for j in range(1, len(self.arr[i]) - 1):
+                if all(self.arr[i + di][j + dj] for di in (-1, 0, 1) for dj in (-1, 0, 1)):
+                    result.append(self.get_center_of_cell_by_indexes(i, j))
+        return result
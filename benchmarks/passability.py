@@ -0,0 +1,80 @@
+"""
+Замер запросов проходимости на настоящем LevelGrid 100x100: is_passable по всем клеткам, построение
+GridPathFinder и один тик поиска пути.
+Окно и звук не нужны (SDL dummy). Запуск из корня проекта:
+
+python -m benchmarks.passability
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import random
+import tempfile
+
+from time import perf_counter
+
+from benchmarks.level_stub import StubPlayer
+from benchmarks.path_finder import report
+from drawable_objects.enemy import Enemy
+from enemy_interaction_with_grid.hearing.path_finder import GridPathFinder
+from game import Game
+from geometry.point import Point
+from map.level.grid import LevelGrid
+from scenes.game.level import LevelScene
+from utils.game_data_manager import GameDataManager
+
+REPEATS = 20
+BIOM = 1
+
+
+def create_level_grid(seed: int) -> LevelGrid:
+    GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+    game = Game()
+    scene = LevelScene(game, 'benchmark')
+    game.random_manager.seed = seed
+    grid = LevelGrid(scene, game.controller, Point(0, 0))
+    grid.biom = BIOM
+    grid.initialize()
+    scene.grid = grid
+    return grid
+
+
+def main():
+    grid = create_level_grid(1)
+    floor = [grid.get_center_of_cell_by_indexes(i, j)
+             for i in range(len(grid.arr)) for j in range(len(grid.arr[i])) if grid.is_passable(i, j)]
+
+    all_cells = []
+    for k in range(REPEATS):
+        start = perf_counter()
+        for i in range(len(grid.arr)):
+            for j in range(len(grid.arr[i])):
+                grid.is_passable(i, j)
+        all_cells.append((perf_counter() - start) * 1000)
+    report('is_passable for every cell', all_cells)
+
+    construction = []
+    for k in range(REPEATS):
+        start = perf_counter()
+        path_finder = GridPathFinder(grid)
+        construction.append((perf_counter() - start) * 1000)
+    report('GridPathFinder construction', construction)
+
+    random.seed(1)
+    grid.scene.player = StubPlayer(random.choice(floor))
+    enemies = grid.scene.enemies
+    tick = []
+    for k in range(REPEATS):
+        grid.scene.player.pos = random.choice(floor)
+        start = perf_counter()
+        for enemy in enemies:
+            path_finder.save_enemy_pos(enemy.pos)
+        path_finder.update_path_to_enemies(Enemy.HEARING_RANGE)
+        tick.append((perf_counter() - start) * 1000)
+    report('pathfinding tick, player moves', tick)
+
+
+if __name__ == '__main__':
+    main()
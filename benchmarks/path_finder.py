@@ -0,0 +1,63 @@
+"""
+Замер стоимости тика GridPathFinder.update_path_to_enemies. Запуск из корня проекта:
+
+python -m benchmarks.path_finder
+"""
+import random
+
+from time import perf_counter
+from typing import List
+
+from benchmarks.level_stub import StubLevel, StubEnemy
+from drawable_objects.enemy import Enemy
+from enemy_interaction_with_grid.hearing.path_finder import GridPathFinder
+
+TICKS = 300
+ENEMIES_COUNT = 50
+
+
+def run_ticks(level: StubLevel, path_finder: GridPathFinder, enemies: List[StubEnemy],
+              move_player: bool, move_enemies: bool) -> List[float]:
+    """
+    :return: время каждого тика в миллисекундах
+    """
+    floor = level.get_floor_cells()
+    result = []
+    for tick in range(TICKS):
+        if move_player:
+            level.scene.player.pos = random.choice(floor)
+        if move_enemies:
+            random.choice(enemies).pos = random.choice(floor)
+
+        start = perf_counter()
+        path_finder.update_path_to_enemies(Enemy.HEARING_RANGE)
+        for enemy in enemies:
+            path_finder.save_enemy_pos(enemy.pos)
+        result.append((perf_counter() - start) * 1000)
+    return result
+
+
+def report(name: str, times: List[float]):
+    times = sorted(times)
+    print('{:<40} median {:8.3f} ms   p95 {:8.3f} ms   max {:8.3f} ms'.format(
+        name, times[len(times) // 2], times[int(len(times) * 0.95)], times[-1]))
+
+
+def main():
+    level = StubLevel(100, 100, seed=1)
+    floor = level.get_floor_cells()
+    random.seed(1)
+    level.scene.player.pos = random.choice(floor)
+    enemies = [StubEnemy(random.choice(floor)) for i in range(ENEMIES_COUNT)]
+
+    start = perf_counter()
+    path_finder = GridPathFinder(level)
+    print('construction: {:.3f} ms'.format((perf_counter() - start) * 1000))
+
+    report('player and enemies stand still', run_ticks(level, path_finder, enemies, False, False))
+    report('player stands still, one enemy moves', run_ticks(level, path_finder, enemies, False, True))
+    report('player moves every tick', run_ticks(level, path_finder, enemies, True, False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,428 @@
+"""
+Эталонные игровые сценарии для замеров производительности. Каждый сценарий строится в безоконной игре
+(Game(headless=True)) с фиксированным seed, так что при каждом запуске работа одна и та же. Замеряется время
+каждого тика сценария; результат - медиана и 95-й перцентиль времени тика и пиковая память процесса, в JSON.
+
+Каждый сценарий запускается в отдельном процессе: так пиковая память относится только к нему, а состояние
+одного сценария (кэши картинок, счетчики) не влияет на другие.
+
+Сценарии:
+
+- demo_aggro: DemoLevel 75x50, на котором 50 врагов, все агрессивны; тик - тик логики игры;
+- shotgun_firefight: уровень планеты, игрок каждый тик стреляет из дробовика по врагам - сотни пуль и частиц;
+- idle_crowd: уровень планеты, на котором 150 врагов, игрок стоит у входа; большинство врагов далеко и
+  бездействует (EnemyScheduler);
+- generation_500: генерация уровня LevelGrid 500x500; тик - одна генерация;
+- spacemap_1000: генерация звездной карты из 1000 планет; тик - одна генерация. Расталкивание центров
+  планет стоит O(планет^2) за итерацию, поэтому здесь делается SPACEMAP_ITERATIONS итераций вместо
+  CentersArranger.ITERATIONS. Сила отталкивания планет уменьшена во столько же раз, во сколько планет больше
+  обычного: иначе они разлетаются за пределы космоса;
+- save_load: полностью исследованный космос (уровни всех планет сгенерированы); тик - высадка на следующую
+  планету: сохранение текущего уровня и загрузка следующего.
+
+Запуск из корня проекта:
+
+python -m benchmarks.scenarios                                  # все сценарии
+python -m benchmarks.scenarios --scenario demo_aggro            # один сценарий
+python -m benchmarks.scenarios --output baseline.json           # сохранить результат как эталон
+python -m benchmarks.scenarios --compare baseline.json          # сравнить с эталоном
+
+В режиме сравнения сценарий считается регрессией, если медиана или 95-й перцентиль хуже эталона больше чем
+на --threshold (доля, по умолчанию 0.15); тогда код выхода 1.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+
+from random import Random
+from time import perf_counter
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+import simulate
+from constants.grid import CELL_SIZE
+from game import Game
+from geometry.point import Point
+from geometry.vector import vector_from_length_angle
+from map.level.grid import LevelGrid
+from map.level.objects_generator import create_enemy
+from map.level.settings import level_settings
+from scenes.game.level import LevelScene
+from scenes.game.main import MainScene
+from scenes.game.spacemap import SpacemapScene
+from space.centers_arranger import CentersArranger
+from space.planets_generator import PlanetsGenerator
+from utils.game_data_manager import GameDataManager
+
+SEED = 1
+THRESHOLD = 0.15
+
+DEMO_ENEMIES_COUNT = 50
+FIREFIGHT_PLANET_NUMBER = 1
+IDLE_ENEMIES_COUNT = 150
+GENERATION_SIZE = 500
+SPACEMAP_PLANETS_NUMBER = 1000
+SPACEMAP_ITERATIONS = 1
+
+
+def get_peak_memory() -> Optional[float]:
+    """
+    Пиковый размер процесса в памяти (МБ) или None, если его нельзя узнать.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':  # в байтах, а не в килобайтах
+        peak /= 1024
+    return peak / 1024
+
+
+def get_percentile(times: List[float], ratio: float) -> float:
+    times = sorted(times)
+    return times[min(int(len(times) * ratio), len(times) - 1)]
+
+
+class Scenario:
+    """
+    Базовый класс сценария. setup строит сценарий, затем WARMUP_TICKS тиков не замеряются (прогрев кэшей),
+    затем замеряются TICKS тиков, в конце вызывается teardown.
+
+    :param seed: seed космоса и всех случайных решений сценария
+    """
+    NAME = ''
+    TICKS = 300
+    WARMUP_TICKS = 10
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.random = Random(seed)
+        self.game = None
+
+    def create_game(self):
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        self.game = Game(headless=True, seed=self.seed)
+
+    def setup(self):
+        pass
+
+    def tick(self):
+        pass
+
+    def teardown(self):
+        pass
+
+    def check_scene(self, scene):
+        """
+        Замеры имеют смысл, только пока игра на сцене сценария (игрок, например, не погиб).
+        """
+        if self.game.current_scene is not scene:
+            raise RuntimeError('сценарий {} ушел со своей сцены на {}'.format(
+                self.NAME, self.game.current_scene.__class__.__name__))
+
+    def get_state(self) -> Dict:
+        """
+        Дополнительные сведения о сценарии для отчета (сколько объектов и т.п.).
+        """
+        return {}
+
+
+class DemoAggroScenario(Scenario):
+    NAME = 'demo_aggro'
+
+    def setup(self):
+        self.create_game()
+        self.scene = simulate.enter_level(self.game, planet_number=0)
+        grid = self.scene.grid
+        settings = level_settings[grid.biom]
+        cells = [(i, j) for i in range(len(grid.arr)) for j in range(len(grid.arr[i]))
+                 if grid.is_enemy_can_stay(i, j)]
+        while len(self.scene.enemies) < DEMO_ENEMIES_COUNT:
+            i, j = self.random.choice(cells)
+            create_enemy(grid, i, j, self.random.choice(settings.enemy_weapons)[1], settings.enemy_img,
+                         self.random.random())
+        for enemy in self.scene.enemies:
+            enemy._is_aggred = True
+
+    def tick(self):
+        self.scene.player.hp = self.scene.player.MAXHP  # игрок в сценарии не должен умирать
+        self.game.simulate(1)
+        self.check_scene(self.scene)
+
+    def get_state(self) -> Dict:
+        return {'enemies': len(self.scene.enemies), 'objects': len(self.scene.game_objects)}
+
+
+class ShotgunFirefightScenario(Scenario):
+    NAME = 'shotgun_firefight'
+    SHOT_ANGLE_STEP = 0.37
+    SHOTS_PER_TICK = 6
+
+    def setup(self):
+        self.create_game()
+        self.scene = simulate.enter_level(self.game, planet_number=FIREFIGHT_PLANET_NUMBER)
+        player = self.scene.player
+        grid = self.scene.grid
+        enemy_index = grid.index_manager.get_index_by_pos(self.scene.enemies[0].pos)
+        player.move(grid.get_center_of_cell_by_indexes(*enemy_index))
+        self.gun = weapons.weapons.WEAPON_VOCABULARY['Shotgun'](player)
+        for enemy in self.scene.enemies:
+            enemy._is_aggred = True
+        self.max_objects = 0
+        self.tick_number = 0
+
+    def tick(self):
+        self.tick_number += 1
+        player = self.scene.player
+        player.hp = player.MAXHP  # игрок в сценарии не должен умирать
+        for shot in range(self.SHOTS_PER_TICK):
+            player.angle = (self.tick_number * self.SHOTS_PER_TICK + shot) * self.SHOT_ANGLE_STEP
+            self.gun.shot(player.pos + vector_from_length_angle(self.gun.barrel_length, player.angle), player.angle)
+        self.game.simulate(1)
+        self.check_scene(self.scene)
+        self.max_objects = max(self.max_objects, len(self.scene.game_objects))
+
+    def get_state(self) -> Dict:
+        return {'enemies': len(self.scene.enemies), 'max_objects': self.max_objects}
+
+
+class IdleCrowdScenario(Scenario):
+    NAME = 'idle_crowd'
+
+    def setup(self):
+        self.create_game()
+        self.scene = simulate.enter_level(self.game, planet_number=FIREFIGHT_PLANET_NUMBER)
+        grid = self.scene.grid
+        settings = level_settings[grid.biom]
+        cells = [(i, j) for i in range(len(grid.arr)) for j in range(len(grid.arr[i]))
+                 if grid.is_enemy_can_stay(i, j)]
+        while len(self.scene.enemies) < IDLE_ENEMIES_COUNT:
+            i, j = self.random.choice(cells)
+            create_enemy(grid, i, j, self.random.choice(settings.enemy_weapons)[1], settings.enemy_img,
+                         self.random.random())
+        self.stats = []
+
+    def tick(self):
+        self.scene.player.hp = self.scene.player.MAXHP  # игрок в сценарии не должен умирать
+        self.game.simulate(1)
+        self.check_scene(self.scene)
+        self.stats.append(self.scene.enemy_scheduler.get_stats())
+
+    def get_state(self) -> Dict:
+        state = {'enemies': len(self.scene.enemies)}
+        for key in ('processed', 'suspended', 'vision_candidates', 'vision_checks', 'vision_deferred'):
+            state[key + '_per_tick'] = sum(stats[key] for stats in self.stats) / len(self.stats)
+        return state
+
+
+class GenerationScenario(Scenario):
+    NAME = 'generation_500'
+    TICKS = 3
+    WARMUP_TICKS = 0
+
+    def setup(self):
+        self.create_game()
+        self.game.file_manager.space_name = simulate.SPACE_NAME
+        self.game.file_manager.create_space_storage()
+        self.game.random_manager.seed = self.seed
+        self.scene = LevelScene(self.game, 'generation')
+
+    def tick(self):
+        grid = LevelGrid(self.scene, self.game.controller, Point(0, 0))
+        grid.biom = 1
+        self.scene.enemies = []
+        self.scene.game_objects = []
+        grid._fill_arr(CELL_SIZE, CELL_SIZE, GENERATION_SIZE, GENERATION_SIZE)
+        self.grid = grid
+
+    def get_state(self) -> Dict:
+        return {'enemies': len(self.scene.enemies), 'objects': len(self.scene.game_objects)}
+
+
+class SpacemapScenario(Scenario):
+    NAME = 'spacemap_1000'
+    TICKS = 3
+    WARMUP_TICKS = 0
+
+    def setup(self):
+        self.create_game()
+        self.game.random_manager.seed = self.seed
+        self.scene = SpacemapScene(self.game)
+        self.constants = (PlanetsGenerator.PLANETS_NUMBER, CentersArranger.ITERATIONS, CentersArranger.PLANET_FORCE)
+        CentersArranger.PLANET_FORCE *= PlanetsGenerator.PLANETS_NUMBER / SPACEMAP_PLANETS_NUMBER
+        PlanetsGenerator.PLANETS_NUMBER = SPACEMAP_PLANETS_NUMBER
+        CentersArranger.ITERATIONS = SPACEMAP_ITERATIONS
+
+    def tick(self):
+        self.planets = PlanetsGenerator(self.game.controller, self.scene).generate()
+
+    def teardown(self):
+        PlanetsGenerator.PLANETS_NUMBER, CentersArranger.ITERATIONS, CentersArranger.PLANET_FORCE = self.constants
+
+    def get_state(self) -> Dict:
+        return {'planets': len(self.planets), 'iterations': SPACEMAP_ITERATIONS}
+
+
+class SaveLoadScenario(Scenario):
+    NAME = 'save_load'
+    TICKS = 40
+    WARMUP_TICKS = 0
+
+    def setup(self):
+        self.create_game()
+        simulate.enter_level(self.game)
+        spacemap = SpacemapScene(self.game)
+        self.game.set_scene(spacemap)
+        self.planet_indexes = [planet.index for planet in spacemap.planets]
+        # высадка на каждую планету строит ее уровень, следующая высадка его сохраняет
+        for index in self.planet_indexes:
+            scene = MainScene(self.game, index)
+            self.game.set_scene(scene)
+            self.game.simulate(1)
+            self.check_scene(scene)
+        scene.save()
+        self.tick_number = 0
+
+    def tick(self):
+        index = self.planet_indexes[self.tick_number % len(self.planet_indexes)]
+        self.tick_number += 1
+        scene = MainScene(self.game, index)
+        self.game.set_scene(scene)
+        self.game.simulate(1)
+        self.check_scene(scene)
+
+    def get_state(self) -> Dict:
+        return {'planets': len(self.planet_indexes)}
+
+
+SCENARIOS = [
+    DemoAggroScenario,
+    ShotgunFirefightScenario,
+    IdleCrowdScenario,
+    GenerationScenario,
+    SpacemapScenario,
+    SaveLoadScenario,
+]
+SCENARIO_NAMES = [scenario_class.NAME for scenario_class in SCENARIOS]
+
+
+def run_scenario(name: str, seed: int = SEED) -> Dict:
+    """
+    Запуск сценария в текущем процессе.
+
+    :return: результат: время тика в миллисекундах (median_ms, p95_ms, max_ms), число тиков, время построения
+        сценария, пиковая память процесса в МБ и сведения о сценарии
+    """
+    scenario = SCENARIOS[SCENARIO_NAMES.index(name)](seed)
+    start = perf_counter()
+    scenario.setup()
+    setup_time = perf_counter() - start
+    for tick in range(scenario.WARMUP_TICKS):
+        scenario.tick()
+    times = []
+    for tick in range(scenario.TICKS):
+        start = perf_counter()
+        scenario.tick()
+        times.append((perf_counter() - start) * 1000)
+    scenario.teardown()
+    return {
+        'ticks': len(times),
+        'median_ms': get_percentile(times, 0.5),
+        'p95_ms': get_percentile(times, 0.95),
+        'max_ms': max(times),
+        'setup_s': setup_time,
+        'peak_memory_mb': get_peak_memory(),
+        'state': scenario.get_state(),
+    }
+
+
+def run_isolated(name: str, seed: int = SEED) -> Dict:
+    """
+    Запуск сценария в отдельном процессе.
+    """
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.scenarios', '--scenario', name,
+                             '--seed', str(seed), '--in-process'],
+                            stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+    # pygame пишет приветствие в stdout, результат - последняя строка
+    return json.loads(output.strip().splitlines()[-1])[name]
+
+
+def compare(results: Dict, baseline: Dict, threshold: float = THRESHOLD) -> List[str]:
+    """
+    Сравнение результатов с эталоном.
+
+    :return: описания регрессий: сценариев, медиана или 95-й перцентиль которых хуже эталона больше чем на
+        threshold
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key in ('median_ms', 'p95_ms'):
+            ratio = result[key] / baseline[name][key]
+            if ratio > 1 + threshold:
+                regressions.append('{}: {} {:.3f} -> {:.3f} ({:+.0%})'.format(
+                    name, key, baseline[name][key], result[key], ratio - 1))
+    return regressions
+
+
+def get_report(results: Dict, baseline: Optional[Dict] = None) -> str:
+    lines = []
+    for name, result in results.items():
+        line = '{:<20} median {:9.3f} ms   p95 {:9.3f} ms   peak {} MB'.format(
+            name, result['median_ms'], result['p95_ms'],
+            '?' if result['peak_memory_mb'] is None else '{:.0f}'.format(result['peak_memory_mb']))
+        if baseline is not None and name in baseline:
+            line += '   median {:+.0%} vs baseline'.format(result['median_ms'] / baseline[name]['median_ms'] - 1)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замеры эталонных игровых сценариев.')
+    parser.add_argument('--scenario', choices=SCENARIO_NAMES, action='append',
+                        help='сценарий (можно несколько раз); по умолчанию все')
+    parser.add_argument('--seed', type=int, default=SEED, help='seed сценариев')
+    parser.add_argument('--output', help='записать результат в JSON-файл (например, как эталон)')
+    parser.add_argument('--compare', help='JSON-файл эталона для сравнения')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='допустимое ухудшение относительно эталона (доля)')
+    parser.add_argument('--in-process', action='store_true',
+                        help='запускать в этом процессе и только печатать JSON (используется внутри)')
+    args = parser.parse_args()
+    names = args.scenario or SCENARIO_NAMES
+
+    if args.in_process:
+        print(json.dumps({name: run_scenario(name, args.seed) for name in names}))
+        return
+
+    results = {}
+    for name in names:
+        results[name] = run_isolated(name, args.seed)
+        print(name, 'done', file=sys.stderr)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    print(json.dumps(results, indent=2, sort_keys=True))
+    print(get_report(results, baseline), file=sys.stderr)
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print('REGRESSION', regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Замер статической графики сетки (GridDrawStaticManager) на уровнях 100x100 и 300x300 клеток: время создания,
+время кадра при проезде камеры через весь уровень и память под готовые куски. Для сравнения замеряется
+отрисовка всего уровня на одну surface, как было до кусков.
+Окно и звук не нужны (SDL dummy). Запуск из корня проекта:
+
+python -m benchmarks.static_draw
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import random
+import tempfile
+
+from time import perf_counter
+
+import pygame
+
+from benchmarks.path_finder import report
+from constants.grid import CELL_SIZE
+from game import Game
+from geometry.point import Point
+from map.collision_grid.collision_grid import CollisionGrid
+from scenes.game.level import LevelScene
+from utils.game_data_manager import GameDataManager
+from utils.image import ImageManager
+
+SIZES = [100, 300]
+FRAMES = 300
+
+
+class RandomGrid(CollisionGrid):
+    """
+    Сетка заданного размера со случайными стенами.
+    """
+
+    def __init__(self, scene, controller, size: int):
+        super().__init__(scene, controller, Point(0, 0))
+        self.size = size
+        self._fill_arr(CELL_SIZE, CELL_SIZE, size, size)
+
+    def map_construction(self):
+        for row in self.arr:
+            for j in range(len(row)):
+                row[j] = int(random.random() > 0.3)
+
+
+def pre_render_all(grid: CollisionGrid) -> pygame.Surface:
+    """
+    Отрисовка всего уровня на одну surface.
+    """
+    res = pygame.Surface((int(grid.width) + grid.scene.width // 2, int(grid.height) + grid.scene.height // 2))
+    for i in range(len(grid.arr)):
+        for j in range(len(grid.arr[i])):
+            ImageManager.process_draw(grid.get_tile_image_name(i, j), grid.get_center_of_cell_by_indexes(i, j),
+                                      res, 1, 0)
+    return res
+
+
+def main():
+    GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+    game = Game()
+    scene = LevelScene(game, 'benchmark')
+    random.seed(1)
+    for size in SIZES:
+        start = perf_counter()
+        grid = RandomGrid(scene, game.controller, size)
+        print('{}x{} construction {:.1f} ms'.format(size, size, (perf_counter() - start) * 1000))
+
+        start = perf_counter()
+        surface = pre_render_all(grid)
+        print('{}x{} full prerender {:.1f} ms, {:.1f} MB'.format(
+            size, size, (perf_counter() - start) * 1000,
+            surface.get_width() * surface.get_height() * surface.get_bytesize() / 2 ** 20))
+        del surface
+
+        manager = grid.static_draw_manager
+        path_end = Point(grid.width - game.width, grid.height - game.height)
+        times = []
+        for frame in range(FRAMES):
+            scene.relative_center = path_end * (frame / FRAMES)
+            start = perf_counter()
+            manager.process_draw()
+            times.append((perf_counter() - start) * 1000)
+        report('{}x{} frame while scrolling'.format(size, size), times)
+        print(manager.chunks.get_report())
+
+
+if __name__ == '__main__':
+    main()
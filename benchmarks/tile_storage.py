@@ -0,0 +1,47 @@
+"""
+Замер хранения клеток CollisionGrid на настоящем LevelGrid 100x100: время и память transform_ints_to_tiles
+и полное построение сетки. Запуск из корня проекта:
+
+python -m benchmarks.tile_storage
+"""
+import tracemalloc
+
+from time import perf_counter
+
+from benchmarks.passability import create_level_grid, BIOM
+from benchmarks.path_finder import report
+from geometry.point import Point
+from map.level.grid import LevelGrid
+
+REPEATS = 10
+
+
+def main():
+    grid = create_level_grid(0)
+    construction = []
+    for k in range(REPEATS):
+        grid.scene.game.random_manager.seed = k
+        start = perf_counter()
+        level_grid = LevelGrid(grid.scene, grid.controller, Point(0, 0))
+        level_grid.biom = BIOM
+        level_grid.initialize()
+        construction.append((perf_counter() - start) * 1000)
+    report('LevelGrid construction', construction)
+
+    ints = [[int(grid.is_passable(i, j)) for j in range(len(grid.arr[i]))] for i in range(len(grid.arr))]
+    transform = []
+    memory = 0
+    for k in range(REPEATS):
+        grid.arr = [row[:] for row in ints]
+        tracemalloc.start()
+        start = perf_counter()
+        grid.transform_ints_to_tiles()
+        transform.append((perf_counter() - start) * 1000)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    report('transform_ints_to_tiles (tracemalloc)', transform)
+    print('tile storage memory: {:.1f} KB'.format(memory / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Замер отрисовки спрайтов через ImageManager.process_draw с кэшем поворотов и без него: кадр из врагов, пуль,
+частиц и стен, где враги и пули поворачиваются. Окно не нужно, рисуется на обычную поверхность.
+Запуск из корня проекта:
+
+python -m benchmarks.transform_cache
+"""
+import random
+
+from math import pi
+from time import perf_counter
+from typing import List, Tuple
+
+import pygame
+
+from benchmarks.path_finder import report
+from geometry.point import Point
+from utils.image import ImageManager
+
+FRAMES = 200
+SCREEN_SIZE = (1280, 720)
+
+# (картинка, масштаб, количество, поворачивается ли каждый кадр)
+SPRITES = [
+    ('enemy.simple.range', 1, 30, True),
+    ('moving_objects.bullet.shotgun_bullet', 0.6, 40, False),
+    ('moving_objects.particles.particle23', 0.2, 100, False),
+    ('level.simple_planet.wall', 1, 300, False),
+]
+
+
+def create_frame_objects() -> List[Tuple[str, float, float, Point, bool]]:
+    result = []
+    for image_name, zoom, count, is_rotating in SPRITES:
+        for k in range(count):
+            pos = Point(random.uniform(0, SCREEN_SIZE[0]), random.uniform(0, SCREEN_SIZE[1]))
+            result.append((image_name, zoom, random.uniform(0, 2 * pi), pos, is_rotating))
+    return result
+
+
+def draw_frames(screen: pygame.Surface, objects: List[Tuple[str, float, float, Point, bool]],
+                use_cache: bool) -> List[float]:
+    """
+    :return: время каждого кадра в миллисекундах
+    """
+    result = []
+    for frame in range(FRAMES):
+        start = perf_counter()
+        for image_name, zoom, angle, pos, is_rotating in objects:
+            if is_rotating:
+                angle += frame * 0.05
+            if use_cache:
+                ImageManager.process_draw(image_name, pos, screen, zoom, angle)
+            else:
+                image = ImageManager.resize(ImageManager.get_image(image_name), zoom)
+                ImageManager.draw_surface(ImageManager.rotate(image, angle), pos, screen)
+        result.append((perf_counter() - start) * 1000)
+    return result
+
+
+def main():
+    ImageManager.load_all()
+    screen = pygame.Surface(SCREEN_SIZE)
+    random.seed(1)
+    objects = create_frame_objects()
+
+    report('frame without cache', draw_frames(screen, objects, False))
+    ImageManager.transform_cache.clear()
+    report('frame with cache', draw_frames(screen, objects, True))
+    print(ImageManager.transform_cache.get_report())
+
+
+if __name__ == '__main__':
+    main()
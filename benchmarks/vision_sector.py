@@ -0,0 +1,80 @@
+"""
+Замер зрения многих врагов за тик: прежняя проверка каждого врага по отдельности
+(LevelGrid.is_enemy_see_player: Sector на каждого врага, потом стены) против проверки сектора обзора у всех сразу
+(LevelGrid.get_vision_candidates, один проход NumPy) и проверки стен только у кандидатов. Враги стоят в случайных
+клетках пола уровня и смотрят в случайные стороны. Запуск из корня проекта:
+
+python -m benchmarks.vision_sector
+"""
+import random
+import tempfile
+
+from math import pi
+from time import perf_counter
+from typing import List
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+import simulate
+from drawable_objects.enemy import CommandHumanoid
+from game import Game
+from geometry.point import Point
+from utils.game_data_manager import GameDataManager
+
+SEED = 1
+PLANET_NUMBER = 1
+ENEMIES_COUNTS = (50, 200, 800)
+TICKS = 50
+
+
+class VisionEnemy:
+    """
+    Все, что нужно зрению от врага.
+    """
+    VIEW_ANGLE = CommandHumanoid.VIEW_ANGLE
+
+    def __init__(self, pos: Point, angle: float):
+        self.pos = pos
+        self.angle = angle
+
+
+def see_one_by_one(grid, enemies: List[VisionEnemy]) -> List[bool]:
+    return [grid.is_enemy_see_player(enemy, CommandHumanoid.VISION_RADIUS) for enemy in enemies]
+
+
+def see_batch(grid, enemies: List[VisionEnemy]) -> List[bool]:
+    candidates = grid.get_vision_candidates(enemies, CommandHumanoid.VISION_RADIUS).tolist()
+    return [is_candidate and grid.is_enemy_see_player_in_sector(enemy)
+            for enemy, is_candidate in zip(enemies, candidates)]
+
+
+def measure(see, grid, enemies: List[VisionEnemy]) -> float:
+    """
+    :return: среднее время одного тика в миллисекундах
+    """
+    start = perf_counter()
+    for tick in range(TICKS):
+        see(grid, enemies)
+    return (perf_counter() - start) / TICKS * 1000
+
+
+def main():
+    GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+    game = Game(headless=True, seed=SEED)
+    scene = simulate.enter_level(game, planet_number=PLANET_NUMBER)
+    grid = scene.grid
+    random.seed(SEED)
+    cells = [(i, j) for i in range(len(grid.arr)) for j in range(len(grid.arr[0])) if grid.is_passable(i, j)]
+    for count in ENEMIES_COUNTS:
+        enemies = [VisionEnemy(grid.get_center_of_cell_by_indexes(*random.choice(cells)), random.uniform(-pi, pi))
+                   for i in range(count)]
+        one_by_one = see_one_by_one(grid, enemies)
+        batch = see_batch(grid, enemies)
+        candidates = sum(grid.get_vision_candidates(enemies, CommandHumanoid.VISION_RADIUS).tolist())
+        print('{:4} enemies ({:3} candidates, {:3} see player):   one by one {:7.3f} ms   batch {:7.3f} ms   '
+              'same result: {}'.format(count, candidates, sum(batch), measure(see_one_by_one, grid, enemies),
+                                       measure(see_batch, grid, enemies), batch == one_by_one))
+
+
+if __name__ == '__main__':
+    main()
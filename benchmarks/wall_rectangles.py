@@ -0,0 +1,147 @@
+"""
+Замер прямоугольников коллизий стен: жадное покрытие стен (CollisionGrid.wall_mesh, get_wall_rectangles)
+против прежних - обхода краев комнаты (CollisionFormCreator) в RoomsGraph и прямоугольника на каждую клетку
+стены при выталкивании игрока из стен. Выводится число прямоугольников и время запросов: пересекает ли
+отрезок стены (RoomsGraph.is_seg_intersect_wall, зрение врагов) и выталкивание игрока
+(Player._pos_after_pull_from_walls). Запуск из корня проекта:
+
+python -m benchmarks.wall_rectangles
+"""
+import random
+import tempfile
+
+from math import cos, sin, pi
+from time import perf_counter
+from typing import Callable, List
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+import simulate
+from constants.grid import CELL_SIZE
+from enemy_interaction_with_grid.vision.rectangle_bypass.collision_form_creator import CollisionFormCreator
+from enemy_interaction_with_grid.vision.room.graph import RoomsGraph
+from enemy_interaction_with_grid.vision.room.room import Room
+from game import Game
+from geometry.optimized.segment import StaticSegment
+from geometry.point import Point
+from geometry.rectangle import Rectangle
+from map.level.rect.splitter import GridRectangle, SplitNode
+from utils.game_data_manager import GameDataManager
+
+SEED = 1
+PLANET_NUMBER = 1
+QUERIES_COUNT = 3000
+
+
+class CellRoom(Room):
+    """
+    Комната с прямоугольниками коллизий, как было раньше: обход краев комнаты.
+    """
+
+    def _get_collision_rectangles(self, grid):
+        return CollisionFormCreator(self._grid_rectangle).get_collision_rectangles(grid.arr, grid)
+
+
+class CellRoomsGraph(RoomsGraph):
+    def _get_all_rooms(self, grid_rectangles: List[GridRectangle]) -> List[Room]:
+        return [CellRoom(rectangle, self._arr_after_split, self._grid) for rectangle in grid_rectangles]
+
+
+def get_cell_rects_nearby(grid, pos: Point) -> List[Rectangle]:
+    """
+    Прежний CollisionGrid.get_collision_rects_nearby: прямоугольник на каждую клетку стены в квадрате 5x5.
+    """
+    center_i, center_j = grid.index_manager.get_index_by_pos(pos)
+    result = []
+    for i in range(max(0, center_i - 2), min(len(grid.arr), center_i + 3)):
+        for j in range(max(0, center_j - 2), min(len(grid.arr[0]), center_j + 3)):
+            if not grid.is_passable(i, j):
+                result.append(grid.get_collision_rect(i, j))
+    return result
+
+
+def measure(query: Callable, arguments: List) -> float:
+    """
+    :return: среднее время одного запроса в микросекундах
+    """
+    start = perf_counter()
+    for argument in arguments:
+        query(argument)
+    return (perf_counter() - start) / len(arguments) * 10 ** 6
+
+
+def get_floor_points(grid) -> List[Point]:
+    return [grid.get_center_of_cell_by_indexes(i, j) + Point(random.uniform(-20, 20), random.uniform(-20, 20))
+            for i in range(1, len(grid.arr) - 1) for j in range(1, len(grid.arr[0]) - 1)
+            if all(grid.is_passable(i + di, j + dj) for di in (-1, 0, 1) for dj in (-1, 0, 1))]
+
+
+def get_segments(grid, floor: List[Point], length: float) -> List[StaticSegment]:
+    width = len(grid.arr[0]) * CELL_SIZE
+    height = len(grid.arr) * CELL_SIZE
+    result = []
+    while len(result) < QUERIES_COUNT:
+        p1 = random.choice(floor)
+        angle = random.uniform(0, 2 * pi)
+        p2 = p1 + Point(cos(angle), sin(angle)) * length
+        if 0 < p2.x < width and 0 < p2.y < height:
+            result.append(StaticSegment(p1, p2))
+    return result
+
+
+def main():
+    GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+    game = Game(headless=True, seed=SEED)
+    scene = simulate.enter_level(game, planet_number=PLANET_NUMBER)
+    grid = scene.grid
+    random.seed(SEED)
+
+    grid_data = grid.to_dict()
+    rectangles = []
+    for item in grid_data['room_rectangles']:
+        rectangle = GridRectangle((0, 0), (0, 0))
+        rectangle.from_dict(item)
+        rectangles.append(rectangle)
+    room_tree = SplitNode.from_rectangles(rectangles)
+    graphs = []
+    for name, graph_class in (('rooms by cells', CellRoomsGraph), ('rooms meshed', RoomsGraph)):
+        start = perf_counter()
+        graph = graph_class(rectangles, room_tree, grid_data['arr_after_split'], grid)
+        build = (perf_counter() - start) * 1000
+        count = sum(len(room._collision_rectangles) for room in graph._rooms)
+        print('{:<16} {:6} rectangles, built in {:7.1f} ms'.format(name, count, build))
+        graphs.append(graph)
+    walls = len(grid.passability) - sum(grid.passability)
+    start = perf_counter()
+    mesh = grid.wall_mesh
+    print('grid: {} wall cells, {} meshed rectangles, built in {:.1f} ms'.format(
+        walls, len(mesh.rectangles), (perf_counter() - start) * 1000))
+
+    floor = get_floor_points(grid)
+    for length in (150, 600, CELL_SIZE * 25):
+        segments = get_segments(grid, floor, length)
+        by_cells, meshed = [measure(graph.is_seg_intersect_wall, segments) for graph in graphs]
+        exact = [grid.intersect_seg_walls(segment) is not None for segment in segments]
+        agreement = [sum(graph.is_seg_intersect_wall(segment) == is_intersect
+                         for segment, is_intersect in zip(segments, exact)) / len(segments) for graph in graphs]
+        print('is_seg_intersect_wall, length {:>4}:   by cells {:7.1f} us   meshed {:7.1f} us   '
+              'agree with grid {:.1%} / {:.1%}'.format(length, by_cells, meshed, *agreement))
+
+    player = scene.player
+    # в игре центр игрока всегда на полу: он сдвигается от стены меньше, чем на свой радиус
+    cells = [(i, j) for i in range(len(grid.arr)) for j in range(len(grid.arr[0])) if grid.is_passable(i, j)]
+    half = CELL_SIZE / 2 - 1
+    positions = [grid.get_center_of_cell_by_indexes(*random.choice(cells)) +
+                 Point(random.uniform(-half, half), random.uniform(-half, half)) for i in range(QUERIES_COUNT)]
+    meshed = measure(player._pos_after_pull_from_walls, positions)
+    rects_meshed = sum(len(grid.get_collision_rects_nearby(pos)) for pos in positions) / len(positions)
+    grid.get_collision_rects_nearby = lambda pos: get_cell_rects_nearby(grid, pos)
+    by_cells = measure(player._pos_after_pull_from_walls, positions)
+    rects_by_cells = sum(len(grid.get_collision_rects_nearby(pos)) for pos in positions) / len(positions)
+    del grid.get_collision_rects_nearby
+    print('pull from walls:   by cells {:7.1f} us ({:.1f} rectangles)   meshed {:7.1f} us ({:.1f} rectangles)'
+          .format(by_cells, rects_by_cells, meshed, rects_meshed))
+
+
+if __name__ == '__main__':
+    main()
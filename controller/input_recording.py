@@ -0,0 +1,141 @@
+"""
+Запись ввода игрока и его воспроизведение. Вместе с фиксированным seed космоса запись повторяет игровую сессию:
+ее можно прогнать в безоконном режиме с максимальной скоростью и сравнить время тиков между версиями игры
+(simulate.py --replay).
+"""
+import gzip
+import json
+
+from typing import Dict, Tuple
+
+from constants.mouse_buttons import MouseButtonID
+from geometry.point import Point
+
+
+class InputRecord:
+    """
+    Запись ввода: seed и размер окна в начале игры, число тиков и изменения ввода по тикам.
+
+    Изменения хранятся только для тиков, на которых ввод поменялся: changes - список [тик, изменение], где
+    изменение - словарь с новыми значениями удерживаемого состояния (keys - нажатые клавиши, mouse - положение
+    мыши, buttons - нажатые кнопки мыши, size - размер окна) и одиночными событиями тика (click - [x, y, кнопка],
+    bumped - клавиша, ставшая нажатой). Файл - json, сжатый gzip.
+
+    :param seed: seed космосов игры
+    :param size: размер окна в начале игры
+    """
+    VERSION = 1
+
+    def __init__(self, seed: int, size: Tuple[int, int]):
+        self.seed = seed
+        self.size = tuple(size)
+        self.ticks = 0
+        self.changes = list()
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': self.VERSION,
+            'seed': self.seed,
+            'size': list(self.size),
+            'ticks': self.ticks,
+            'changes': self.changes,
+        }
+
+    @staticmethod
+    def from_dict(data_dict: Dict) -> 'InputRecord':
+        if data_dict['version'] != InputRecord.VERSION:
+            raise ValueError('версия записи ввода {} не поддерживается'.format(data_dict['version']))
+        record = InputRecord(data_dict['seed'], data_dict['size'])
+        record.ticks = data_dict['ticks']
+        record.changes = data_dict['changes']
+        return record
+
+    def save(self, path: str):
+        with gzip.open(path, 'wt') as file:
+            json.dump(self.to_dict(), file, separators=(',', ':'))
+
+    @staticmethod
+    def load(path: str) -> 'InputRecord':
+        with gzip.open(path, 'rt') as file:
+            return InputRecord.from_dict(json.load(file))
+
+
+class InputRecorder:
+    """
+    Записывает состояние контроллера после каждой его итерации (record_tick) в InputRecord.
+
+    :param controller: контроллер игры
+    :param record: запись, в которую добавляются тики
+    """
+    BUTTONS = [MouseButtonID.LEFT, MouseButtonID.MIDDLE, MouseButtonID.RIGHT]
+
+    def __init__(self, controller, record: InputRecord):
+        self.__controller = controller
+        self.record = record
+        self.__state = dict()
+
+    def __get_state(self) -> Dict:
+        controller = self.__controller
+        return {
+            'keys': sorted(controller.pressed_keys),
+            'mouse': [controller.mouse_pos.x, controller.mouse_pos.y],
+            'buttons': [button for button in self.BUTTONS if controller.is_mouse_pressed(button)],
+            'size': list(controller.game.size),
+        }
+
+    def record_tick(self):
+        """
+        Запись текущего тика. Вызывается после итерации контроллера.
+        """
+        controller = self.__controller
+        state = self.__get_state()
+        change = {name: value for name, value in state.items() if self.__state.get(name) != value}
+        if controller.click_pos is not None:
+            change['click'] = [controller.click_pos.x, controller.click_pos.y, controller.click_button]
+        if controller.bumped_key is not None:
+            change['bumped'] = controller.bumped_key
+        if change:
+            self.record.changes.append([self.record.ticks, change])
+        self.__state = state
+        self.record.ticks += 1
+
+
+class InputReplay:
+    """
+    Скрипт ScriptedController, воспроизводящий запись: на каждом тике контроллер получает то же состояние, что
+    было у контроллера при записи. Игра должна начинаться так же, как при записи: с главного меню, с seed и
+    размером окна записи и с тем же содержимым хранилища космосов.
+
+    :param record: запись ввода
+    """
+
+    def __init__(self, record: InputRecord):
+        self.record = record
+        self.__changes = record.changes
+        self.__index = 0
+
+    @property
+    def is_finished(self) -> bool:
+        """
+        Все ли изменения ввода воспроизведены.
+        """
+        return self.__index == len(self.__changes)
+
+    def __call__(self, tick: int, controller):
+        if self.is_finished or self.__changes[self.__index][0] != tick:
+            return
+        change = self.__changes[self.__index][1]
+        self.__index += 1
+        if 'keys' in change:
+            controller.pressed_keys = set(change['keys'])
+        if 'mouse' in change:
+            controller.mouse_pos = Point(*change['mouse'])
+        if 'buttons' in change:
+            controller.pressed_mouse_buttons = set(change['buttons'])
+        if 'size' in change and tuple(change['size']) != controller.game.size:
+            controller.game.size = tuple(change['size'])
+        if 'click' in change:
+            x, y, controller.click_button = change['click']
+            controller.click_pos = Point(x, y)
+        if 'bumped' in change:
+            controller.bumped_key = change['bumped']
@@ -0,0 +1,64 @@
+from typing import Callable, Optional
+
+from controller.controller import Controller
+from geometry.point import Point
+
+
+class ScriptedController(Controller):
+    """
+    Контроллер, ввод которого задается программно, а не событиями pygame. Нужен, чтобы запускать игру без окна
+    (безоконный режим Game, симуляции, нагрузочные тесты).
+
+    Каждую итерацию (тик логики) одиночные события сбрасываются, как в Controller, и вызывается script(tick, self);
+    скрипт меняет состояние методами press_key, release_key, move_mouse, click, press_mouse, release_mouse.
+    Состояние нажатых клавиш и кнопок мыши сохраняется между тиками, пока скрипт его не поменяет.
+
+    :param game: игра, которой создается контроллер
+    :param script: функция, задающая ввод на каждом тике; None - ввода нет
+    """
+
+    def __init__(self, game, script: Optional[Callable[[int, 'ScriptedController'], None]] = None):
+        super().__init__(game)
+        self.script = script
+        self.tick = 0
+        self.pressed_mouse_buttons = set()
+
+    def iteration(self):
+        self.click_pos = self.click_button = self.bumped_key = None
+        if self.script is not None:
+            self.script(self.tick, self)
+        self.tick += 1
+
+    def is_mouse_pressed(self, button_id):
+        return button_id in self.pressed_mouse_buttons
+
+    def press_key(self, key):
+        self.pressed_keys.add(key)
+        self.bumped_key = key
+
+    def release_key(self, key):
+        self.pressed_keys.discard(key)
+
+    def move_mouse(self, pos: Point):
+        """
+        :param pos: положение мыши в координатах окна
+        """
+        self.mouse_pos = pos
+
+    def click(self, button_id, pos: Point = None):
+        """
+        Щелчок мышью на этом тике.
+
+        :param button_id: ID кнопки в pygame
+        :param pos: точка щелчка; по умолчанию текущее положение мыши
+        """
+        if pos is not None:
+            self.mouse_pos = pos
+        self.click_pos = self.mouse_pos
+        self.click_button = button_id
+
+    def press_mouse(self, button_id):
+        self.pressed_mouse_buttons.add(button_id)
+
+    def release_mouse(self, button_id):
+        self.pressed_mouse_buttons.discard(button_id)
@@ -1,8 +1,9 @@
 import pygame
 
-from typing import Dict
+from typing import Dict, Optional
 
 from geometry.point import Point
+from geometry.segment import Segment
 from controller.controller import Controller
 from scenes.base import Scene
 from utils.image import ImageManager
@@ -101,6 +102,17 @@ class SpriteObject(DrawableObject):
         self.angle = angle
         self.zoom = zoom
 
+    @property
+    def image_name(self) -> str:
+        return self.image.name
+
+    @image_name.setter
+    def image_name(self, value: str):
+        """
+        По имени сразу находится handle картинки (self.image), чтобы при отрисовке не разбирать путь.
+        """
+        self.image = ImageManager.get_handle(value)
+
     def from_dict(self, data_dict: Dict):
         """
         Воспроизведение объекта из словаря.
@@ -122,7 +134,7 @@ class SpriteObject(DrawableObject):
 
     def process_draw(self):
         ImageManager.process_draw(
-            self.image_name, self.pos, self.scene.screen, self.zoom, self.angle)
+            self.image, self.pos, self.scene.screen, self.zoom, self.angle)
 
     def collides_with(self, other_object):
         """
@@ -174,11 +186,11 @@ class GameSprite(SpriteObject):
         relative_center = self.scene.relative_center
         relative_pos = self.pos - relative_center
 
-        if ImageManager.is_out_of_screen(self.image_name, self.zoom,
+        if ImageManager.is_out_of_screen(self.image, self.zoom,
                                          relative_pos, self.scene.game.screen_rectangle):
             return
 
-        ImageManager.process_draw(self.image_name, relative_pos,
+        ImageManager.process_draw(self.image, relative_pos,
                                   self.scene.screen, self.zoom, self.angle, self.rotation_offset)
 
     def move(self, new_pos):
@@ -254,4 +266,42 @@ class Animation(GameSprite):
             self.animation_end()
 
     def animation_end(self):
-        self.destroy()
\ No newline at end of file
+        self.destroy()
+
+
+class WallCollidingObject:
+    """
+    Примесь для объектов, которые каждый тик пересекают свою траекторию со стенами (пули, частицы).
+
+    В начале тика сцена уровня собирает траектории всех таких объектов (get_tragectory) и пересекает их со
+    стенами одним запросом к сетке, результат запоминается в set_wall_intersection. Объекты, созданные уже
+    во время тика, результата не получают, и intersect_tragectory_walls считает пересечение сам.
+    """
+    _precomputed_tragectory = None
+    _precomputed_intersection = None
+
+    def get_tragectory(self) -> Optional[Segment]:
+        """
+        Траектория, которую объект проверит в process_logic этого тика.
+
+        :return: отрезок или None, если объект не движется
+        """
+        return None
+
+    def set_wall_intersection(self, tragectory: Segment, intersection_point: Optional[Point]):
+        """
+        Запомнить заранее посчитанное пересечение траектории со стенами.
+        """
+        self._precomputed_tragectory = tragectory
+        self._precomputed_intersection = intersection_point
+
+    def intersect_tragectory_walls(self, tragectory: Segment) -> Optional[Point]:
+        """
+        Пересечение траектории со стенами. Заранее посчитанный результат используется один раз и только для
+        той же траектории.
+        """
+        precomputed = self._precomputed_tragectory
+        self._precomputed_tragectory = None
+        if precomputed is not None and precomputed.p1 == tragectory.p1 and precomputed.p2 == tragectory.p2:
+            return self._precomputed_intersection
+        return self.scene.grid.intersect_seg_walls(tragectory)
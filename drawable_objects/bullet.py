@@ -1,4 +1,4 @@
-from drawable_objects.base import GameSprite, Animation
+from drawable_objects.base import GameSprite, Animation, WallCollidingObject
 from drawable_objects.enemy import Enemy
 from drawable_objects.particles import create_particles
 from geometry.point import Point
@@ -22,7 +22,7 @@ def dist(p1: Point, p2: Point) -> float:
     return length(p2 - p1)
 
 
-class Bullet(GameSprite):
+class Bullet(WallCollidingObject, GameSprite):
     """
     Базовая пуля (далека от завершения).
 
@@ -52,15 +52,18 @@ class Bullet(GameSprite):
             self.invisibility_time -= 1
         else:
             pos = self.pos - vector_from_length_angle(
-                ImageManager.get_width(self.image_name, self.zoom) // 2, self.angle)
+                self.image.width * self.zoom // 2, self.angle)
             relative_center = self.scene.relative_center
             relative_pos = pos - relative_center
-            if ImageManager.is_out_of_screen(self.image_name, self.zoom,
+            if ImageManager.is_out_of_screen(self.image, self.zoom,
                                              relative_pos, self.scene.game.screen_rectangle):
                 return
-            ImageManager.process_draw(self.image_name, relative_pos,
+            ImageManager.process_draw(self.image, relative_pos,
                                       self.scene.screen, self.zoom, self.angle, self.rotation_offset)
 
+    def get_tragectory(self) -> Segment:
+        return Segment(self.pos, self.pos + self.direction)
+
     def process_logic(self):
         next_pos = self.pos + self.direction
         self.collision_manager(next_pos)
@@ -79,7 +82,7 @@ class Bullet(GameSprite):
         intersect_player = [intersect_player_point, self.collision_with_player]
         intersection = intersect_player
 
-        intersect_walls_point = self.scene.grid.intersect_seg_walls(tragectory)
+        intersect_walls_point = self.intersect_tragectory_walls(tragectory)
         intersect_walls = [intersect_walls_point, self.collision_with_wall]
         if dist(intersect_walls[0], self.pos) < dist(intersection[0], self.pos):
             intersection = intersect_walls
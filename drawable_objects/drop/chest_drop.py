@@ -4,7 +4,6 @@ from controller.controller import Controller
 from geometry.point import Point
 from utils.sound import SoundManager
 from weapons.weapons import WEAPON_ON_FLOOR_IMAGE, WEAPON_VOCABULARY, weapon_to_dict
-from random import randint
 
 
 class WeaponDrop(Drop):
@@ -93,7 +92,8 @@ class FuelDrop(Drop):
         SoundManager.play_sound(FuelDrop.ACTIVATION_SOUND)
         MINIMUM_ADD = 75
         MAXIMUM_ADD = 125
-        self.scene.common_data.fuel += randint(MINIMUM_ADD, MAXIMUM_ADD)
+        fuel = self.scene.game.random_manager.gameplay.randint(MINIMUM_ADD, MAXIMUM_ADD)
+        self.scene.common_data.fuel += fuel
         self.destroy()
 
 
@@ -1,7 +1,6 @@
 from controller.controller import Controller
 from drawable_objects.drop.base import Drop
 from geometry.point import Point
-from random import randint
 
 from utils.sound import SoundManager
 
@@ -24,6 +23,6 @@ class AmmoDrop(Drop):
         SoundManager.play_sound(AmmoDrop.ACTIVATION_SOUND)
         MINIMUM_AMMO = 1
         MAXIMUM_AMMO = 5
-        ammo_cnt = randint(MINIMUM_AMMO, MAXIMUM_AMMO)
+        ammo_cnt = self.scene.game.random_manager.gameplay.randint(MINIMUM_AMMO, MAXIMUM_AMMO)
         for key in self.scene.player.ammo:
             self.scene.player.ammo[key] += ammo_cnt
@@ -9,7 +9,6 @@ from drawable_objects.particles import create_particles
 from geometry.point import Point
 from geometry.vector import polar_angle, vector_from_length_angle
 from geometry.vector import length
-from random import randint
 from utils.random import is_random_proc
 from math import pi
 
@@ -172,22 +171,41 @@ class CommandHumanoid(MovingHumanoid):
         self.__melee_img = imgs[1]
         self.image_name = self.__ranged_img
 
-    def process_logic(self):
+    def process_logic(self, is_vision_checked: bool = True, is_suspended: bool = False,
+                      is_in_vision_sector: Optional[bool] = None):
         """
         Логика enemy. Во многом зависит от того, видит он player'а или нет.
+
+        Что выполнять в этот тик, решает EnemyScheduler. Таймеры идут каждый тик.
+
+        :param is_vision_checked: проверять ли зрение; если нет, остается результат прошлой проверки
+        :param is_suspended: враг бездействует и не может ни увидеть, ни услышать player'а: зрение, слух и
+            команды не нужны
+        :param is_in_vision_sector: в секторе ли обзора player, если это уже проверено для всех врагов сразу
+            (LevelGrid.get_vision_candidates); None - проверить самому
         """
-        self.__vision_logic()
-        self.__hearing_logic()
-        self.__command_logic()
+        if is_suspended:
+            self.__is_see_player = False
+        else:
+            profiler = self.scene.game.profiler
+            if is_vision_checked:
+                with profiler.measure('logic.enemies.vision'):
+                    self.__vision_logic(is_in_vision_sector)
+            self.__hearing_logic()
+            with profiler.measure('logic.enemies.command'):
+                self.__command_logic()
         if self.__cooldown:
             self.__cooldown -= 1
         self.weapon.process_logic()
 
-    def __vision_logic(self):
+    def __vision_logic(self, is_in_vision_sector: Optional[bool]):
         """
         Логика зрения Enemy
         """
-        self.__is_see_player = self.scene.grid.is_enemy_see_player(self, CommandHumanoid.VISION_RADIUS)
+        if is_in_vision_sector is None:
+            self.__is_see_player = self.scene.grid.is_enemy_see_player(self, CommandHumanoid.VISION_RADIUS)
+        else:
+            self.__is_see_player = is_in_vision_sector and self.scene.grid.is_enemy_see_player_in_sector(self)
 
     def __hearing_logic(self):
         """
@@ -261,6 +279,13 @@ class CommandHumanoid(MovingHumanoid):
 
         return None
 
+    @property
+    def is_engaged(self) -> bool:
+        """
+        Занят ли player'ом: агрессивен, выполняет команду или уже услышал выстрел.
+        """
+        return self._is_aggred or not self._is_idle or self.__hearing_timer_delay.is_started
+
     @property
     def _is_idle(self):
         """
@@ -361,7 +386,7 @@ class Enemy(CommandHumanoid):
     """
 
     IMAGE_ZOOM = 1.2
-    IMAGE_NAME = 'moving_objects.Enemy'
+    IMAGE_NAME = 'enemy.simple.range'  # заменяется в set_img
     HURT_SOUND = 'humanoid.hurt'
     DEATH_SOUND = 'humanoid.death'
 
@@ -373,18 +398,21 @@ class Enemy(CommandHumanoid):
     ROTATION_CHANGE_DIRECTION_CHANCE = 30
     def __init__(self, scene, controller: Controller, pos: Point, angle: float = 0):
         super().__init__(scene, controller, Enemy.IMAGE_NAME, pos, angle, Enemy.IMAGE_ZOOM)
-        self.__rotate_cooldown = randint(
+        self.__random = self.scene.game.random_manager.gameplay
+        self.__rotate_cooldown = self.__random.randint(
             Enemy.ROTATION_MIN_COOLDOWN, Enemy.ROTATION_MAX_COOLDOWN)
-        self.__rotation_direction = 1 if is_random_proc() else -1
+        self.__rotation_direction = 1 if is_random_proc(self.__random) else -1
         self.__rotating_cycles = 0
 
-    def process_logic(self):
+    def process_logic(self, is_vision_checked: bool = True, is_suspended: bool = False,
+                      is_in_vision_sector: Optional[bool] = None):
         """
-        Добавлена логика поворота
+        Добавлена логика поворота. Поворот идет каждый тик, даже у приостановленных врагов, чтобы выглядеть
+        непрерывным.
         """
         if not self.enabled:
             return
-        super().process_logic()
+        super().process_logic(is_vision_checked, is_suspended, is_in_vision_sector)
         if self._is_idle and not self._is_aggred:
             self.__rotation_logic()
 
@@ -408,7 +436,7 @@ class Enemy(CommandHumanoid):
         """
         Меняет направление поворота с вероятностью Enemy.ROTATION_CHANGE_DIRECTION_CHANCE
         """
-        if is_random_proc(Enemy.ROTATION_CHANGE_DIRECTION_CHANCE):
+        if is_random_proc(self.__random, Enemy.ROTATION_CHANGE_DIRECTION_CHANCE):
             self.__rotation_direction *= -1
 
     def __rotation_tic(self):
@@ -430,7 +458,7 @@ class Enemy(CommandHumanoid):
         Закончить поворот
         """
         self.__rotating_cycles = 0
-        self.__rotate_cooldown = randint(
+        self.__rotate_cooldown = self.__random.randint(
             Enemy.ROTATION_MIN_COOLDOWN, Enemy.ROTATION_MAX_COOLDOWN)
 
     @property
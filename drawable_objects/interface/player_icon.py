@@ -40,7 +40,7 @@ class PlayerIcon(SpriteObject):
         """
         if not pos:
             pos = Point(0, 0)
-        width = ImageManager.get_width(self.image_name, PlayerIcon.IMAGE_ZOOM)
+        width = ImageManager.get_width(self.image, PlayerIcon.IMAGE_ZOOM)
         height = ImageManager.get_height(
-            self.image_name, PlayerIcon.IMAGE_ZOOM)
+            self.image, PlayerIcon.IMAGE_ZOOM)
         self.move(Point(width / 2, height / 2) + pos)
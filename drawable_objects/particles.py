@@ -1,5 +1,4 @@
-from drawable_objects.base import Animation
-from random import randrange
+from drawable_objects.base import Animation, WallCollidingObject
 
 from geometry.point import Point
 from geometry.segment import Segment
@@ -7,6 +6,7 @@ from geometry.vector import vector_from_length_angle
 
 
 def create_particles(enemy, damage, pos, angle):
+    randrange = enemy.scene.game.random_manager.gameplay.randrange
     if damage < 50:
         amount = randrange(4, 6)
     elif damage < 100:
@@ -17,7 +17,7 @@ def create_particles(enemy, damage, pos, angle):
         enemy.scene.game_objects.append(Particle(enemy, pos, angle))
 
 
-class Particle(Animation):
+class Particle(WallCollidingObject, Animation):
 
     IMAGE_NAMES = [
         'moving_objects.particles.particle23',
@@ -27,6 +27,8 @@ class Particle(Animation):
     SECOND_TYPE_IMAGE = 'moving_objects.particles.particle24'
 
     def __init__(self, bullet, pos, angle):
+        self.__random = bullet.scene.game.random_manager.gameplay
+        randrange = self.__random.randrange
         self.angle = angle + randrange(-100, 100) / 100
         one_frame_vision_time = randrange(1, 2)
         super().__init__(bullet.scene, bullet.controller, pos, self.angle, one_frame_vision_time)
@@ -34,11 +36,16 @@ class Particle(Animation):
         speed = randrange(20, 60)
         self.direction = vector_from_length_angle(speed, self.angle)
 
+    def get_tragectory(self):
+        if self.direction != Point(0, 0):
+            return Segment(self.pos, self.pos + self.direction)
+        return None
+
     def process_logic(self):
         if self.direction != Point(0, 0):
             next_pos = self.pos + self.direction
             tragectory = Segment(self.pos, next_pos)
-            intersection_point = self.scene.grid.intersect_seg_walls(tragectory)
+            intersection_point = self.intersect_tragectory_walls(tragectory)
             if intersection_point is not None:
                 self.pos = intersection_point
                 self.animation_end()
@@ -47,10 +54,10 @@ class Particle(Animation):
                 super().process_logic()
 
     def animation_end(self):
-        type = randrange(0, 100)
+        type = self.__random.randrange(0, 100)
         if type >= 70:
             self.image_name = self.SECOND_TYPE_IMAGE
-            self.angle = randrange(0, 314)/100
+            self.angle = self.__random.randrange(0, 314)/100
         else:
             self.image_name = self.IMAGE_NAMES[2]
             self.zoom *= 2
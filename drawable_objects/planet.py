@@ -1,7 +1,6 @@
 import pygame
 
 from math import pi
-from random import random
 from typing import Dict
 
 from constants.planets_generation import ESTIMATED_SPACE_SIZE
@@ -49,7 +48,7 @@ class Planet(SpriteObject):
 
     def __init__(self, scene: Scene, controller: Controller, estimated_pos: Point, biom=0, name='Test'):
         super().__init__(scene, controller, Planet.IMAGES[biom][0], Point(
-        ), random() * 2 * pi, Planet.IMAGES[biom][1])
+        ), scene.game.random_manager.gameplay.random() * 2 * pi, Planet.IMAGES[biom][1])
         self.rotation_offset = [0, 0]
         self.estimated_pos = estimated_pos
         self.update_real_pos()
@@ -38,6 +38,12 @@ class EnemyHearingManager:
         """
         self.__path_finder.save_enemy_pos(pos)
 
+    def update_cell(self, i: int, j: int):
+        """
+        Клетка (i, j) сетки стала стеной или полом
+        """
+        self.__path_finder.update_cell(i, j)
+
     def process_logic(self):
         """
         Логика менеджера
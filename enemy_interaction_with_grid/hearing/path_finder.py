@@ -1,5 +1,9 @@
 from typing import List, Tuple, Optional
+from bisect import bisect_left
 from collections import deque
+
+import numpy as np
+
 from constants.directions import rect_di, rect_dj
 from drawable_objects.enemy import Enemy
 from geometry.point import Point
@@ -9,6 +13,11 @@ from utils.is_marked_manager import TwoDimensionalIsMarkedManager
 class GridPathFinder:
     """
     Обход двумерного графа. Поиск пути (bfs).
+
+    Поле путей (расстояния и родители клеток) хранится между тиками и пересчитывается только тогда, когда
+    меняется клетка игрока или клетки с enemy, через которые прошел bfs. Если игрок остался в той же клетке,
+    bfs не запускается заново, а продолжается с первой клетки, у которой поменялось наличие enemy: все,
+    что bfs успел сделать до нее, не изменилось бы и при полном пересчете.
     """
 
     def __init__(self, grid):
@@ -30,41 +39,159 @@ class GridPathFinder:
         self.__is_has_enemy = TwoDimensionalIsMarkedManager(grid.arr)
 
         # не мешают ли стены стоять здесь enemy
-        self.__is_standable = [
-            [True] * len(grid.arr[i]) for i in range(len(grid.arr))]
-
+        self.__is_standable = []
         self.__fill_is_standable_list()
 
+        """
+        Состояние основного bfs, нужное для его продолжения с середины:
+        __order - клетки очереди в порядке обработки (шаг bfs - индекс в этом списке),
+        __order_step - шаг, на котором клетка попала в очередь,
+        __order_index - первый шаг, на котором клетка обрабатывалась,
+        __marks и __marks_step - отмеченные клетки и шаги, на которых они были отмечены,
+        __in_aggre_zone и __in_aggre_zone_step - то же для клеток, отложенных до __aggre_zone_bfs.
+        """
+        self.__order = []
+        self.__order_step = []
+        self.__order_index = {}
+        self.__marks = []
+        self.__marks_step = []
+        self.__in_aggre_zone = []
+        self.__in_aggre_zone_step = []
+
+        # клетка игрока и max_distance, для которых построено поле
+        self.__field_player_cell = None
+        self.__field_max_distance = None
+        # клетки с enemy, учтенные в поле, и клетки, отмеченные после последнего обновления
+        self.__field_enemy_cells = set()
+        self.__saved_enemy_cells = set()
+
     def __fill_is_standable_list(self):
         """
         Заполняет список __is_standable
 
-        O(len(grid.arr) * len(grid.arr[0])) времени
+        O(len(grid.arr) * len(grid.arr[0])) времени, считается numpy'ем по grid.passability_map
 
-        __is_standable если клетка не стена и соседняя тоже.
+        __is_standable если клетка не стена и соседняя тоже. Соседи за краем берутся с другого края, как
+        отрицательные индексы в списке.
         """
-        for i in range(len(self.__grid.arr)):
-            for j in range(len(self.__grid.arr[i])):
-                if not self.__grid.is_passable(i, j):
-                    self.__is_standable[i][j] = False
-                    continue
-                for k in range(len(rect_di)):
-                    new_i = i + rect_di[k]
-                    new_j = j + rect_dj[k]
-                    if not self.__grid.is_passable(new_i, new_j):
-                        self.__is_standable[i][j] = False
-                        break
+        passable = self.__grid.passability_map != 0
+        is_standable = passable.copy()
+        for k in range(len(rect_di)):
+            is_standable &= np.roll(passable, (-rect_di[k], -rect_dj[k]), axis=(0, 1))
+        self.__is_standable = is_standable.tolist()
+
+    def update_cell(self, i: int, j: int):
+        """
+        Клетка (i, j) сетки стала стеной или полом: __is_standable пересчитывается у нее и у клеток, для которых
+        она соседняя, а поле путей будет построено с нуля на ближайшем update_path_to_enemies.
+
+        O(len(rect_di) ** 2) == O(1) времени
+        """
+        passability_map = self.__grid.passability_map
+        height, width = passability_map.shape
+        for di, dj in [(0, 0)] + list(zip(rect_di, rect_dj)):
+            cell_i = (i - di) % height
+            cell_j = (j - dj) % width
+            self.__is_standable[cell_i][cell_j] = bool(passability_map[cell_i, cell_j]) and all(
+                passability_map[(cell_i + rect_di[k]) % height, (cell_j + rect_dj[k]) % width]
+                for k in range(len(rect_di)))
+        self.__field_player_cell = None
 
     def update_path_to_enemies(self, max_distance: int):
         """
         Обновляет путь от игрока до всех клеток, в рендже max_distance
 
-        запускает всего один bfs от игрока, а не от каждого enemy. игнорирует клетки, которые не can_stay
+        запускает всего один bfs от игрока, а не от каждого enemy. игнорирует клетки, которые не can_stay.
+
+        Если игрок в той же клетке и enemy не сдвинулись, ничего не делает: O(количество enemy) времени.
         """
-        q = self.__main_bfs(max_distance)
-        self.__aggre_zone_bfs(q, max_distance)
+        player_pos = self.__grid.scene.player.pos
+        player_cell = self.__grid.index_manager.get_index_by_pos(player_pos)
+
+        if player_cell != self.__field_player_cell or max_distance != self.__field_max_distance:
+            self.__rebuild_field(player_cell, max_distance)
+        else:
+            step = self.__get_first_changed_step()
+            if step is not None:
+                self.__repair_field(step)
 
-    def __aggre_zone_bfs(self, q: deque, max_distance: int):
+        self.__field_enemy_cells = self.__saved_enemy_cells
+        self.__saved_enemy_cells = set()
+        self.__is_has_enemy.next_iteration()
+
+    def __rebuild_field(self, player_cell: Tuple[int, int], max_distance: int):
+        """
+        Построение поля с нуля.
+        """
+        self.__field_player_cell = player_cell
+        self.__field_max_distance = max_distance
+
+        self.__used_manager.next_iteration()
+        player_i, player_j = player_cell
+        self.__distance[player_i][player_j] = 0
+
+        self.__order = [player_cell]
+        self.__order_step = [-1]
+        self.__order_index = {player_cell: 0}
+        self.__marks = []
+        self.__marks_step = []
+        self.__in_aggre_zone = []
+        self.__in_aggre_zone_step = []
+
+        self.__main_bfs(0)
+        self.__aggre_zone_bfs()
+
+    def __get_first_changed_step(self) -> Optional[int]:
+        """
+        Первый шаг основного bfs, на котором обрабатывалась клетка, у которой поменялось наличие enemy.
+
+        Клетки, до которых bfs не дошел или в которых он уже не продолжался (max_distance), на поле не влияют.
+
+        :return: шаг или None, если поле пересчитывать не нужно
+        """
+        result = None
+        changed_cells = self.__field_enemy_cells ^ self.__saved_enemy_cells
+        for cell in changed_cells:
+            step = self.__order_index.get(cell)
+            if step is None:
+                continue
+            if step and self.__distance[cell[0]][cell[1]] >= self.__field_max_distance:
+                continue
+            if result is None or step < result:
+                result = step
+        return result
+
+    def __repair_field(self, step: int):
+        """
+        Откатывает основной bfs к состоянию перед шагом step и продолжает его. __aggre_zone_bfs зависит от
+        результата основного bfs целиком, поэтому выполняется заново.
+        """
+        if step == 0:
+            self.__rebuild_field(self.__field_player_cell, self.__field_max_distance)
+            return
+
+        order_length = bisect_left(self.__order_step, step)
+        for index in range(order_length, len(self.__order)):
+            cell = self.__order[index]
+            if self.__order_index[cell] == index:
+                del self.__order_index[cell]
+        del self.__order[order_length:]
+        del self.__order_step[order_length:]
+
+        marks_length = bisect_left(self.__marks_step, step)
+        for index in range(marks_length, len(self.__marks)):
+            self.__used_manager.unmark(*self.__marks[index])
+        del self.__marks[marks_length:]
+        del self.__marks_step[marks_length:]
+
+        in_aggre_zone_length = bisect_left(self.__in_aggre_zone_step, step)
+        del self.__in_aggre_zone[in_aggre_zone_length:]
+        del self.__in_aggre_zone_step[in_aggre_zone_length:]
+
+        self.__main_bfs(step)
+        self.__aggre_zone_bfs()
+
+    def __aggre_zone_bfs(self):
         """
         Обработка клеток, из которых недостижим игрок, но которые находятся в aggre_zone
         (путь преграждает другой enemy)
@@ -73,7 +200,9 @@ class GridPathFinder:
         читаемость кода.
         """
         self.__is_in_aggre_zone.next_iteration()
+        max_distance = self.__field_max_distance
 
+        q = deque(self.__in_aggre_zone)
         while len(q):
             i, j = q.popleft()
 
@@ -96,52 +225,52 @@ class GridPathFinder:
 
                 q.append((new_i, new_j))
 
-    def __main_bfs(self, max_distance: int) -> deque:
+    def __main_bfs(self, step: int):
         """
         Основной bfs, в котором обрабатываются пути от игрока до остальных клеток (и соответственно от остальных
-        клеток до игрока).
+        клеток до игрока). Очередь - это __order, начиная с индекса step.
 
-        :return: deque клеток, которые недостижимы для enemy, но находится в aggre_zone
+        Клетки, которые недостижимы для enemy, но находятся в aggre_zone, откладываются в __in_aggre_zone.
         """
-        self.__used_manager.next_iteration()
+        max_distance = self.__field_max_distance
+        order = self.__order
 
-        player_pos = self.__grid.scene.player.pos
-        player_i, player_j = self.__grid.index_manager.get_index_by_pos(
-            player_pos)
-
-        q = deque()  # collections.deque работает быстрее, чем queue.Queue
-        q.append((player_i, player_j))
-        self.__distance[player_i][player_j] = 0
-
-        in_aggre_zone = deque()
-
-        while len(q):
-            i, j = q.popleft()
+        while step < len(order):
+            i, j = order[step]
 
             new_distance = self.__distance[i][j] + 1
             if new_distance > max_distance:
+                step += 1
                 continue
 
+            """
+            клетки, на которых стоят enemy будут обработаны позже. Хоть на эти клетки не могут встать
+            другие enemy, они находятся в aggre_zone.
+            """
+            has_enemy = self.__is_has_enemy.is_marked(i, j)
+
             transition_cells = self.__get_transition_cells(i, j)
             for k in range(len(transition_cells)):
-                new_i = transition_cells[k][0]
-                new_j = transition_cells[k][1]
+                new_cell = transition_cells[k]
+                new_i = new_cell[0]
+                new_j = new_cell[1]
 
                 self.__used_manager.mark(new_i, new_j)
                 self.__parent[new_i][new_j] = (i, j)
                 self.__distance[new_i][new_j] = new_distance
-
-                """
-                клетки, на которых стоят enemy будут обработаны позже. Хоть на эти клетки не могут встать
-                другие enemy, они находятся в aggre_zone.
-                """
-                if not self.__is_has_enemy.is_marked(i, j):
-                    q.append((new_i, new_j))
+                self.__marks.append(new_cell)
+                self.__marks_step.append(step)
+
+                if not has_enemy:
+                    if new_cell not in self.__order_index:
+                        self.__order_index[new_cell] = len(order)
+                    order.append(new_cell)
+                    self.__order_step.append(step)
                 else:
-                    in_aggre_zone.append((new_i, new_j))
+                    self.__in_aggre_zone.append(new_cell)
+                    self.__in_aggre_zone_step.append(step)
 
-        self.__is_has_enemy.next_iteration()
-        return in_aggre_zone
+            step += 1
 
     def __get_transition_cells(self, i0: int, j0: int) -> List[Tuple[int, int]]:
         """
@@ -173,6 +302,7 @@ class GridPathFinder:
         """
         i, j = self.__grid.index_manager.get_index_by_pos(pos)
         self.__is_has_enemy.mark(i, j)
+        self.__saved_enemy_cells.add((i, j))
 
     def is_hearing_player(self, enemy: Enemy) -> bool:
         """
@@ -198,7 +328,7 @@ class GridPathFinder:
         new_i, new_j = self.__parent[i][j]
 
         """
-        Отсутствие этого if'а может привести к багам. Например, enemy попадет в клетку, которая не is_standable и 
+        Отсутствие этого if'а может привести к багам. Например, enemy попадет в клетку, которая не is_standable и
         останется там навсегда.
         """
         if not self.can_stay(new_i, new_j):
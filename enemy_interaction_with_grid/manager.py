@@ -1,10 +1,13 @@
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
 from drawable_objects.enemy import Enemy
 from enemy_interaction_with_grid.hearing.manager import EnemyHearingManager
 from enemy_interaction_with_grid.vision.manager import EnemyVisionManager
+from enemy_interaction_with_grid.vision.room.visibility import VisibilityTable
 from geometry.point import Point
-from map.level.rect.splitter import GridRectangle
+from map.level.rect.splitter import GridRectangle, SplitNode
 
 
 class GridInteractionWithEnemyManager:
@@ -13,14 +16,22 @@ class GridInteractionWithEnemyManager:
 
     слух отвечает за поиск кратчайшего пути.
     зрение отвечает на запросы, видит ли enemy player'а
+
+    :param room_tree: дерево разбиения уровня на комнаты, его листья - rectangles
     """
 
-    def __init__(self, rectangles: List[GridRectangle],
+    def __init__(self, rectangles: List[GridRectangle], room_tree: SplitNode,
                  arr_after_split: List[List[int]],
-                 grid):
+                 grid, rooms_visibility_table: Optional[VisibilityTable] = None):
         self.__hearing_manager = EnemyHearingManager(grid)
         self.__vision_manager = EnemyVisionManager(
-            rectangles, arr_after_split, grid)
+            rectangles, room_tree, arr_after_split, grid, rooms_visibility_table)
+
+    def get_rooms_visibility_table(self) -> VisibilityTable:
+        """
+        Таблица видимости комнат, сохраняется вместе с уровнем.
+        """
+        return self.__vision_manager.rooms_visibility.table
 
     def is_enemy_see_player(self, enemy: Enemy, radius: float) -> bool:
         """
@@ -32,6 +43,18 @@ class GridInteractionWithEnemyManager:
         """
         return self.__vision_manager.is_enemy_see_player(enemy, radius)
 
+    def is_enemy_see_player_in_sector(self, enemy: Enemy) -> bool:
+        """
+        Видит ли enemy player'а, если player в его секторе обзора: не закрывают ли его стены
+        """
+        return self.__vision_manager.is_enemy_see_player_in_sector(enemy)
+
+    def get_vision_candidates(self, enemies: List[Enemy], radius: float) -> np.ndarray:
+        """
+        У каких enemies player в секторе обзора радиуса radius (массив bool)
+        """
+        return self.__vision_manager.get_vision_candidates(enemies, radius)
+
     def save_enemy_pos(self, pos: Point):
         """
         отмечает, что на этой позиции есть enemy
@@ -56,6 +79,13 @@ class GridInteractionWithEnemyManager:
         """
         return self.__hearing_manager.can_stay(i, j)
 
+    def update_cell(self, i: int, j: int):
+        """
+        Клетка (i, j) сетки стала стеной или полом: слух и зрение обновляют то, что посчитали по клеткам
+        """
+        self.__hearing_manager.update_cell(i, j)
+        self.__vision_manager.update_cell(i, j)
+
     def process_logic(self):
         """
         логика менеджера
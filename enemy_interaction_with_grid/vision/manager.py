@@ -1,11 +1,16 @@
-from typing import List
+from typing import List, Optional
 
-from drawable_objects.enemy import Enemy
+import numpy as np
+
+from drawable_objects.enemy import CommandHumanoid, Enemy
 from enemy_interaction_with_grid.vision.room.graph import RoomsGraph
+from enemy_interaction_with_grid.vision.room.visibility import RoomsVisibility, VisibilityTable
 from geometry.optimized.segment import StaticSegment
-from map.level.rect.splitter import GridRectangle
-from geometry.sector import Sector
+from geometry.point import Point
+from map.level.rect.splitter import GridRectangle, SplitNode
+from geometry.sector import Sector, get_inside_sectors_mask
 from constants.grid import CELL_SIZE
+from geometry.vector import length
 from math import sqrt
 
 
@@ -18,12 +23,24 @@ class EnemyVisionManager:
     Enemy видит Player если, Enemy в радиусе видимости и прямая, соединяющая клетку Player и клетку данного Enemy не
     пересекает стены.
     Может быть, нужно еще учитывать поворот Enemy.
+
+    Сначала видимость ищется в таблице видимости комнат (RoomsVisibility), обход RoomsGraph нужен, только если
+    по таблице ответа нет.
+
+    Для многих врагов сразу сектор обзора проверяет get_vision_candidates (один проход NumPy), а стены - только у
+    кандидатов is_enemy_see_player_in_sector.
+
+    :param room_tree: дерево разбиения уровня на комнаты, его листья - rectangles
+    :param rooms_visibility_table: таблица видимости комнат из сохранения уровня; None - посчитать
     """
+    MIN_DISTANCE = sqrt(2) / 2 * CELL_SIZE
 
-    def __init__(self, rectangles: List[GridRectangle],
+    def __init__(self, rectangles: List[GridRectangle], room_tree: SplitNode,
                  arr_after_split: List[List[int]],
-                 grid):
-        self.rooms_graph = RoomsGraph(rectangles, arr_after_split, grid)
+                 grid, rooms_visibility_table: Optional[VisibilityTable] = None):
+        self.rooms_graph = RoomsGraph(rectangles, room_tree, arr_after_split, grid)
+        self.rooms_visibility = RoomsVisibility(rectangles, room_tree, grid, CommandHumanoid.VISION_RADIUS,
+                                                rooms_visibility_table)
         self._grid = grid
 
     def is_enemy_see_player(self, enemy, radius: float) -> bool:
@@ -34,18 +51,58 @@ class EnemyVisionManager:
         :param radius: радиус, в котором player должен находиться
         :return: bool
         """
-        segment = StaticSegment(
-            enemy.pos, self._grid.scene.player.pos)  # важен порядок точек
-        '''
-        если враг стоит вплотную к игроку, то он может быть не в vision_sector, но логично сказать,
-        что он видит игрока
-        '''
-        MIN_DISTANCE = sqrt(2) / 2 * CELL_SIZE
-        if not (segment.length < MIN_DISTANCE or self.__is_player_in_vision_sector(enemy, radius)):
+        player_pos = self._grid.scene.player.pos
+        if not (self.__is_player_nearby(enemy.pos, player_pos) or self.__is_player_in_vision_sector(enemy, radius)):
             return False
+        return self.is_enemy_see_player_in_sector(enemy)
 
+    def is_enemy_see_player_in_sector(self, enemy) -> bool:
+        """
+        Видит ли enemy player'а, если известно, что player в секторе обзора (или вплотную): не закрывают ли его
+        стены.
+        """
+        segment = StaticSegment(
+            enemy.pos, self._grid.scene.player.pos)  # важен порядок точек
+        visibility = self.rooms_visibility.get_visibility(segment.p1, segment.p2)
+        if visibility != RoomsVisibility.PARTIAL:
+            return visibility == RoomsVisibility.VISIBLE
         return not self.rooms_graph.is_seg_intersect_wall(segment)
 
+    def update_cell(self, i: int, j: int):
+        """
+        Клетка (i, j) сетки стала стеной или полом: обновление RoomsGraph и таблицы видимости комнат.
+        """
+        self.rooms_graph.update_cell(i, j)
+        self.rooms_visibility.update_cell(i, j)
+
+    def get_vision_candidates(self, enemies: List[Enemy], radius: float) -> np.ndarray:
+        """
+        Кандидаты в видящие player'а: те enemies, у которых player в секторе обзора (или вплотную). Остальные его
+        точно не видят, кандидатам нужна еще проверка стен (is_enemy_see_player_in_sector).
+
+        :param enemies: враги
+        :param radius: радиус, в котором player должен находиться
+        :return: массив bool по enemies
+        """
+        if not enemies:
+            return np.zeros(0, dtype=bool)
+        player_pos = self._grid.scene.player.pos
+        positions = np.array([(enemy.pos.x, enemy.pos.y) for enemy in enemies], dtype=float)
+        angles = np.array([enemy.angle for enemy in enemies], dtype=float)
+        mask = get_inside_sectors_mask(positions, angles, radius, CommandHumanoid.VIEW_ANGLE, player_pos)
+        dx = player_pos.x - positions[:, 0]
+        dy = player_pos.y - positions[:, 1]
+        mask |= np.sqrt(dx * dx + dy * dy) < EnemyVisionManager.MIN_DISTANCE
+        return mask
+
+    @staticmethod
+    def __is_player_nearby(enemy_pos: Point, player_pos: Point) -> bool:
+        """
+        Если враг стоит вплотную к игроку, то он может быть не в vision_sector, но логично сказать, что он видит
+        игрока.
+        """
+        return length(player_pos - enemy_pos) < EnemyVisionManager.MIN_DISTANCE
+
     def __is_player_in_vision_sector(self, enemy: Enemy, radius: float) -> bool:
         """
         Находится ли Player в секторе обзора enemy
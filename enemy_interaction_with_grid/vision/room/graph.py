@@ -6,7 +6,7 @@ from enemy_interaction_with_grid.vision.rectangle_bypass.arr_correcter import Ar
 from geometry.point import Point
 from geometry.optimized.segment import StaticSegment
 from enemy_interaction_with_grid.vision.room.room import Room
-from map.level.rect.splitter import GridRectangle
+from map.level.rect.splitter import GridRectangle, SplitNode
 from utils.is_marked_manager import IsMarkedManager
 from utils.list import copy_2dimensional_list
 
@@ -14,10 +14,14 @@ from utils.list import copy_2dimensional_list
 class RoomsGraph:
     """
     Граф комнат. Нужен для того, чтобы отвечать на запрос, пересекает ли отрезок какую-нибудь стену.
+
+    :param room_tree: дерево разбиения уровня на комнаты, его листья - rectangles
     """
 
-    def __init__(self, rectangles: List[GridRectangle], arr_after_split: List[List[int]], grid):
+    def __init__(self, rectangles: List[GridRectangle], room_tree: SplitNode, arr_after_split: List[List[int]],
+                 grid):
         self._grid = grid
+        self._room_tree = room_tree
 
         # делаем копию списка, т.к. в будущем его изменим
         self._arr_after_split = copy_2dimensional_list(arr_after_split)
@@ -63,6 +67,14 @@ class RoomsGraph:
 
         return False
 
+    def update_cell(self, i: int, j: int):
+        """
+        Клетка (i, j) сетки стала стеной или полом: у комнат, в которые она входит, пересоздаются прямоугольники
+        коллизий.
+        """
+        for leaf in self._room_tree.get_leaves_intersecting(GridRectangle((i, j), (i, j))):
+            self._rooms[leaf.color - 1].update_collision_rectangles()
+
     def _get_room_color_by_pos(self, pos: Point) -> int:
         """
         получение цвета, в которую окрашена комната по позиции.
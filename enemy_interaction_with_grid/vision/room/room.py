@@ -2,7 +2,6 @@ from typing import List, Tuple
 
 from pygame import draw
 
-from enemy_interaction_with_grid.vision.rectangle_bypass.collision_form_creator import CollisionFormCreator
 from enemy_interaction_with_grid.vision.rectangle_bypass.rectangle_neighbours import RectangleNeighbours
 from geometry.optimized.segment import StaticSegment
 from geometry.rectangle import Rectangle
@@ -30,6 +29,20 @@ class Room:
         self._drawer = RoomDrawer(
             self._grid, self._outer_rectangle, self._collision_rectangles)
 
+    def is_index_inside(self, i: int, j: int) -> bool:
+        """
+        Лежит ли клетка (i, j) в прямоугольнике комнаты (вместе с краями).
+        """
+        return self._grid_rectangle.is_index_inside(i, j)
+
+    def update_collision_rectangles(self):
+        """
+        Пересоздание прямоугольников коллизий после изменения клеток комнаты.
+        """
+        self._collision_rectangles = self._get_collision_rectangles(self._grid)
+        self._drawer = RoomDrawer(
+            self._grid, self._outer_rectangle, self._collision_rectangles)
+
     def is_intersect(self, seg: StaticSegment) -> bool:
         """
         Пересекает ли отрезок внутренние прямоугольники комнаты (то есть стены).
@@ -69,11 +82,12 @@ class Room:
 
     def _get_collision_rectangles(self, grid) -> List[StaticRectangle]:
         """
-        Создание и получение прямоугольников коллизий
+        Создание и получение прямоугольников коллизий: стены комнаты (ее края), покрытые прямоугольниками
+        (CollisionGrid.get_wall_rectangles).
         """
-        room_form = CollisionFormCreator(self._grid_rectangle)
-        result = room_form.get_collision_rectangles(grid.arr, grid)
-        return result
+        rectangle = self._grid_rectangle
+        return grid.get_wall_rectangles(rectangle.top_index, rectangle.left_index,
+                                        rectangle.bottom_index, rectangle.right_index)
 
     def _get_outer_rectangle(self, grid) -> StaticRectangle:
         """
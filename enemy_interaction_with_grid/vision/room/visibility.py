@@ -0,0 +1,287 @@
+from math import ceil, floor
+from typing import Dict, List, Optional, Tuple
+
+from geometry.point import Point
+from map.level.rect.splitter import GridRectangle, SplitNode
+
+# пары комнат [номер первой, номер второй (не меньше первой), видимость]; пар PARTIAL в ней нет
+VisibilityTable = List[List[int]]
+
+
+class RoomsVisibility:
+    """
+    Заранее посчитанная видимость между комнатами (potentially visible set): для каждой пары комнат - все ли
+    отрезки между точками их внутренностей проходят мимо стен (VISIBLE), все ли задевают стены (HIDDEN) или
+    бывает по-разному (PARTIAL). Внутренность комнаты - ее прямоугольник без краев, в краях стоят стены и
+    проходы. Для точек в краях комнат и для пар PARTIAL нужна точная проверка (RoomsGraph).
+
+    Все отрезки между двумя прямоугольниками заполняют их выпуклую оболочку. Пара VISIBLE, если в оболочке нет
+    стен. Пара HIDDEN, если комнаты разделены по x (y) и есть столбец (строка) клеток между ними, в котором
+    стены закрывают все сечение оболочки: его пересекает любой отрезок. Считается в клетках по passability
+    сетки. Точки ровно на границе стены не учитываются: игрок и враги не подходят к стенам вплотную.
+
+    Пары комнат дальше max_distance друг от друга не считаются и остаются PARTIAL: враг не видит так далеко.
+    Соседей комнаты ближе max_distance ищет дерево разбиения на комнаты, поэтому пар считается порядка
+    числа комнат, а не его квадрата. Хранятся только пары VISIBLE и HIDDEN (table).
+
+    Когда клетка сетки меняется, пересчитываются только пары, которых она касается (update_cell).
+
+    :param rectangles: прямоугольники комнат
+    :param room_tree: дерево разбиения на комнаты, его листья - rectangles
+    :param grid: сетка
+    :param max_distance: расстояние, дальше которого видимость не считается
+    :param table: готовая таблица (из сохранения уровня); None - посчитать
+    """
+    PARTIAL = 0
+    VISIBLE = 1
+    HIDDEN = 2
+
+    def __init__(self, rectangles: List[GridRectangle], room_tree: SplitNode, grid, max_distance: float,
+                 table: Optional[VisibilityTable] = None):
+        self._grid = grid
+        height, width = len(grid.arr), len(grid.arr[0])
+        self.__width = width
+        self.__height = height
+        self.__room_tree = room_tree
+        self.__rooms = [(rectangle.left_index + 1, rectangle.top_index + 1,
+                         rectangle.right_index, rectangle.bottom_index) for rectangle in rectangles]
+        self.__room_indexes = [-1] * (width * height)
+        for index, (x1, y1, x2, y2) in enumerate(self.__rooms):
+            for i in range(y1, y2):
+                self.__room_indexes[i * width + x1:i * width + x2] = [index] * (x2 - x1)
+
+        self.__max_distance = max_distance / grid.cell_width
+        # соседи комнат ближе max_distance и проходимость сетки по строкам и столбцам: нужны, чтобы посчитать
+        # таблицу и чтобы ее обновлять, для таблицы из сохранения считаются при первом update_cell
+        self.__neighbours = None
+        self.__rows = None
+        self.__columns = None
+        if table is None:
+            self.__pairs = self.__get_pairs()
+        else:
+            self.__pairs = {(index1, index2): visibility for index1, index2, visibility in table}
+
+    @property
+    def table(self) -> VisibilityTable:
+        """
+        Пары VISIBLE и HIDDEN по возрастанию номеров комнат, для сохранения уровня.
+        """
+        return [[index1, index2, visibility] for (index1, index2), visibility in sorted(self.__pairs.items())]
+
+    def get_visibility(self, p1: Point, p2: Point) -> int:
+        """
+        Видимость между точками по таблице: VISIBLE, HIDDEN или PARTIAL (нужна точная проверка).
+        """
+        room1 = self.__get_room_index(p1)
+        room2 = self.__get_room_index(p2)
+        if room1 == -1 or room2 == -1:
+            return RoomsVisibility.PARTIAL
+        pair = (room1, room2) if room1 <= room2 else (room2, room1)
+        return self.__pairs.get(pair, RoomsVisibility.PARTIAL)
+
+    def __get_room_index(self, pos: Point) -> int:
+        """
+        Номер комнаты, во внутренности которой лежит pos, или -1.
+        """
+        i, j = self._grid.get_index_by_pos(pos)
+        if not (0 <= i < self.__height and 0 <= j < self.__width):
+            return -1
+        return self.__room_indexes[i * self.__width + j]
+
+    def update_cell(self, i: int, j: int):
+        """
+        Клетка (i, j) сетки стала стеной или полом: пересчитываются пары комнат, в чьей выпуклой оболочке
+        (или в линиях между комнатами) может быть эта клетка. Оболочка лежит в общем описанном прямоугольнике
+        комнат, поэтому берутся пары, чей описанный прямоугольник задевает клетку. Первая комната такой пары
+        не дальше от клетки, чем max_distance и размер комнаты, ее ищет дерево разбиения.
+        """
+        if self.__neighbours is None:
+            self.__neighbours = self.__get_neighbours()
+            self.__rows, self.__columns = self.__get_lines(self._grid.passability)
+        passable = self._grid.passability[i * self.__width + j]
+        self.__rows[i * self.__width + j] = passable
+        self.__columns[j * self.__height + i] = passable
+
+        rooms = self.__rooms
+        margin = ceil(self.__max_distance) + max(max(x2 - x1, y2 - y1) for x1, y1, x2, y2 in rooms) + 2
+        area = GridRectangle((i - margin, j - margin), (i + margin, j + margin))
+        for leaf in self.__room_tree.get_leaves_intersecting(area):
+            index1 = leaf.color - 1
+            x1, y1, x2, y2 = rooms[index1]
+            for index2 in self.__neighbours[index1]:
+                other_x1, other_y1, other_x2, other_y2 = rooms[index2]
+                if min(x1, other_x1) - 1 <= j <= max(x2, other_x2) and min(y1, other_y1) - 1 <= i <= max(y2, other_y2):
+                    self.__set_pair(index1, index2, self.__get_pair_visibility(rooms[index1], rooms[index2],
+                                                                                self.__rows, self.__columns))
+
+    def __set_pair(self, index1: int, index2: int, visibility: int):
+        if visibility == RoomsVisibility.PARTIAL:
+            self.__pairs.pop((index1, index2), None)
+        else:
+            self.__pairs[index1, index2] = visibility
+
+    def __get_lines(self, passability: bytearray) -> Tuple[bytearray, bytearray]:
+        """
+        Проходимость сетки по строкам и по столбцам.
+        """
+        rows = bytearray(passability)
+        columns = bytearray(b''.join(passability[j::self.__width] for j in range(self.__width)))
+        return rows, columns
+
+    def __get_neighbours(self) -> List[List[int]]:
+        """
+        Для каждой комнаты - номера комнат не меньше ее номера и не дальше max_distance от нее (и она сама).
+        """
+        rooms = self.__rooms
+        margin = ceil(self.__max_distance) + 1
+        max_distance2 = self.__max_distance * self.__max_distance
+        result = []
+        for index1, (x1, y1, x2, y2) in enumerate(rooms):
+            area = GridRectangle((y1 - 1 - margin, x1 - 1 - margin), (y2 + margin, x2 + margin))
+            neighbours = []
+            for leaf in self.__room_tree.get_leaves_intersecting(area):
+                index2 = leaf.color - 1
+                if index2 < index1:
+                    continue
+                other_x1, other_y1, other_x2, other_y2 = rooms[index2]
+                dx = max(0, other_x1 - x2, x1 - other_x2)
+                dy = max(0, other_y1 - y2, y1 - other_y2)
+                if dx * dx + dy * dy <= max_distance2:
+                    neighbours.append(index2)
+            result.append(sorted(neighbours))
+        return result
+
+    def __get_pairs(self) -> Dict[Tuple[int, int], int]:
+        self.__neighbours = self.__get_neighbours()
+        self.__rows, self.__columns = self.__get_lines(self._grid.passability)
+        rooms = self.__rooms
+        pairs = {}
+        for index1, neighbours in enumerate(self.__neighbours):
+            for index2 in neighbours:
+                visibility = self.__get_pair_visibility(rooms[index1], rooms[index2], self.__rows, self.__columns)
+                if visibility != RoomsVisibility.PARTIAL:
+                    pairs[index1, index2] = visibility
+        return pairs
+
+    def __get_pair_visibility(self, room: Tuple[int, int, int, int], other_room: Tuple[int, int, int, int],
+                              rows: bytearray, columns: bytearray) -> int:
+        """
+        Видимость между комнатами не дальше max_distance друг от друга.
+        """
+        width, height = self.__width, self.__height
+        x1, y1, x2, y2 = room
+        other_x1, other_y1, other_x2, other_y2 = other_room
+        dx = max(0, other_x1 - x2, x1 - other_x2)
+        dy = max(0, other_y1 - y2, y1 - other_y2)
+        corners = [(x, y) for x in (x1, x2) for y in (y1, y2)] + \
+                  [(x, y) for x in (other_x1, other_x2) for y in (other_y1, other_y2)]
+        hull = ConvexHull(corners)
+        if is_hull_free(hull, columns, height):
+            return RoomsVisibility.VISIBLE
+        if dx and is_hull_blocked(hull, (x1, x2), (other_x1, other_x2), columns, height) or \
+                dy and is_hull_blocked(ConvexHull([(y, x) for x, y in corners]), (y1, y2),
+                                       (other_y1, other_y2), rows, width):
+            return RoomsVisibility.HIDDEN
+        return RoomsVisibility.PARTIAL
+
+
+class ConvexHull:
+    """
+    Выпуклая оболочка точек (алгоритм Эндрю), хранится двумя цепочками вершин с возрастающей первой
+    координатой: нижней (наименьшая вторая координата) и верхней.
+    """
+
+    def __init__(self, points: List[Tuple[float, float]]):
+        points = sorted(set(points))
+        self.min_u = points[0][0]
+        self.max_u = points[-1][0]
+        self.__lower = self.__get_chain(points, 1)
+        self.__upper = self.__get_chain(points, -1)
+
+    @staticmethod
+    def __get_chain(points: List[Tuple[float, float]], sign: int) -> List[Tuple[float, float]]:
+        """
+        :param sign: 1 - нижняя цепочка, -1 - верхняя
+        """
+        chain = []
+        for point in points:
+            while len(chain) >= 2 and sign * ((chain[-1][0] - chain[-2][0]) * (point[1] - chain[-2][1]) -
+                                              (chain[-1][1] - chain[-2][1]) * (point[0] - chain[-2][0])) <= 0:
+                chain.pop()
+            chain.append(point)
+        # вертикальные края оболочки: из вершин с одной первой координатой нужна крайняя
+        if len(chain) >= 2 and chain[0][0] == chain[1][0]:
+            chain.pop(1 if sign == 1 else 0)
+        if len(chain) >= 2 and chain[-1][0] == chain[-2][0]:
+            chain.pop(-1 if sign == 1 else -2)
+        return chain
+
+    @staticmethod
+    def __get_value(chain: List[Tuple[float, float]], u: float) -> float:
+        for k in range(1, len(chain)):
+            (a_u, a_v), (b_u, b_v) = chain[k - 1], chain[k]
+            if u <= b_u:
+                return a_v + (b_v - a_v) * (u - a_u) / (b_u - a_u)
+        return chain[-1][1]
+
+    def get_bounds(self, u1: float, u2: float) -> Tuple[float, float]:
+        """
+        Наименьшая и наибольшая вторая координата точек оболочки с первой координатой от u1 до u2
+        (min_u <= u1 <= u2 <= max_u).
+        """
+        lower, upper = self.__lower, self.__upper
+        low = min(self.__get_value(lower, u1), self.__get_value(lower, u2))
+        high = max(self.__get_value(upper, u1), self.__get_value(upper, u2))
+        for u, v in lower:
+            if u1 < u < u2 and v < low:
+                low = v
+        for u, v in upper:
+            if u1 < u < u2 and v > high:
+                high = v
+        return low, high
+
+    def get_section(self, u: float) -> Tuple[float, float]:
+        """
+        Сечение оболочки: наименьшая и наибольшая вторая координата точек оболочки с первой координатой u.
+        """
+        return self.__get_value(self.__lower, u), self.__get_value(self.__upper, u)
+
+
+def is_hull_free(hull: ConvexHull, columns: bytearray, height: int) -> bool:
+    """
+    Нет ли стен внутри выпуклой оболочки (в клетках).
+
+    :param columns: проходимость сетки по столбцам: столбец j - columns[j * height:(j + 1) * height]
+    :param height: высота сетки
+    """
+    for j in range(floor(hull.min_u), ceil(hull.max_u)):
+        low, high = hull.get_bounds(max(j, hull.min_u), min(j + 1, hull.max_u))
+        start = j * height + floor(low)
+        end = j * height + ceil(high)
+        if columns.find(0, start, end) != -1:
+            return False
+    return True
+
+
+def is_hull_blocked(hull: ConvexHull, span1: Tuple[int, int], span2: Tuple[int, int],
+                    lines: bytearray, line_length: int) -> bool:
+    """
+    Задевает ли стены любой отрезок между прямоугольниками, чья выпуклая оболочка hull: есть ли линия клеток
+    между прямоугольниками, стены которой закрывают все сечение оболочки по середине линии. Первая координата
+    точек - поперек линий.
+
+    :param span1: отрезок первой координаты первого прямоугольника
+    :param span2: отрезок первой координаты второго прямоугольника
+    :param lines: проходимость сетки по линиям: линия k - lines[k * line_length:(k + 1) * line_length]
+    :param line_length: длина линии
+    """
+    if span1[0] > span2[0]:
+        span1, span2 = span2, span1
+    for k in range(span1[1], span2[0]):
+        middle = k + 0.5
+        low, high = hull.get_section(middle)
+        start = k * line_length + floor(low)
+        end = k * line_length + max(floor(low) + 1, ceil(high))
+        if lines.find(1, start, end) == -1:
+            return True
+    return False
@@ -1,14 +1,19 @@
+import os
 import sys
 import pygame
 import gc
 
+from time import perf_counter
 from typing import Tuple
 
 from controller.controller import Controller
+from controller.input_recording import InputRecord, InputRecorder
+from controller.scripted_controller import ScriptedController
 from geometry.rectangle import Rectangle
 from scenes.base import Scene
 from scenes.game.base import GameScene
 from scenes.game.level import LevelScene
+from scenes.loading import LoadingScene
 from scenes.menu.about import AboutMenuScene
 from scenes.menu.main import MainMenuScene
 from scenes.menu.settings import SettingsMenuScene
@@ -16,15 +21,41 @@ from scenes.menu.space_choice import SpaceChoiceMenuScene
 from scenes.menu.redirecting.gameover import GameoverScene
 from scenes.menu.redirecting.clone_killed import CloneKilledScene
 from scenes.menu.redirecting.victory import VictoryScene
+from space.level_pregenerator import LevelPregenerator
+from utils.frame_profiler import FrameProfiler
+from utils.frame_scheduler import FrameScheduler
 from utils.image import ImageManager
 from utils.game_data_manager import GameDataManager
+from utils.random import RandomManager
 from utils.sound import SoundManager
 
 
 class Game:
     """
     Класс игры в смысле приложения. Содержит главный рабочий цикл; организует отрисовку графического окна;
-    как поля имеет контроллер ввода и менеджеры картинок, звука, файлов игры; руководит работой сцен.
+    как поля имеет контроллер ввода, планировщик кадров, профилировщик, заблаговременный генератор уровней и
+    менеджеры картинок, звука, файлов игры, случайных чисел; руководит работой сцен.
+
+    Клавиши профилировщика (PROFILER_CONTROLS) работают на любой сцене: OVERLAY показывает и скрывает время фаз
+    кадра, CPROFILE начинает и заканчивает запись cProfile.
+
+    В безоконном режиме (headless) окно создается драйвером SDL dummy, звук выключен (микшер не используется),
+    ничего не рисуется, а ввод задает ScriptedController. Так логику уровня можно гонять без дисплея:
+    в тестах, на CI, для замеров (simulate).
+
+    Если задан record_path, ввод каждого тика главного цикла записывается (InputRecorder) и по выходе из цикла
+    сохраняется в этот файл. Тики загрузки сцены (LoadingScene) не записываются: при воспроизведении без окна
+    сцены конструируются сразу. Seed космосов при записи фиксируется (если не задан, выбирается случайный) и
+    сохраняется в записи, так что ее можно воспроизвести (simulate.py --replay).
+
+    Заблаговременная генерация уровней (LevelPregenerator) работает только в игре с окном и без записи ввода:
+    загрузка заранее сгенерированного уровня не должна отличать игру от ее безоконного воспроизведения.
+
+    :param width: ширина окна
+    :param height: высота окна
+    :param headless: безоконный режим
+    :param seed: seed новых космосов (см. RandomManager); None - случайный
+    :param record_path: путь к файлу записи ввода; None - ввод не записывается
     """
 
     MAIN_MENU_SCENE_INDEX = 0
@@ -35,9 +66,20 @@ class Game:
     CLONE_KILLED_SCENE_INDEX = 5
     VICTORY_SCENE_INDEX = 6
     TITLE = 'Space Caravan'
+    PROFILER_CONTROLS = {
+        'OVERLAY': pygame.K_F3,
+        'CPROFILE': pygame.K_F4,
+    }
 
-    def __init__(self, width: int = 1000, height: int = 700):
-        pygame.mixer.init(22100, -16, 2, 64)  # removes sound delay
+    def __init__(self, width: int = 1000, height: int = 700, headless: bool = False, seed: int = None,
+                 record_path: str = None):
+        self.headless = headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+            SoundManager.enabled = False
+        else:
+            pygame.mixer.init(22100, -16, 2, 64)  # removes sound delay
         pygame.init()
         pygame.display.set_caption(Game.TITLE)
         self.size = (width, height)
@@ -47,8 +89,18 @@ class Game:
         SoundManager.load_all()
         SoundManager.configure_volume()
         self.__file_manager = GameDataManager()
+        self.__random_manager = RandomManager(seed)
+        self.__scheduler = FrameScheduler()
+        self.__profiler = FrameProfiler()
+        pregeneration_workers = 0 if headless or record_path is not None else LevelPregenerator.WORKERS
+        self.__level_pregenerator = LevelPregenerator(self, pregeneration_workers)
 
-        self.__controller = Controller(self)
+        self.__controller = ScriptedController(self) if headless else Controller(self)
+        self.__record_path = record_path
+        self.__recorder = None
+        if record_path is not None:
+            self.__random_manager.space_seed = self.__random_manager.create_space_seed()
+            self.__recorder = InputRecorder(self.__controller, InputRecord(self.__random_manager.space_seed, self.size))
         self.__scenes_classes = [
             MainMenuScene,
             SettingsMenuScene,
@@ -79,7 +131,11 @@ class Game:
         self.__create_window()
 
     def __create_window(self):
+        """
+        После пересоздания окна формат его пикселей может поменяться, поэтому картинки переводятся в него заново.
+        """
         self.__screen = pygame.display.set_mode(self.__size, pygame.RESIZABLE)
+        ImageManager.convert_all()
 
     @property
     def screen(self) -> pygame.Surface:
@@ -105,24 +161,64 @@ class Game:
     def file_manager(self) -> GameDataManager:
         return self.__file_manager
 
+    @property
+    def random_manager(self) -> RandomManager:
+        return self.__random_manager
+
+    @property
+    def scheduler(self) -> FrameScheduler:
+        return self.__scheduler
+
+    @property
+    def profiler(self) -> FrameProfiler:
+        return self.__profiler
+
+    @property
+    def level_pregenerator(self) -> LevelPregenerator:
+        return self.__level_pregenerator
+
+    @property
+    def current_scene(self) -> Scene:
+        return self.__current_scene
+
     def set_scene(self, scene: Scene):
         """
-        Установка заданной сцены текущей. Старая сцена может быть None; если она не None, она сохраняется. Если
+        Установка заданной сцены текущей. Еще не начатые заблаговременные генерации уровней отменяются (их заново
+        ставит в очередь космическая карта). Старая сцена может быть None; если она не None, она сохраняется. Если
         старая сцена игровая, она отправляется на удаление. Далее новой сцене подгружается игрок и объект с общими
-        данными игры, если необходимо. После вызывается конструирование новой сцены и обновляется __current_scene.
+        данными игры, если необходимо, и заново начинается игровой поток случайных чисел. После вызывается
+        конструирование новой сцены и обновляется __current_scene. Время конструирования не догоняется тиками логики.
+
+        Если у сцены BUILD_IN_BACKGROUND и игра не безоконная, сцена строится в фоновом потоке, а текущей на это
+        время становится LoadingScene; она сама установит построенную сцену (set_built_scene). В безоконном режиме
+        сцена всегда конструируется сразу: так после set_scene с ней можно работать, а тиков на загрузку нет.
 
         :param scene: ссылка на новую сцену
         """
+        self.__level_pregenerator.cancel()
         if self.__current_scene:
             self.__current_scene.save()
         if isinstance(self.__current_scene, GameScene):
             self.__scenes_to_delete.append(self.__current_scene)
         if isinstance(scene, GameScene):
             scene.load_common_data()
+            self.__random_manager.start_gameplay(scene.data_filename)
         if isinstance(scene, LevelScene):
             scene.load_player()
-        scene.construct()
+        if scene.BUILD_IN_BACKGROUND and not self.headless:
+            self.__current_scene = LoadingScene(self, scene)
+            return
+        scene.build()
+        self.set_built_scene(scene)
+
+    def set_built_scene(self, scene: Scene):
+        """
+        Завершение конструирования построенной сцены (finalize) и установка ее текущей.
+        """
+        scene.finalize()
         self.__current_scene = scene
+        self.__scheduler.reset()
+        self.__profiler.reset()
 
     def set_scene_with_index(self, scene_index: int):
         """
@@ -157,13 +253,68 @@ class Game:
             self.file_manager.delete_space_storage()
         self.__lost_spaces.clear()
 
+    def __process_profiler_controls(self):
+        key = self.__controller.bumped_key
+        if key == self.PROFILER_CONTROLS['OVERLAY']:
+            self.__profiler.toggle_overlay()
+        elif key == self.PROFILER_CONTROLS['CPROFILE']:
+            path = self.__profiler.toggle_cprofile()
+            if path is not None:
+                print('cProfile: {}'.format(path))
+
     def main_loop(self):
         """
-        Главный рабочий цикл.
+        Главный рабочий цикл. Логика сцены идет фиксированными тиками, которые планирует FrameScheduler: за кадр
+        выполняется столько тиков, сколько накопилось времени, после чего кадр рисуется (или пропускается при
+        отставании). Ввод обрабатывается перед каждым тиком, чтобы щелчок или нажатие клавиши попадали ровно
+        в один тик. Если машина не успевает, в консоль выводится статистика планировщика.
+
+        Запись ввода сохраняется и при выходе из цикла по исключению: так можно воспроизвести и падение.
+        """
+        self.__scheduler.reset()
+        try:
+            while self.__running:
+                self.__profiler.begin_frame()
+                for tick in range(self.__scheduler.begin_frame()):
+                    self.__controller.iteration()
+                    if self.__recorder is not None and not isinstance(self.__current_scene, LoadingScene):
+                        self.__recorder.record_tick()
+                    self.__process_profiler_controls()
+                    self.__current_scene.process_all_logic()
+                    if not self.__running:
+                        break
+                if self.__scheduler.should_draw() and not self.headless:
+                    self.__current_scene.process_all_draw()
+                    self.__profiler.draw_overlay(self.screen)
+                    pygame.display.flip()
+                self.__delete_lost_spaces()
+                self.__delete_garbage_scenes()
+                self.__profiler.end_frame()
+                if self.__scheduler.end_frame() and self.__scheduler.is_lagging():
+                    print(self.__scheduler.get_report())
+        finally:
+            self.__level_pregenerator.shutdown()
+            if self.__recorder is not None:
+                self.__recorder.record.save(self.__record_path)
+                print('Запись ввода: {}'.format(self.__record_path))
+        sys.exit(0)
+
+    def simulate(self, ticks: int) -> float:
         """
-        while self.__running:
+        Выполнение ticks тиков логики подряд, без отрисовки и без ожидания между тиками. Для безоконного режима:
+        ввод задается скриптом контроллера. Останавливается раньше, если игра завершена (end). Для профилировщика
+        каждый тик - отдельный кадр.
+
+        :return: затраченное время в секундах
+        """
+        start = perf_counter()
+        for tick in range(ticks):
+            if not self.__running:
+                break
+            self.__profiler.begin_frame()
             self.__controller.iteration()
-            self.__current_scene.iteration()
+            self.__current_scene.process_all_logic()
             self.__delete_lost_spaces()
             self.__delete_garbage_scenes()
-        sys.exit(0)
+            self.__profiler.end_frame()
+        return perf_counter() - start
@@ -0,0 +1,233 @@
+"""
+Пакетная генерация уровней без окна: для каждого биома из level_settings, каждого размера и каждого seed
+уровень генерируется в процессах-генераторах тем же генератором карты (LevelGrid.LEVEL_GENERATOR) и
+LevelObjectsGenerator, что и в игре, и записывается в формате сохранения уровня (MainScene.to_dict). Игра
+и окно не создаются, картинки загружаются без перевода в формат окна.
+
+Уровень зависит от seed космоса, имени файла уровня (--name) и биома: с --name planet<индекс планеты>,
+seed космоса, биомом планеты и размером 100x100 получается тот же уровень, что при высадке в игре.
+
+Для каждого уровня выводится время генерации карты и объектов, число комнат, врагов и сундуков, доля пола,
+число связных областей пола и доля пола, достижимая из точки появления игрока. Нужно для сравнения
+генераторов и поиска неудачных seed'ов. Запуск из корня проекта:
+
+python generate_levels.py --count 10 --biom 1 --biom 2 --size 100x100 --size 300x300 --output levels
+"""
+import argparse
+import json
+import os
+import time
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from constants.grid import CELL_SIZE
+from geometry.point import Point
+from map.level.settings import level_settings
+from utils.game_data_manager import GameDataManager, to_list_of_dicts
+from utils.game_plane import GamePlane
+from utils.image import ImageManager
+from utils.random import RandomManager
+
+LEVEL_NAME = 'level'
+
+
+class GenerationGame:
+    """
+    Все, что генерации уровня нужно от игры: генераторы случайных чисел космоса с данным seed.
+    """
+
+    def __init__(self, seed: int):
+        self.random_manager = RandomManager()
+        self.random_manager.seed = seed
+        self.controller = None
+
+
+class GenerationScene:
+    """
+    Все, что генерации уровня нужно от сцены уровня: списки врагов и объектов и плоскость для их позиций.
+    """
+
+    def __init__(self, game: GenerationGame, data_filename: str):
+        self.game = game
+        self.data_filename = data_filename
+        self.enemies = []
+        self.game_objects = []
+        self.plane = GamePlane()
+
+    def to_dict(self, grid) -> Dict:
+        """
+        Словарь в формате сохранения сцены уровня (MainScene.to_dict).
+        """
+        return {
+            'interface_objects': [],
+            'game_objects': to_list_of_dicts(self.game_objects),
+            'enemies': to_list_of_dicts(self.enemies),
+            'grid': grid.to_dict(),
+        }
+
+
+def get_file_name(name: str, biom: int, width: int, height: int, seed: int) -> str:
+    return '{}_{}_{}x{}_{}'.format(name, biom, width, height, seed)
+
+
+def get_connectivity(grid) -> Tuple[int, int]:
+    """
+    Связность пола сетки (обход в ширину по соседям по стороне).
+
+    :return: число связных областей пола и число клеток пола, достижимых из точки появления игрока
+    """
+    from scenes.game.level import LevelScene  # В обход цикличеких import'ов
+    height, width = len(grid.arr), len(grid.arr[0])
+    passability = grid.passability
+    components = [0] * (width * height)
+    components_count = 0
+    for start in range(width * height):
+        if not passability[start] or components[start]:
+            continue
+        components_count += 1
+        components[start] = components_count
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            i, j = divmod(index, width)
+            for neighbour_i, neighbour_j in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+                if not (0 <= neighbour_i < height and 0 <= neighbour_j < width):
+                    continue
+                neighbour = neighbour_i * width + neighbour_j
+                if passability[neighbour] and not components[neighbour]:
+                    components[neighbour] = components_count
+                    queue.append(neighbour)
+    spawn_i, spawn_j = grid.index_manager.get_index_by_pos(LevelScene.PLAYER_SPAWN_POINT)
+    spawn_component = components[spawn_i * width + spawn_j]
+    reachable = components.count(spawn_component) if spawn_component else 0
+    return components_count, reachable
+
+
+def generate_level(biom: int, width: int, height: int, seed: int, name: str = LEVEL_NAME,
+                   output: Optional[str] = None) -> Dict:
+    """
+    Генерация одного уровня так же, как сцена уровня при первой высадке, но без графики сетки.
+
+    :param output: папка, в которую записывается уровень; None - не записывать
+    :return: статистика уровня
+    """
+    from drawable_objects.ladder import Ladder  # В обход цикличеких import'ов
+    from map.level.grid import LevelGrid
+    from scenes.game.main import MainScene
+    game = GenerationGame(seed)
+    scene = GenerationScene(game, name)
+    game.random_manager.start_gameplay(name)
+    grid = LevelGrid(scene, game.controller, Point(0, 0))
+    grid.biom = biom
+
+    start = time.perf_counter()
+    grid.generate(CELL_SIZE, CELL_SIZE, width, height)
+    elapsed = time.perf_counter() - start
+    scene.game_objects.append(Ladder(scene, game.controller, MainScene.LADDER_POS, 0))
+
+    file_name = get_file_name(name, biom, width, height, seed)
+    if output is not None:
+        GameDataManager.STORAGE_ROOT = output
+        GameDataManager().write_data(file_name, scene.to_dict(grid), in_space=False)
+
+    components, reachable = get_connectivity(grid)
+    floor = sum(grid.passability)
+    return {
+        'file_name': file_name,
+        'biom': biom,
+        'width': width,
+        'height': height,
+        'seed': seed,
+        'time': elapsed,
+        'rooms': len(grid.to_dict()['room_rectangles']),
+        'enemies': len(scene.enemies),
+        'chests': len(scene.game_objects) - 1,
+        'floor': floor / (width * height),
+        'components': components,
+        'reachable': reachable / floor if floor else 0,
+    }
+
+
+def init_worker():
+    """
+    Загрузка картинок в процессе-генераторе: враги и сундуки берут из них размеры.
+    """
+    import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+    ImageManager.load_all()
+
+
+def generate_job(job: Tuple) -> Dict:
+    return generate_level(*job)
+
+
+def parse_size(value: str) -> Tuple[int, int]:
+    width, height = value.lower().split('x')
+    return int(width), int(height)
+
+
+def get_report_line(stats: Dict) -> str:
+    return '{:<30} {:>8.1f} ms  rooms {:>4}  enemies {:>4}  chests {:>3}  floor {:>5.1%}  ' \
+           'components {:>3}  reachable {:>6.1%}'.format(stats['file_name'], stats['time'] * 1000, stats['rooms'],
+                                                         stats['enemies'], stats['chests'], stats['floor'],
+                                                         stats['components'], stats['reachable'])
+
+
+def get_summary(results: List[Dict]) -> List[str]:
+    """
+    Средние и худшие значения по биомам и размерам.
+    """
+    groups = dict()
+    for stats in results:
+        groups.setdefault((stats['biom'], stats['width'], stats['height']), []).append(stats)
+    lines = []
+    for (biom, width, height), group in sorted(groups.items()):
+        times = [stats['time'] for stats in group]
+        lines.append('biom {} {}x{}: {} levels, time mean {:.1f} ms, max {:.1f} ms, rooms mean {:.1f}, '
+                     'enemies mean {:.1f}, not connected {}'.format(
+                         biom, width, height, len(group), sum(times) / len(times) * 1000, max(times) * 1000,
+                         sum(stats['rooms'] for stats in group) / len(group),
+                         sum(stats['enemies'] for stats in group) / len(group),
+                         sum(stats['components'] > 1 for stats in group)))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Пакетная генерация уровней.')
+    parser.add_argument('--count', type=int, default=10, help='сколько уровней на каждый биом и размер')
+    parser.add_argument('--biom', type=int, action='append', default=None,
+                        help='биом из level_settings (можно несколько раз); по умолчанию все')
+    parser.add_argument('--size', type=parse_size, action='append', default=None,
+                        help='размер уровня в клетках WxH (можно несколько раз); по умолчанию 100x100')
+    parser.add_argument('--seed', type=int, default=0, help='seed первого уровня, следующие - seed + 1, ...')
+    parser.add_argument('--name', default=LEVEL_NAME, help='имя файла уровня, от него зависит генерация')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='число процессов-генераторов')
+    parser.add_argument('--output', default=None, help='папка для уровней; без нее уровни не записываются')
+    parser.add_argument('--report', default=None, help='записать статистику уровней в json-файл')
+    args = parser.parse_args()
+
+    bioms = args.biom if args.biom is not None else list(range(len(level_settings)))
+    sizes = args.size if args.size is not None else [(100, 100)]
+    if args.output is not None and not os.path.exists(args.output):
+        os.makedirs(args.output)
+    jobs = [(biom, width, height, seed, args.name, args.output)
+            for biom in bioms for width, height in sizes for seed in range(args.seed, args.seed + args.count)]
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as executor:
+        for stats in executor.map(generate_job, jobs):
+            print(get_report_line(stats))
+            results.append(stats)
+    elapsed = time.perf_counter() - start
+    for line in get_summary(results):
+        print(line)
+    print('{} levels, {:.2f} s, {} workers'.format(len(results), elapsed, args.workers))
+    if args.report is not None:
+        with open(args.report, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
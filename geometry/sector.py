@@ -1,6 +1,8 @@
 """
 Сектор круга
 """
+import numpy as np
+
 from geometry.optimized.segment import get_vector
 from geometry.point import Point
 from geometry.vector import cross_product, length, vector_from_length_angle
@@ -58,3 +60,36 @@ class Sector:
                   self.__p1.x, self.__p1.y], 10)
         draw.line(screen, (0, 0, 255), [self.__center.x, self.__center.y], [
                   self.__p2.x, self.__p2.y], 10)
+
+
+def get_inside_sectors_mask(centers: np.ndarray, rotation_angles: np.ndarray, radius: float, arc_angle: float,
+                            p: Point) -> np.ndarray:
+    """
+    Sector.is_inside для многих секторов с общими радиусом и углом сразу: внутри каких секторов точка p.
+    Вычисления те же, что в Sector.is_inside, поэтому и результат тот же.
+
+    :param centers: центры секторов, массив формы (n, 2)
+    :param rotation_angles: углы поворота секторов, массив длины n
+    :param radius: радиус секторов
+    :param arc_angle: угол секторов
+    :param p: точка
+    :return: массив bool длины n
+    """
+    x = centers[:, 0]
+    y = centers[:, 1]
+    to_p_x = p.x - x
+    to_p_y = p.y - y
+    dx = x - p.x
+    dy = y - p.y
+    mask = np.sqrt(dx * dx + dy * dy) <= radius
+
+    angles1 = rotation_angles + arc_angle / 2
+    to_p1_x = x + radius * np.cos(angles1) - x
+    to_p1_y = y + -radius * np.sin(angles1) - y
+    mask &= to_p_x * to_p1_y - to_p_y * to_p1_x <= 0
+
+    angles2 = rotation_angles - arc_angle / 2
+    to_p2_x = x + radius * np.cos(angles2) - x
+    to_p2_y = y + -radius * np.sin(angles2) - y
+    mask &= to_p_x * to_p2_y - to_p_y * to_p2_x >= 0
+    return mask
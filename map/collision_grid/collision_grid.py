@@ -1,11 +1,15 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+import numpy as np
 
-from drawable_objects.base import GameSprite
 from geometry.point import Point
+from geometry.optimized.rectangle import StaticRectangle
 from geometry.rectangle import Rectangle, create_rectangle_with_left_top
 from geometry.segment import Segment
 from map.collision_grid.draw_static_manager import GridDrawStaticManager
 from map.collision_grid.intersection_manager import GridIntersectionManager
+from map.collision_grid.static_layer_storage import StaticLayerStorage
+from map.collision_grid.wall_mesh import GridWallMesh, get_collision_rectangle, mesh_walls
 from map.grid import Grid
 from constants.grid import CELL_SIZE
 
@@ -13,31 +17,73 @@ from constants.grid import CELL_SIZE
 class CollisionGrid(Grid):
     """
     Игровая сетка.
-    Представляет собой двумерный список объектов,
+    Представляет собой двумерный список клеток,
     либо стена, либо пол.
     Все они статические (не меняются со временем).
 
     Генерируется в map_construction, далее преобразует
-    инты в объекты.
+    инты в номера клеток.
+
+    Клетка хранится как номер картинки в палитре (_get_tile_palette): arr - список строк-bytearray'ев
+    с этими номерами, палитра общая для всех сеток одного вида (биома). Отдельные объекты на клетки
+    не создаются, позиция клетки вычисляется по индексам.
+
+    Проходимость клеток хранится в плоском bytearray passability (1 - пол, 0 - стена,
+    клетка (i, j) по индексу i * len(arr[0]) + j) и в passability_map - numpy-массиве (len(arr), len(arr[0]))
+    поверх той же памяти. Все запросы к сетке читают их.
+
+    Прямоугольники коллизий стен - жадное покрытие стен прямоугольниками (GridWallMesh), оно строится при
+    первом запросе и заново после изменения клеток.
     """
+    TILE_PALETTE = ['level.spaceship.wall', 'level.spaceship.floor']
+
     def initialize(self):
         self._fill_arr(CELL_SIZE, CELL_SIZE)
 
     def _fill_arr(self, cell_width: int, cell_height: int,
                   width_arr: int = 100, height_arr: int = 100):
+        self.generate(cell_width, cell_height, width_arr, height_arr)
+
+        self._other_initialize()
+
+    def generate(self, cell_width: int, cell_height: int, width_arr: int = 100, height_arr: int = 100):
+        """
+        Генерация без графики: клетки, проходимость, враги и объекты. Не трогает ни окно, ни картинки на экране,
+        поэтому годится и для пакетной генерации уровней без игры (generate_levels.py).
+        """
         super()._fill_arr(0, cell_width, cell_height, width_arr, height_arr)
         self.map_construction()
 
-        self.transform_ints_to_objects()
-
-        self._other_initialize()
+        self.transform_ints_to_tiles()
 
         self.enemy_generation()
 
     def _other_initialize(self):
-        self.static_draw_manager = GridDrawStaticManager(self)
+        self.static_draw_manager = GridDrawStaticManager(self, storage=self._create_static_layer_storage())
         self.grid_intersection_manager = GridIntersectionManager(self)
 
+    def _create_static_layer_storage(self) -> Optional[StaticLayerStorage]:
+        """
+        Хранилище готовой статической графики рядом с сохранением сцены. None, если космос не выбран или сцена
+        не сохраняется.
+        """
+        file_manager = self.scene.game.file_manager
+        if file_manager.space_name is None or not self.scene.data_filename:
+            return None
+        return StaticLayerStorage(file_manager, self.scene.data_filename)
+
+    def prepare_static_layer(self):
+        """
+        Подготовка статической графики на экране. Только в главном потоке.
+        """
+        self.static_draw_manager.prepare_visible()
+
+    def save_static_layer(self):
+        """
+        Запись готовой статической графики на диск, вызывается при сохранении сцены.
+        """
+        self.static_draw_manager.save_chunks()
+
     def enemy_generation(self):
         """
         Спавн врагов на уровне
@@ -53,25 +99,59 @@ class CollisionGrid(Grid):
     def process_draw(self):
         self.static_draw_manager.process_draw()
 
-    def transform_ints_to_objects(self):
+    def transform_ints_to_tiles(self):
         """
-        Необходимо применять после генерации.
+        Необходимо применять после генерации. Любое ненулевое число - пол.
         """
-        for i in range(len(self.arr)):
-            for j in range(len(self.arr[i])):
-                pos_x = self.pos.x + j * self.cell_width + self.cell_width / 2
-                pos_y = self.pos.y + i * self.cell_height + self.cell_height / 2
-                filename_index = int(bool(self.arr[i][j]))
+        self.arr = [bytearray(int(bool(item)) for item in row) for row in self.arr]
+        self._fill_passability()
 
-                self.arr[i][j] = GameSprite(self.scene, self.controller,
-                                            self._get_filename(filename_index), Point(pos_x, pos_y))
+    def _fill_passability(self):
+        """
+        Построение passability и passability_map по номерам клеток.
+
+        O(len(arr) * len(arr[0])) времени и памяти (1 байт на клетку)
+        """
+        self._width_arr = len(self.arr[0])
+        self.passability = bytearray(b''.join(self.arr))
+        self.passability_map = np.frombuffer(self.passability, dtype=np.uint8).reshape(len(self.arr), self._width_arr)
+        self.__wall_mesh = None
+
+    def set_cell(self, i: int, j: int, filename_index: int):
+        """
+        Заменить клетку на стену (0) или пол (1). Обновляются passability, прямоугольники стен и, если статическая
+        графика уже создана, куски с этой клеткой. Данные врагов по клеткам обновляет LevelGrid.set_cell.
+        """
+        self.arr[i][j] = filename_index
+        self.passability[i * self._width_arr + j] = int(bool(filename_index))
+        self.__wall_mesh = None
+        if hasattr(self, 'static_draw_manager'):
+            self.static_draw_manager.invalidate_cell(i, j)
+
+    def get_tile_image_name(self, i: int, j: int) -> str:
+        """
+        Картинка клетки.
+        """
+        return self._get_tile_palette()[self.arr[i][j]]
 
     def is_passable(self, i: int, j: int) -> bool:
-        return self.arr[i][j].image_name != self._get_filename(0)
+        """
+        Проходима ли клетка (i, j). Индексы за пределами сетки - IndexError: по плоскому индексу j за краем
+        попал бы в соседнюю строку (i за нижним краем выходит за passability сам).
+        """
+        width = self._width_arr
+        if i < 0 or not 0 <= j < width:
+            raise IndexError('cell ({}, {}) is out of grid'.format(i, j))
+        return self.passability[i * width + j] == 1
+
+    def _get_tile_palette(self) -> List[str]:
+        """
+        Картинки клеток по их номерам: [стена, пол].
+        """
+        return self.TILE_PALETTE
 
     def _get_filename(self, filename_index: int) -> str:
-        FILENAMES = ['level.spaceship.wall', 'level.spaceship.floor']
-        return FILENAMES[filename_index]
+        return self._get_tile_palette()[filename_index]
 
     def get_collision_rect(self, i: int, j: int) -> Rectangle:
         h = self.cell_height
@@ -80,28 +160,43 @@ class CollisionGrid(Grid):
         x = j * w
         return create_rectangle_with_left_top(Point(x, y) + self.pos, w, h)
 
+    @property
+    def wall_mesh(self) -> GridWallMesh:
+        """
+        Прямоугольники стен всей сетки.
+        """
+        if self.__wall_mesh is None:
+            self.__wall_mesh = GridWallMesh(self)
+        return self.__wall_mesh
+
     def get_collision_rects_nearby(self, pos: Point) -> List[Rectangle]:
         """
-        Возвращает все прямоугольники коллизий статических объектов (стен)
-        в квадрате длиной (1 + INDEX_OFFSET * 2) с центром в клетке,
-        соответствующей координате pos.
+        Возвращает все прямоугольники коллизий статических объектов (стен),
+        задевающие квадрат длиной (1 + INDEX_OFFSET * 2) с центром в клетке,
+        соответствующей координате pos. Прямоугольник стены может быть намного больше квадрата.
         :param pos:
         :return:
         """
         center_i, center_j = self.index_manager.get_index_by_pos(pos)
         INDEX_OFFSET = 2
+        return self.wall_mesh.get_rects_nearby(center_i, center_j, INDEX_OFFSET)
 
-        min_i = max(0, center_i - INDEX_OFFSET)
-        min_j = max(0, center_j - INDEX_OFFSET)
-        max_i = min(len(self.arr), center_i + INDEX_OFFSET + 1)
-        max_j = min(len(self.arr[0]), center_j + INDEX_OFFSET + 1)
-
-        res = []
-        for i in range(min_i, max_i):
-            for j in range(min_j, max_j):
-                if not self.is_passable(i, j):
-                    res.append(self.get_collision_rect(i, j))
-        return res
+    def get_wall_rectangles(self, top: int, left: int, bottom: int, right: int) -> List[StaticRectangle]:
+        """
+        Прямоугольники коллизий, покрывающие стены области клеток (края включительно), например, комнаты.
+        """
+        return [get_collision_rectangle(self, rectangle)
+                for rectangle in mesh_walls(self.passability, self._width_arr, top, left, bottom, right)]
 
     def intersect_seg_walls(self, seg: Segment) -> Point:
         return self.grid_intersection_manager.intersect_seg_walls(seg)
+
+    def intersect_segments_walls(self, starts: np.ndarray, ends: np.ndarray) -> List[Optional[Point]]:
+        """
+        Пересечение со стенами сразу многих отрезков.
+
+        :param starts: массив (n, 2) начал отрезков
+        :param ends: массив (n, 2) концов отрезков
+        :return: для каждого отрезка то же, что вернул бы intersect_seg_walls
+        """
+        return self.grid_intersection_manager.intersect_segments_walls(starts, ends)
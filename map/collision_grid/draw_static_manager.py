@@ -1,76 +1,195 @@
+from math import ceil
+from typing import Optional, Tuple
+
+from map.collision_grid.static_layer_storage import StaticLayerStorage
 from map.grid import Grid
-from pygame import Surface, Rect
+from pygame import Surface
 from utils.image import ImageManager
-from drawable_objects.base import SurfaceObject
+from utils.transform_cache import SurfaceCache
 from geometry.point import Point
 
 
 class GridDrawStaticManager(Grid):
     """
     Класс для оптимизации отрисовки статической графики.
-    Принимает grid, отрисовывает все на 1 surface,
-    далее бьет его на квадраты размером в половину экрана.
+    Бьет grid на куски (chunk'и) размером в половину экрана и рисует кусок на отдельную surface в первый раз,
+    когда он оказывается на экране или рядом с ним. Далее кусок рисуется одним blit'ом.
+
+    Отрисовывает только те куски, которые на экране (как в обычном grid), их не больше 9.
+
+    Готовые куски хранятся в LRU-кэше (SurfaceCache) с ограничением памяти MAX_BYTES: когда он переполняется,
+    удаляются куски, которые дольше всех не были на экране, то есть самые далекие. Поэтому ни время создания
+    уровня, ни память не зависят от его размера.
+
+    При изменении размера окна grid заново бьется на куски под новый размер, сам уровень не пересоздается.
 
-    Отрисовывает только те квадраты, которые на экране (как в обычном grid).
+    Если есть storage, куски, которых нет в памяти, сначала ищутся на диске, а save_chunks записывает туда
+    новые куски из памяти. Так при повторном заходе на уровень куски не рисуются заново.
 
-    Это ускоряет отрисовку, так как все объекты уже заранее отрендерины.
-    Более отрисовка вызывается всего 9 раз (так как полученных квадратов на экране
-    не больше 9).
+    :param grid: сетка, клетки которой рисуются
+    :param max_bytes: ограничение памяти под готовые куски в байтах
+    :param storage: хранилище кусков на диске
     """
+    MAX_BYTES = 32 * 2 ** 20
+    PRELOAD_MARGIN = 1  # на сколько кусков от экрана заранее рисуются куски
+    PRELOADS_PER_FRAME = 1  # сколько кусков вне экрана можно нарисовать за кадр
 
-    def __init__(self, grid: Grid):
-        cell_width = int(grid.scene.width / 2)
-        cell_height = int(grid.scene.height / 2)
+    def __init__(self, grid: Grid, max_bytes: int = MAX_BYTES, storage: Optional[StaticLayerStorage] = None):
+        super().__init__(grid.scene, grid.controller, grid.pos)
+        self.__grid = grid
+        self.chunks = SurfaceCache(max_bytes)
+        self.storage = storage
+        self.__tile_margin = self.__get_tile_margin()
+        self.split_on_frames()
+
+    def __get_tile_margin(self) -> Tuple[int, int]:
         """
-        Прибавляем cell_width - 1 и cell_height - 1
-        для деления с округленим вверх        
+        На сколько клеток картинки клеток могут вылезать за свою клетку: эти соседние клетки тоже рисуются на
+        кусок. Даже картинка размером с клетку из-за округления центра может залезть на соседнюю клетку на
+        пиксель, поэтому запас считается от половины картинки.
         """
-        arr_width = int((grid.width + cell_width - 1) / cell_width)
-        arr_height = int((grid.height + cell_height - 1) / cell_height)
+        margin_i, margin_j = 0, 0
+        for image_name in self.__grid._get_tile_palette():
+            handle = ImageManager.get_handle(image_name)
+            margin_j = max(margin_j, ceil(handle.width / 2 / self.__grid.cell_width))
+            margin_i = max(margin_i, ceil(handle.height / 2 / self.__grid.cell_height))
+        return margin_i, margin_j
 
-        super().__init__(grid.scene, grid.controller, grid.pos)
-        self._fill_arr(0, cell_width, cell_height, arr_width, arr_height)
+    def split_on_frames(self):
+        """
+        Разбиение grid на куски размером в половину экрана. В arr хранятся центры кусков, сами куски
+        рисуются в process_draw. Старые куски удаляются.
+
+        Прибавляем cell_width - 1 и cell_height - 1 для деления с округленим вверх.
+        """
+        self.__screen_size = (self.scene.width, self.scene.height)
+        cell_width = int(self.scene.width / 2)
+        cell_height = int(self.scene.height / 2)
+        arr_width = int((self.__grid.width + cell_width - 1) / cell_width)
+        arr_height = int((self.__grid.height + cell_height - 1) / cell_height)
 
-        full_grid_surface = self.pre_render_all(grid)
-        self.split_on_frames(full_grid_surface)
+        self._fill_arr(None, cell_width, cell_height, arr_width, arr_height)
+        for i in range(arr_height):
+            for j in range(arr_width):
+                self.arr[i][j] = self.get_center_of_cell_by_indexes(i, j) + self.pos
+        self.chunks.clear()
+        self.__update_storage_key()
 
-    def pre_render_all(self, grid: Grid) -> Surface:
+    def __update_storage_key(self):
+        """
+        Ключ кусков на диске по текущим клеткам grid, картинкам и размеру куска.
+        """
+        if self.storage is None:
+            return
+        palette_surfaces = []
+        for image_name in self.__grid._get_tile_palette():
+            surface = ImageManager.get_handle(image_name).surface
+            surface = ImageManager.source_images.get(image_name, (surface,))[0]
+            palette_surfaces.append((image_name, surface))
+        self.storage.set_key(StaticLayerStorage.get_key(self.__grid.arr, palette_surfaces,
+                                                        (self.cell_width, self.cell_height)))
+
+    def render_chunk(self, i: int, j: int) -> Surface:
+        """
+        Рисует кусок (i, j): все клетки grid, картинки которых на него попадают, в том же порядке, что и
+        при отрисовке всего grid на одну surface.
         """
-        Отрисовывает всё на 1 surface
+        grid = self.__grid
+        left = j * self.cell_width
+        top = i * self.cell_height
+        margin_i, margin_j = self.__tile_margin
+        i_min = max(top // grid.cell_height - margin_i, 0)
+        i_max = min((top + self.cell_height - 1) // grid.cell_height + margin_i + 1, len(grid.arr))
+        j_min = max(left // grid.cell_width - margin_j, 0)
+        j_max = min((left + self.cell_width - 1) // grid.cell_width + margin_j + 1, len(grid.arr[0]))
 
-        Чтобы не было проблем в расчетах, прибавляет
-        cell_width и cell_height к размеру всего поля
         """
-        self.surface_width = grid.width + self.cell_width
-        self.surface_height = grid.height + self.cell_height
-        res = Surface((self.surface_width, self.surface_height))
-        for i in range(len(grid.arr)):
-            for j in range(len(grid.arr[i])):
-                sprite = grid.arr[i][j]
-                ImageManager.process_draw(sprite.image_name, sprite.pos - self.pos,
-                                          res, sprite.zoom, sprite.angle)
+        Клетки рисуются на surface, выровненную по клеткам, чтобы их координаты были неотрицательными и
+        округлялись так же, как при отрисовке всего grid. Справа и снизу у нее запас на случай, если картинки
+        крайних клеток grid вылезают за grid. Потом из нее вырезается кусок.
+        """
+        cells_left = j_min * grid.cell_width
+        cells_top = i_min * grid.cell_height
+        cells = Surface(((j_max - j_min + margin_j) * grid.cell_width, (i_max - i_min + margin_i) * grid.cell_height))
+        offset = Point(cells_left, cells_top)
+        for cell_i in range(i_min, i_max):
+            for cell_j in range(j_min, j_max):
+                ImageManager.process_draw(grid.get_tile_image_name(cell_i, cell_j),
+                                          grid.get_center_of_cell_by_indexes(cell_i, cell_j) - offset, cells, 1, 0)
+
+        res = Surface((self.cell_width, self.cell_height))
+        res.blit(cells, (cells_left - left, cells_top - top))
         return res
 
-    def split_on_frames(self, surface: Surface):
+    def get_chunk(self, i: int, j: int) -> Surface:
+        """
+        Кусок (i, j) из кэша; если его там нет, он загружается с диска или рисуется.
+        """
+        surface = self.chunks.get((i, j))
+        if surface is None:
+            if self.storage is not None:
+                surface = self.storage.load(i, j, (self.cell_width, self.cell_height))
+            if surface is None:
+                surface = self.render_chunk(i, j)
+            self.chunks.put((i, j), surface)
+        return surface
+
+    def save_chunks(self):
+        """
+        Запись на диск кусков из памяти, которых там еще нет.
+        """
+        if self.storage is None:
+            return
+        for (i, j), surface in self.chunks.items():
+            if not self.storage.is_saved(i, j):
+                self.storage.save(i, j, surface)
+
+    def invalidate_cell(self, i: int, j: int):
         """
-        бьет полученную surface на квадраты, чтобы отрисовывать только то,
-        что на экране
+        Клетка grid (i, j) поменялась: куски, на которые попадает ее картинка, будут нарисованы заново.
+        Ключ кусков на диске меняется вместе с клетками, поэтому старые куски на диске удаляются.
         """
-        frame_rect = Rect(0, 0, self.cell_width, self.cell_height)
-        pos_offset = Point((self.cell_width) / 2, (self.cell_height) / 2)
+        margin_i, margin_j = self.__tile_margin
+        cell_width, cell_height = self.__grid.cell_width, self.__grid.cell_height
+        for chunk_i in range(max(i - margin_i, 0) * cell_height // self.cell_height,
+                             (i + margin_i + 1) * cell_height // self.cell_height + 1):
+            for chunk_j in range(max(j - margin_j, 0) * cell_width // self.cell_width,
+                                 (j + margin_j + 1) * cell_width // self.cell_width + 1):
+                self.chunks.pop((chunk_i, chunk_j))
+        self.__update_storage_key()
+
+    def prepare_visible(self):
         """
-        учитываем смещение прямоугольников
+        Заранее рисует или загружает с диска куски, которые сейчас на экране, например, при загрузке уровня.
         """
-        for i in range(len(self.arr)):
-            for j in range(len(self.arr[i])):
-                """
-                не нужно делать проверку на выход за пределы, 
-                так как мы прибавили cell_width и cell_height
-                к размеру всего поля
-                """
-                frame_rect.x = j * self.cell_width
-                frame_rect.y = i * self.cell_height
+        if self.__screen_size != (self.scene.width, self.scene.height):
+            self.split_on_frames()
+
+        index_i, index_j = self.index_manager.get_index_of_objects_on_screen(self.scene.relative_center)
+        for i in range(index_i['min'], index_i['max']):
+            for j in range(index_j['min'], index_j['max']):
+                self.get_chunk(i, j)
+
+    def process_draw(self):
+        """
+        Отрисовывает куски на экране и заранее рисует не больше PRELOADS_PER_FRAME кусков рядом с ним.
+        """
+        if self.__screen_size != (self.scene.width, self.scene.height):
+            self.split_on_frames()
+
+        relative_center = self.scene.relative_center
+        index_i, index_j = self.index_manager.get_index_of_objects_on_screen(relative_center)
+        for i in range(index_i['min'], index_i['max']):
+            for j in range(index_j['min'], index_j['max']):
+                ImageManager.draw_surface(self.get_chunk(i, j), self.arr[i][j] - relative_center, self.scene.screen)
 
-                self.arr[i][j] = SurfaceObject(surface.subsurface(frame_rect),
-                                               self.scene, self.controller,
-                                               self.pos + Point(frame_rect.x, frame_rect.y) + pos_offset)
+        preloads = self.PRELOADS_PER_FRAME
+        for i in range(max(index_i['min'] - self.PRELOAD_MARGIN, 0),
+                       min(index_i['max'] + self.PRELOAD_MARGIN, len(self.arr))):
+            for j in range(max(index_j['min'] - self.PRELOAD_MARGIN, 0),
+                           min(index_j['max'] + self.PRELOAD_MARGIN, len(self.arr[0]))):
+                if not preloads:
+                    return
+                if (i, j) not in self.chunks:
+                    self.get_chunk(i, j)
+                    preloads -= 1
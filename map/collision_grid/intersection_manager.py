@@ -1,26 +1,215 @@
 from collections import deque
+from math import inf, sqrt
+from typing import List, Optional
+
+import numpy as np
 
 from constants.directions import side_di, side_dj
+from constants.math import EPS
 from geometry.intersections import intersect_seg_rect
 from geometry.point import Point
 from geometry.segment import Segment
 from utils.is_marked_manager import TwoDimensionalIsMarkedManager
 
 
+def is_near_grid_line(value: float, cell_size: float, eps: float) -> bool:
+    """
+    Лежит ли координата ближе eps к одной из линий сетки.
+    """
+    remainder = value % cell_size
+    return remainder < eps or cell_size - remainder < eps
+
+
 class GridIntersectionManager:
     """
-    Работает медленно, но не понятно как ускорить.
+    Пересечение отрезков со стенами сетки.
+
+    Основной способ - проход по клеткам вдоль отрезка (DDA, алгоритм Amanatides-Woo): клетки перебираются в том
+    порядке, в котором их пересекает отрезок, и только они. Если отрезок проходит по линии сетки или через угол
+    клетки, DDA пришлось бы выбирать одну из касающихся клеток, поэтому такие отрезки обрабатываются bfs'ом.
     """
+    # с какого количества отрезков пакетный запрос считается numpy'ем: на меньших его накладные расходы не окупаются
+    VECTORIZED_MIN_COUNT = 100
 
     def __init__(self, grid):
         self.grid = grid
         self.used_manager = TwoDimensionalIsMarkedManager(grid.arr)
 
     def intersect_seg_walls(self, seg: Segment) -> Point:
+        """
+        Идет по клеткам, которые пересекает seg, начиная с клетки seg.p1.
+        если одна из них wall, то вернет точку входа отрезка в нее, иначе None
+
+        O(количество пересеченных клеток) времени
+        """
+        grid = self.grid
+        cell_width = grid.cell_width
+        cell_height = grid.cell_height
+
+        x1 = seg.p1.x - grid.pos.x
+        y1 = seg.p1.y - grid.pos.y
+        dx = seg.p2.x - seg.p1.x
+        dy = seg.p2.y - seg.p1.y
+        seg_length = sqrt(dx * dx + dy * dy)
+
+        """
+        bfs считает, что отрезок задевает клетку, даже если проходит от нее на расстоянии порядка EPS / длина,
+        поэтому все близкие к линиям сетки случаи отдаются ему.
+        """
+        eps = EPS * max(1, 1 / seg_length) if seg_length else EPS
+        if not seg_length or \
+                is_near_grid_line(x1, cell_width, eps) or is_near_grid_line(y1, cell_height, eps) or \
+                is_near_grid_line(x1 + dx, cell_width, eps) or is_near_grid_line(y1 + dy, cell_height, eps):
+            return self.intersect_seg_walls_bfs(seg)
+
+        i = int(y1 / cell_height)
+        j = int(x1 / cell_width)
+
+        """
+        t - параметр точки на отрезке (p1 + (p2 - p1) * t). t_max - параметр ближайшего пересечения с
+        вертикальной (x) и горизонтальной (y) линиями сетки, t_delta - шаг параметра между соседними линиями.
+        """
+        if dx > 0:
+            step_j = 1
+            t_max_x = ((j + 1) * cell_width - x1) / dx
+            t_delta_x = cell_width / dx
+        elif dx < 0:
+            step_j = -1
+            t_max_x = (j * cell_width - x1) / dx
+            t_delta_x = -cell_width / dx
+        else:
+            step_j = 0
+            t_max_x = inf
+            t_delta_x = inf
+
+        if dy > 0:
+            step_i = 1
+            t_max_y = ((i + 1) * cell_height - y1) / dy
+            t_delta_y = cell_height / dy
+        elif dy < 0:
+            step_i = -1
+            t_max_y = (i * cell_height - y1) / dy
+            t_delta_y = -cell_height / dy
+        else:
+            step_i = 0
+            t_max_y = inf
+            t_delta_y = inf
+
+        # расстояние от угла клетки до отрезка равно |t_max_x - t_max_y| * corner_k
+        corner_k = abs(dx * dy) / seg_length
+        # первое же пересечение с линиями сетки может быть углом клетки
+        if abs(t_max_x - t_max_y) * corner_k < eps and min(t_max_x, t_max_y) <= 1:
+            return self.intersect_seg_walls_bfs(seg)
+
+        passability = grid.passability
+        height_arr = len(grid.arr)
+        width_arr = len(grid.arr[0])
+        while True:
+            if t_max_x < t_max_y:
+                t = t_max_x
+                j += step_j
+                t_max_x += t_delta_x
+            else:
+                t = t_max_y
+                i += step_i
+                t_max_y += t_delta_y
+
+            if t > 1:
+                return None
+            if abs(t_max_x - t_max_y) * corner_k < eps and min(t_max_x, t_max_y) <= 1:
+                return self.intersect_seg_walls_bfs(seg)
+            if i < 0 or j < 0 or i >= height_arr or j >= width_arr:
+                return None
+
+            if not passability[i * width_arr + j]:
+                return Point(seg.p1.x + dx * t, seg.p1.y + dy * t)
+
+    def intersect_segments_walls(self, starts: np.ndarray, ends: np.ndarray) -> List[Optional[Point]]:
+        """
+        То же, что intersect_seg_walls, но сразу для многих отрезков: DDA делается numpy'ем по grid.passability_map
+        для всех отрезков вместе. Отрезки, которые intersect_seg_walls отдал бы bfs'у, обрабатываются bfs'ом по
+        одному, маленькие пакеты - intersect_seg_walls.
+
+        :param starts: массив (n, 2) начал отрезков
+        :param ends: массив (n, 2) концов отрезков
+        :return: для каждого отрезка точка входа в первую стену или None
+        """
+        count = len(starts)
+        if count < self.VECTORIZED_MIN_COUNT:
+            return [self.intersect_seg_walls(Segment(Point(*start), Point(*end)))
+                    for start, end in zip(starts.tolist(), ends.tolist())]
+        grid = self.grid
+        cell_size = np.array([grid.cell_width, grid.cell_height], dtype=float)
+
+        p1 = starts - np.array([grid.pos.x, grid.pos.y])
+        d = ends - starts
+        seg_length = np.hypot(d[:, 0], d[:, 1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            eps = EPS * np.maximum(1, 1 / seg_length)
+
+            remainders = np.concatenate((p1 % cell_size, (p1 + d) % cell_size), axis=1)
+            cell_sizes = np.concatenate((cell_size, cell_size))
+            is_degenerate = (seg_length == 0) | \
+                np.any((remainders < eps[:, None]) | (cell_sizes - remainders < eps[:, None]), axis=1)
+
+            # индексы (j, i) стартовых клеток и пересечения с линиями сетки по каждой оси
+            start_cells = np.trunc(p1 / cell_size).astype(int)
+            steps = np.sign(d).astype(int)
+            lines_count = int(np.max(np.abs(d) / cell_size)) + 2
+            k = np.arange(lines_count)
+            first_lines = start_cells + (steps > 0)
+            lines = first_lines[:, :, None] + steps[:, :, None] * k
+            t = (lines * cell_size[None, :, None] - p1[:, :, None]) / d[:, :, None]
+            t[(steps == 0)[:, :, None] | (t > 1)] = inf
+
+            # все пересечения отрезка в порядке удаления от начала; axis - 0 для вертикальных линий, 1 для горизонтальных
+            t = t.reshape(count, 2 * lines_count)
+            axis = np.repeat([0, 1], lines_count)
+            order = np.argsort(t, axis=1, kind='stable')
+            t = np.take_along_axis(t, order, axis=1)
+            axis = axis[order]
+            is_crossing = t <= 1
+
+            # угол клетки рядом с отрезком: соседние пересечения с линиями разных осей почти совпадают
+            corner_k = np.abs(d[:, 0] * d[:, 1]) / seg_length
+            near_corner = (np.diff(t, axis=1) * corner_k[:, None] < eps[:, None]) & \
+                (axis[:, 1:] != axis[:, :-1]) & is_crossing[:, :-1]
+            is_degenerate |= np.any(near_corner, axis=1)
+
+        j = start_cells[:, 0, None] + steps[:, 0, None] * np.cumsum(axis == 0, axis=1)
+        i = start_cells[:, 1, None] + steps[:, 1, None] * np.cumsum(axis == 1, axis=1)
+        passability_map = grid.passability_map
+        height_arr, width_arr = passability_map.shape
+        is_outside = (i < 0) | (j < 0) | (i >= height_arr) | (j >= width_arr)
+        is_wall = passability_map[np.clip(i, 0, height_arr - 1), np.clip(j, 0, width_arr - 1)] == 0
+        is_stop = is_crossing & (is_outside | is_wall)
+
+        first_stop = np.argmax(is_stop, axis=1)
+        rows = np.arange(count)
+        is_hit = is_stop[rows, first_stop] & ~is_outside[rows, first_stop]
+        hit_t = np.where(is_hit, t[rows, first_stop], 0)
+        hit_points = (starts + d * hit_t[:, None]).tolist()
+        is_hit = is_hit.tolist()
+        is_degenerate = is_degenerate.tolist()
+
+        result = []
+        for index in range(count):
+            if is_degenerate[index]:
+                seg = Segment(Point(*starts[index].tolist()), Point(*ends[index].tolist()))
+                result.append(self.intersect_seg_walls_bfs(seg))
+            elif is_hit[index]:
+                result.append(Point(*hit_points[index]))
+            else:
+                result.append(None)
+        return result
+
+    def intersect_seg_walls_bfs(self, seg: Segment) -> Point:
         """
         bfs'ом идет по клеткам, которые пересекает seg.
         если одна из них wall, то вернет точку пересечения с одной из стен,
         ближайшую к seg.p1, иначе None
+
+        Работает медленно, нужен для отрезков, проходящих по линиям сетки.
         """
         self.used_manager.next_iteration()
         i0, j0 = self.grid.index_manager.get_index_by_pos(seg.p1)
@@ -0,0 +1,88 @@
+import hashlib
+import zlib
+
+from typing import Optional, Tuple
+
+import pygame
+
+from utils.game_data_manager import GameDataManager
+
+
+class StaticLayerStorage:
+    """
+    Готовые куски статической графики сетки (GridDrawStaticManager) на диске: в папке хранилища космоса рядом с
+    сохранением сцены. Кусок хранится как сжатые zlib пиксели RGB, загрузить его в несколько раз быстрее, чем
+    нарисовать заново.
+
+    Имя файла куска начинается с ключа (get_key): хэша клеток сетки, ее картинок (названий и пикселей) и
+    размера куска. Если поменялись клетки, биом или сами картинки, ключ другой, и файлы со старым ключом
+    удаляются при установке нового.
+
+    :param file_manager: менеджер файлов игры, в нем должен быть выбран космос
+    :param name: имя папки с кусками (обычно по имени файла сцены)
+    """
+    DIR_SUFFIX = '_static_layer'
+
+    def __init__(self, file_manager: GameDataManager, name: str):
+        self.__file_manager = file_manager
+        self.__dir_name = name + self.DIR_SUFFIX
+        self.__key = None
+        self.__saved = set()
+
+    @staticmethod
+    def get_key(arr, palette_surfaces, chunk_size: Tuple[int, int]) -> str:
+        """
+        :param arr: клетки сетки (строки-bytearray'и номеров картинок)
+        :param palette_surfaces: [(название картинки, картинка)] для всех номеров палитры
+        :param chunk_size: размер куска в пикселях
+        """
+        key = hashlib.md5()
+        key.update(b''.join(arr))
+        for name, surface in palette_surfaces:
+            key.update(name.encode())
+            key.update(str(surface.get_size()).encode())
+            key.update(pygame.image.tostring(surface, 'RGBA'))
+        key.update(str(chunk_size).encode())
+        return key.hexdigest()
+
+    def set_key(self, key: str):
+        """
+        Установка ключа. Файлы с другим ключом удаляются.
+        """
+        self.__key = key
+        self.__saved.clear()
+        for file_name in self.__file_manager.get_file_names(self.__dir_name):
+            if file_name.startswith(key + '_'):
+                self.__saved.add(file_name)
+            else:
+                self.__file_manager.delete_file(self.__dir_name, file_name)
+
+    def __get_file_name(self, i: int, j: int) -> str:
+        return '{}_{}_{}'.format(self.__key, i, j)
+
+    def is_saved(self, i: int, j: int) -> bool:
+        return self.__get_file_name(i, j) in self.__saved
+
+    def load(self, i: int, j: int, size: Tuple[int, int]) -> Optional[pygame.Surface]:
+        """
+        :return: кусок (i, j) или None, если его нет на диске
+        """
+        file_name = self.__get_file_name(i, j)
+        if file_name not in self.__saved:
+            return None
+        data = zlib.decompress(self.__file_manager.read_bytes(self.__dir_name, file_name))
+        surface = pygame.image.fromstring(data, size, 'RGB')
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def save(self, i: int, j: int, surface: pygame.Surface):
+        file_name = self.__get_file_name(i, j)
+        data = zlib.compress(pygame.image.tostring(surface, 'RGB'), 1)
+        self.__file_manager.write_bytes(self.__dir_name, file_name, data)
+        self.__saved.add(file_name)
+
+    def delete(self, i: int, j: int):
+        file_name = self.__get_file_name(i, j)
+        self.__file_manager.delete_file(self.__dir_name, file_name)
+        self.__saved.discard(file_name)
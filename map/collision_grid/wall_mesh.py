@@ -0,0 +1,97 @@
+from typing import List, Tuple
+
+from geometry.optimized.rectangle import StaticRectangle
+
+WALL = 0
+COVERED = 1
+
+
+def mesh_walls(passability: bytearray, width: int,
+               top: int, left: int, bottom: int, right: int) -> List[Tuple[int, int, int, int]]:
+    """
+    Жадное покрытие стен области прямоугольниками: первая непокрытая стена при обходе по строкам расширяется
+    вправо, пока идут непокрытые стены, потом вниз, пока вся строка под ней - непокрытые стены. Так каждая
+    прямая стена - один прямоугольник, а вся сетка покрывается почти минимальным числом прямоугольников.
+
+    Поиск стен и проверка строк - поиск байта в bytearray, поэтому по клеткам пола цикл на python не идет.
+
+    :param passability: проходимость сетки (CollisionGrid.passability: 1 - пол, 0 - стена)
+    :param width: ширина сетки в клетках
+    :param top: первая строка области
+    :param left: первый столбец области
+    :param bottom: последняя строка области (включительно)
+    :param right: последний столбец области (включительно)
+    :return: прямоугольники (top, left, bottom, right) в индексах клеток, края включительно
+    """
+    # покрытые стены отмечаются как пол
+    blocked = bytearray()
+    for i in range(top, bottom + 1):
+        blocked += passability[i * width + left:i * width + right + 1]
+    region_width = right - left + 1
+    region_height = bottom - top + 1
+
+    result = []
+    for i in range(region_height):
+        row_end = (i + 1) * region_width
+        start = blocked.find(WALL, i * region_width, row_end)
+        while start != -1:
+            end = blocked.find(COVERED, start, row_end)
+            if end == -1:
+                end = row_end
+            run_width = end - start
+            i2 = i
+            while i2 + 1 < region_height and blocked.find(COVERED, start + (i2 + 1 - i) * region_width,
+                                                          end + (i2 + 1 - i) * region_width) == -1:
+                i2 += 1
+            for k in range(i, i2 + 1):
+                offset = (k - i) * region_width
+                blocked[start + offset:end + offset] = bytes([COVERED]) * run_width
+            j = start - i * region_width
+            result.append((top + i, left + j, top + i2, left + j + run_width - 1))
+            start = blocked.find(WALL, end, row_end)
+    return result
+
+
+class GridWallMesh:
+    """
+    Стены сетки, покрытые прямоугольниками (mesh_walls), и для каждой клетки-стены - номер прямоугольника,
+    в котором она лежит. Строится по passability сетки; при изменении клеток строится заново (CollisionGrid
+    делает это лениво).
+
+    :param grid: сетка
+    """
+
+    def __init__(self, grid):
+        height, width = len(grid.arr), len(grid.arr[0])
+        self.__width = width
+        self.__height = height
+        self.rectangles = mesh_walls(grid.passability, width, 0, 0, height - 1, width - 1)
+        self.collision_rects = [get_collision_rectangle(grid, rectangle) for rectangle in self.rectangles]
+        self.__rect_ids = [-1] * (width * height)
+        for rect_id, (top, left, bottom, right) in enumerate(self.rectangles):
+            for i in range(top, bottom + 1):
+                self.__rect_ids[i * width + left:i * width + right + 1] = [rect_id] * (right - left + 1)
+
+    def get_rects_nearby(self, center_i: int, center_j: int, offset: int) -> List[StaticRectangle]:
+        """
+        Прямоугольники стен, задевающие квадрат клеток со стороной 1 + offset * 2 с центром в (center_i, center_j).
+        """
+        width = self.__width
+        rect_ids = self.__rect_ids
+        found = []
+        for i in range(max(0, center_i - offset), min(self.__height, center_i + offset + 1)):
+            row = rect_ids[i * width + max(0, center_j - offset):i * width + min(width, center_j + offset + 1)]
+            for rect_id in row:
+                if rect_id != -1 and rect_id not in found:
+                    found.append(rect_id)
+        return [self.collision_rects[rect_id] for rect_id in found]
+
+
+def get_collision_rectangle(grid, rectangle: Tuple[int, int, int, int]) -> StaticRectangle:
+    """
+    Прямоугольник коллизий по прямоугольнику в индексах клеток.
+    """
+    top, left, bottom, right = rectangle
+    left_top = grid.get_collision_rect(top, left)
+    right_bottom = grid.get_collision_rect(bottom, right)
+    return StaticRectangle(left_top.left, left_top.top, right_bottom.right, right_bottom.bottom)
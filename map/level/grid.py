@@ -1,11 +1,13 @@
-from typing import Dict
+from typing import Dict, List, Optional
+import numpy as np
 from drawable_objects.enemy import Enemy
 from enemy_interaction_with_grid.manager import GridInteractionWithEnemyManager
+from enemy_interaction_with_grid.vision.room.visibility import VisibilityTable
 from geometry.point import Point
 from map.collision_grid.collision_grid import CollisionGrid
-from map.level.map_generator import LevelGenerator
+from map.level.numpy_generator import NumpyLevelGenerator
 from map.level.objects_generator import LevelObjectsGenerator
-from map.level.rect.splitter import GridRectangle
+from map.level.rect.splitter import GridRectangle, SplitNode
 from utils.game_data_manager import to_2dimensional_list_of_dicts, from_2dimensional_list_of_dicts
 from utils.list import copy_2dimensional_list
 from constants.grid import CELL_SIZE
@@ -17,14 +19,14 @@ from map.level.settings import level_settings
 class LevelGrid(CollisionGrid):
     """
     Сетка уровня (данжа).
+
+    Карту генерирует LEVEL_GENERATOR: NumpyLevelGenerator, или LevelGenerator (клетка за клеткой, результат
+    тот же, но намного медленнее на больших картах).
     """
+    LEVEL_GENERATOR = NumpyLevelGenerator
 
     def to_dict(self):
-        arr = []
-        for i in range(len(self.arr)):
-            arr.append([])
-            for item in self.arr[i]:
-                arr[i].append(self.__get_filename_index(item.image_name))
+        arr = [list(row) for row in self.arr]
 
         arr_after_split = self.__arr_after_split
         room_rectangles = [item.to_dict() for item in self.__room_rectangles]
@@ -34,6 +36,7 @@ class LevelGrid(CollisionGrid):
             'arr': arr,
             'arr_after_split': arr_after_split,
             'room_rectangles': room_rectangles,
+            'rooms_visibility_pairs': self.enemy_interaction_manager.get_rooms_visibility_table(),
             'classname': self.__class__.__name__
         }
 
@@ -49,7 +52,7 @@ class LevelGrid(CollisionGrid):
 
         self.arr = data_dict['arr']
         self._arr_initialize(CELL_SIZE, CELL_SIZE)
-        self.transform_ints_to_objects()
+        self.transform_ints_to_tiles()
 
         self.__arr_after_split = data_dict['arr_after_split']
 
@@ -58,27 +61,31 @@ class LevelGrid(CollisionGrid):
             res = GridRectangle((0, 0), (0, 0))
             res.from_dict(item)
             self.__room_rectangles.append(res)
+        # дерево разбиения не сохраняется: его листья - комнаты, по ним оно и восстанавливается
+        self.__room_tree = SplitNode.from_rectangles(self.__room_rectangles)
 
         self._other_initialize()
-        self._create_interaction_with_enemy_manager()
+        # в старых сохранениях пар видимости комнат нет (или там полная таблица rooms_visibility), тогда они
+        # считаются заново
+        self._create_interaction_with_enemy_manager(data_dict.get('rooms_visibility_pairs'))
 
-    def _get_filename(self, filename_index: int) -> str:
-        filenames = level_settings[self.biom].level_filenames
-        return filenames[filename_index]
-
-    def __get_filename_index(self, filename_str: str) -> int:
-        filenames = level_settings[self.biom].level_filenames
-        return filenames.index(filename_str)
+    def _get_tile_palette(self) -> List[str]:
+        """
+        Палитра биома, одна на все уровни с ним.
+        """
+        return level_settings[self.biom].level_filenames
 
-    def _create_interaction_with_enemy_manager(self):
+    def _create_interaction_with_enemy_manager(self, rooms_visibility_table: Optional[VisibilityTable] = None):
         """
         Необходимо вызывать до enemy_generation.
 
         InteractionWithEnemyManager использует информацию из LevelGenerator
         (Он создает прямоугольники коллизий на основе комнат)
+
+        :param rooms_visibility_table: таблица видимости комнат из сохранения; None - посчитать
         """
         self.enemy_interaction_manager = GridInteractionWithEnemyManager(
-            self.__room_rectangles, self.__arr_after_split, self)
+            self.__room_rectangles, self.__room_tree, self.__arr_after_split, self, rooms_visibility_table)
 
     def enemy_generation(self):
         """
@@ -86,7 +93,7 @@ class LevelGrid(CollisionGrid):
         """
         self._create_interaction_with_enemy_manager()
 
-        enemy_generator = LevelObjectsGenerator(self, self.__room_rectangles,
+        enemy_generator = LevelObjectsGenerator(self, self.__generator, self.__room_rectangles,
                         level_settings[self.biom].enemy_weapons,
                         level_settings[self.biom].chest_weapon_drop,
                         level_settings[self.biom].CHEST_OTHER_DROP,
@@ -97,19 +104,31 @@ class LevelGrid(CollisionGrid):
 
         """
         self.__arr_after_split, self.__room_rectangles нельзя удалять, т.к. их нужно хранить для
-        удобного сохранения данных
+        удобного сохранения данных. self.__room_tree (дерево разбиения на комнаты) нужно зрению enemy
+        для поиска комнат по клеткам
         """
 
     def map_construction(self, min_area: int = 100, min_w: int = 8, min_h: int = 8):
         """
-        Генерация уровня с помощью LevelGenerator
+        Генерация уровня с помощью LEVEL_GENERATOR. Генератор случайных чисел зависит от seed космоса и имени
+        сцены, он же потом используется в enemy_generation.
         """
-        generator = LevelGenerator(self.arr, min_area, min_w, min_h)
+        self.__generator = self.scene.game.random_manager.get_generator(self.scene.data_filename)
+        generator = self.LEVEL_GENERATOR(self.arr, self.__generator, min_area, min_w, min_h)
         generator.generate()
 
         self.__room_rectangles = generator.rect_splitter.rectangles
+        self.__room_tree = generator.rect_splitter.tree
         self.__arr_after_split = generator.arr_after_split
 
+    def set_cell(self, i: int, j: int, filename_index: int):
+        """
+        Кроме графики и проходимости обновляются поиск пути и зрение enemy.
+        """
+        super().set_cell(i, j, filename_index)
+        if hasattr(self, 'enemy_interaction_manager'):
+            self.enemy_interaction_manager.update_cell(i, j)
+
     def process_logic(self):
         """
         логика связана с взаимодействием grid'а и Enemy
@@ -126,6 +145,21 @@ class LevelGrid(CollisionGrid):
         """
         return self.enemy_interaction_manager.is_enemy_see_player(enemy, radius)
 
+    def is_enemy_see_player_in_sector(self, enemy: Enemy) -> bool:
+        """
+        Видит ли enemy player'а, если player в его секторе обзора: не закрывают ли его стены
+        """
+        return self.enemy_interaction_manager.is_enemy_see_player_in_sector(enemy)
+
+    def get_vision_candidates(self, enemies: List[Enemy], radius: float) -> np.ndarray:
+        """
+        У каких enemies player в секторе обзора радиуса radius: один проход NumPy для всех врагов. Только этим
+        врагам нужна проверка стен.
+
+        :return: массив bool по enemies
+        """
+        return self.enemy_interaction_manager.get_vision_candidates(enemies, radius)
+
     def save_enemy_pos(self, pos: Point):
         """
         Отмечает, что на этой позиции есть enemy. Нужно для path finding'а.
@@ -1,4 +1,5 @@
 from typing import List
+from random import Random
 
 from map.level.rect.connecter import RectConnecter
 from map.level.rect.graph.manager import RectGraphManager
@@ -14,13 +15,22 @@ class LevelGenerator:
 
     Результат генерации - заполнение исходного прямоугольника фигурами
     с углами 270 и 90 градусов.
+
+    Все случайные решения берутся из generator, так что при одинаково засеянном генераторе результат один и тот же.
+
+    Этапы делают классы SPLITTER, GRAPH_MANAGER и UNIONER (и RectConnecter), наследники могут их подменить
+    (см. NumpyLevelGenerator).
     """
+    SPLITTER = RectSplitter
+    GRAPH_MANAGER = RectGraphManager
+    UNIONER = RectUnioner
 
-    def __init__(self, arr: List[List[int]],
+    def __init__(self, arr: List[List[int]], generator: Random,
                  min_area: int = 100, min_w: int = 8, min_h: int = 8):
         self.arr = arr
+        self.generator = generator
 
-        self.rect_splitter = RectSplitter(self.arr, min_area, min_w, min_h)
+        self.rect_splitter = self.SPLITTER(self.arr, generator, min_area, min_w, min_h)
 
     def generate(self):
         """
@@ -47,14 +57,14 @@ class LevelGenerator:
         # Необходимо сохранить список для дальнейших нужд:
         self.arr_after_split = self.rect_splitter.get_arr_after_split()
 
-        self.graph_manager = RectGraphManager(
+        self.graph_manager = self.GRAPH_MANAGER(
             self.rect_splitter.arr, self.rect_splitter.rects_colors_count)
 
     def __union(self):
         """
         Объединить некоторые прямоугольники
         """
-        self.rect_unioner = RectUnioner(self.graph_manager)
+        self.rect_unioner = self.UNIONER(self.graph_manager, self.generator)
         self.rect_unioner.start_random_union()
         self.rect_unioner.delete_edges()
 
@@ -62,5 +72,5 @@ class LevelGenerator:
         """
         Добавить проходы
         """
-        self.rect_connecter = RectConnecter(self.graph_manager)
+        self.rect_connecter = RectConnecter(self.graph_manager, self.generator)
         self.rect_connecter.start_random_connection()
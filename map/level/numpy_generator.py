@@ -0,0 +1,193 @@
+import heapq
+
+from random import Random
+from typing import List, Tuple
+
+import numpy as np
+
+from map.level.map_generator import LevelGenerator
+from map.level.rect.graph.edge import Edge
+from map.level.rect.graph.manager import RectGraphManager
+from map.level.rect.splitter import RectSplitter
+from map.level.rect.unioner import RectUnioner
+
+NEIGHBOURS = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+PROCESSED_NEIGHBOURS = [(-1, -1), (-1, 0), (-1, 1), (0, -1)]  # соседи клетки, обходимые раньше нее
+LATER_NEIGHBOURS = [(0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+class NumpyRectSplitter(RectSplitter):
+    """
+    RectSplitter над numpy-массивом: прямоугольник красится одним присваиванием среза.
+    """
+
+    def _fill_cells(self, pos0: List[int], pos1: List[int], color: int):
+        self.arr[pos0[0] + 1:pos1[0], pos0[1] + 1:pos1[1]] = color
+
+    def get_arr_after_split(self) -> List[List[int]]:
+        return self.arr.tolist()
+
+
+class NumpyRectGraphManager(RectGraphManager):
+    """
+    RectGraphManager над numpy-массивом. Все возможные ребра (стена, по обе стороны которой по три клетки двух
+    разных фигур) находятся сразу операциями над массивом и перебираются в том же порядке, что в
+    manage_all_edges: по клеткам построчно, из каждой сначала вверх, потом влево. Последовательно перебираются
+    только они, а не все клетки.
+    """
+
+    def __get_edge_candidates(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :return: индексы i, j стен-кандидатов и номера направлений k (0 - вверх, 1 - влево) в порядке обхода
+        """
+        arr = self.arr
+        interior_walls = arr[1:-1, 1:-1] == 0
+        candidates = np.zeros(interior_walls.shape + (2,), dtype=bool)
+        # вверх: связи (i - 1, j') - (i + 1, j') для j' = j - 1, j, j + 1
+        candidates[:, :, 0] = interior_walls & self.__get_edge_mask(arr[:-2, :], arr[2:, :])
+        # влево: связи (i', j - 1) - (i', j + 1) для i' = i - 1, i, i + 1
+        candidates[:, :, 1] = interior_walls & self.__get_edge_mask(arr[:, :-2].T, arr[:, 2:].T).T
+        i, j, k = np.nonzero(candidates)
+        return i + 1, j + 1, k
+
+    @staticmethod
+    def __get_edge_mask(side1: np.ndarray, side2: np.ndarray) -> np.ndarray:
+        """
+        Маска стен (без крайних столбцов), у которых три соседние связи side1[:, j'] - side2[:, j'] соединяют
+        две разные фигуры, и цвета по каждую сторону одинаковы.
+        """
+        connects = (side1 != 0) & (side2 != 0) & (side1 != side2)
+        return connects[:, :-2] & connects[:, 1:-1] & connects[:, 2:] & \
+            (side1[:, :-2] == side1[:, 1:-1]) & (side1[:, 2:] == side1[:, 1:-1]) & \
+            (side2[:, :-2] == side2[:, 1:-1]) & (side2[:, 2:] == side2[:, 1:-1])
+
+    def save_rect_graph(self, res: List[List[int]]):
+        for i in range(self.rects_count):
+            res.append([])
+        i, j, k = self.__get_edge_candidates()
+        if not len(i):
+            return
+        colors1 = np.where(k == 0, self.arr[i - 1, j], self.arr[i, j - 1])
+        colors2 = np.where(k == 0, self.arr[i + 1, j], self.arr[i, j + 1])
+        # ребро (color1, color2) добавляется при первой встрече
+        keys = colors1.astype(np.int64) * self.rects_count + colors2
+        first = np.sort(np.unique(keys, return_index=True)[1])
+        for color1, color2 in zip(colors1[first].tolist(), colors2[first].tolist()):
+            res[color1].append(color2)
+            res[color2].append(color1)
+
+    def save_edges_between_rects(self, res: List[Edge]):
+        """
+        Кандидаты, клетки связей которых уже заняты предыдущими ребрами, отбрасываются так же, как в
+        manage_all_edges.
+        """
+        i, j, k = self.__get_edge_candidates()
+        width = self.arr.shape[1]
+        self.used = bytearray(self.arr.size)
+        for wall_i, wall_j, direction in zip(i.tolist(), j.tolist(), k.tolist()):
+            if direction == 0:
+                cells = [((wall_i - 1, wall_j + shift), (wall_i + 1, wall_j + shift)) for shift in (0, -1, 1)]
+            else:
+                cells = [((wall_i + shift, wall_j - 1), (wall_i + shift, wall_j + 1)) for shift in (0, -1, 1)]
+            indexes = [cell_i * width + cell_j for connect in cells for cell_i, cell_j in connect]
+            if any(self.used[index] for index in indexes):
+                continue
+            for index in indexes:
+                self.used[index] = 1
+            (i1, j1), (i2, j2) = cells[0]
+            res.append(Edge({'i': i1, 'j': j1}, {'i': i2, 'j': j2}, [0, -1] if direction == 0 else [-1, 0],
+                            self.arr))
+
+
+class NumpyRectUnioner(RectUnioner):
+    """
+    RectUnioner над numpy-массивом. Объединение прямоугольников то же, удаление стен внутри фигур - операциями
+    над массивом.
+    """
+
+    def delete_edges(self):
+        """
+        То же, что RectUnioner.delete_edges. Там клетки обходятся построчно, и стена, убранная раньше, уже
+        считается полом для следующих клеток. Поэтому сначала все стены решаются по исходным соседям сразу,
+        а потом по порядку обхода перепроверяются только стены, у которых изменился сосед, обойденный раньше.
+        """
+        arr = self.arr
+        parents = np.array([self.dis_set.get_parent(color) for color in range(len(self.dis_set.parent))],
+                           dtype=arr.dtype)
+        arr[1:-1, 1:-1] = parents[arr[1:-1, 1:-1]]
+
+        height, width = arr.shape
+        original = arr.copy()
+        neighbours = np.stack([original[1 + di:height - 1 + di, 1 + dj:width - 1 + dj] for di, dj in NEIGHBOURS])
+        max_color = neighbours.max(axis=0)
+        min_color = np.where(neighbours != 0, neighbours, max_color).min(axis=0)
+        walls = original[1:-1, 1:-1] == 0
+        arr[1:-1, 1:-1] = np.where(walls & (min_color == max_color), max_color, original[1:-1, 1:-1])
+
+        # Убранная раньше стена меняет решение только для стены без соседей-пола или стены, все соседи
+        # которой другого цвета; у стены между разными фигурами новый сосед ничего не меняет.
+        uniform = min_color == max_color
+        changed = np.zeros(arr.shape, dtype=bool)
+        changed[1:-1, 1:-1] = walls & (max_color != 0) & uniform
+        to_check = np.zeros(arr.shape, dtype=bool)
+        for di, dj in PROCESSED_NEIGHBOURS:
+            neighbour_changed = changed[1 + di:height - 1 + di, 1 + dj:width - 1 + dj]
+            neighbour_color = arr[1 + di:height - 1 + di, 1 + dj:width - 1 + dj]
+            to_check[1:-1, 1:-1] |= neighbour_changed & ((max_color == 0) | (neighbour_color != max_color))
+        to_check[1:-1, 1:-1] &= walls & uniform
+        queue = np.flatnonzero(to_check).tolist()
+        heapq.heapify(queue)
+        last = -1
+        while queue:
+            index = heapq.heappop(queue)
+            if index == last:
+                continue
+            last = index
+            i, j = divmod(index, width)
+            color = self.__get_sequential_color(original, i, j)
+            if color == arr[i, j]:
+                continue
+            arr[i, j] = color
+            for di, dj in LATER_NEIGHBOURS:
+                if 0 < i + di < height - 1 and 0 < j + dj < width - 1 and not original[i + di, j + dj]:
+                    heapq.heappush(queue, (i + di) * width + j + dj)
+
+    def __get_sequential_color(self, original: np.ndarray, i: int, j: int) -> int:
+        """
+        Цвет стены (i, j) при построчном обходе: соседи, обойденные раньше, берутся из текущего массива,
+        остальные - из исходного.
+        """
+        cell_color = 0
+        for di, dj in NEIGHBOURS:
+            source = self.arr if (di, dj) in PROCESSED_NEIGHBOURS else original
+            color = source[i + di, j + dj]
+            if not color:
+                continue
+            if not cell_color:
+                cell_color = color
+            elif cell_color != color:
+                return 0
+        return cell_color
+
+
+class NumpyLevelGenerator(LevelGenerator):
+    """
+    LevelGenerator, который держит уровень в numpy-массиве и делает покраску, перекраску фигур, удаление
+    стен внутри фигур и поиск ребер операциями над массивом. Случайные числа берутся в том же порядке, поэтому
+    при том же генераторе результат совпадает с LevelGenerator клетка в клетку. В конце результат
+    записывается в исходный arr.
+    """
+    SPLITTER = NumpyRectSplitter
+    GRAPH_MANAGER = NumpyRectGraphManager
+    UNIONER = NumpyRectUnioner
+
+    def __init__(self, arr: List[List[int]], generator: Random,
+                 min_area: int = 100, min_w: int = 8, min_h: int = 8):
+        self.__target = arr
+        super().__init__(np.array(arr, dtype=np.int32), generator, min_area, min_w, min_h)
+
+    def generate(self):
+        super().generate()
+        for row, values in zip(self.__target, self.arr.tolist()):
+            row[:] = values
+        self.arr = self.__target
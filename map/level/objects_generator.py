@@ -1,5 +1,5 @@
 from typing import List, Tuple
-from random import random, randint
+from random import Random
 
 from drawable_objects.enemy import Enemy
 from drawable_objects.chest import Chest
@@ -8,12 +8,12 @@ from utils.random import is_accurate_random_proc
 from utils.random import weight_choice
 
 
-def create_enemy(grid, i: int, j: int, weapon_name: str, enemy_img: Tuple[str, str]):
+def create_enemy(grid, i: int, j: int, weapon_name: str, enemy_img: Tuple[str, str], angle: float):
     """
-    Создать врага под данным индексом с рандомным поворотом.
+    Создать врага под данным индексом с данным поворотом.
     """
     enemy = Enemy(grid.scene, grid.controller,
-                  grid.get_center_of_cell_by_indexes(i, j), random())
+                  grid.get_center_of_cell_by_indexes(i, j), angle)
     enemy.set_img(enemy_img)
     enemy.set_weapon(weapon_name)
     grid.scene.enemies.append(enemy)
@@ -29,13 +29,14 @@ def create_chest(grid, i: int, j: int, item_name: str, chest_imgs: Tuple[str, st
 
 class LevelObjectsGenerator:
     """
-    Генератор Enemies.
+    Генератор Enemies. Случайные числа берутся из generator.
     """
-    def __init__(self, grid, rectangles: List[GridRectangle],
+    def __init__(self, grid, generator: Random, rectangles: List[GridRectangle],
                  enemy_weapons: List[Tuple[int, str]], chest_weapon_drop: List[Tuple[int, str]],
                  chest_other_drop: List[Tuple[int, str]], chance_weapon_drop: int,
                  enemy_img: Tuple[str, str], chest_imgs: Tuple[str, str]):
         self.__grid = grid
+        self.__generator = generator
         self.__rectangles = rectangles
         self.__enemy_weapons = enemy_weapons
         self.__chest_weapon_drop = chest_weapon_drop
@@ -65,20 +66,21 @@ class LevelObjectsGenerator:
     def __generate_enemy(self, room: GridRectangle):
         CHANCE_SPAWN = 25
 
-        if not is_accurate_random_proc(CHANCE_SPAWN):
+        if not is_accurate_random_proc(self.__generator, CHANCE_SPAWN):
             return
 
         random_i, random_j = self.__get_random_cell(room)
 
         if self.__grid.is_enemy_can_stay(random_i, random_j):
             # этот if вроде не нужен, но оставлю его, чтобы ничего не сломать (при будущих модификациях)
-            random_weapon = weight_choice(self.__enemy_weapons)
-            create_enemy(self.__grid, random_i, random_j, random_weapon, self.__enemy_img)
+            random_weapon = weight_choice(self.__generator, self.__enemy_weapons)
+            create_enemy(self.__grid, random_i, random_j, random_weapon, self.__enemy_img,
+                         self.__generator.random())
 
     def __generate_chest(self, room: GridRectangle):
         CHANCE_SPAWN = 10
 
-        if not is_accurate_random_proc(CHANCE_SPAWN):
+        if not is_accurate_random_proc(self.__generator, CHANCE_SPAWN):
             return
         random_i, random_j = self.__get_random_cell(room)
 
@@ -86,17 +88,17 @@ class LevelObjectsGenerator:
         create_chest(self.__grid, random_i, random_j, random_item, self.__chest_imgs)
 
     def __get_random_drop(self) -> str:
-        if is_accurate_random_proc(self.__chance_weapon_drop):
-            return weight_choice(self.__chest_weapon_drop)
-        return weight_choice(self.__chest_other_drop)
+        if is_accurate_random_proc(self.__generator, self.__chance_weapon_drop):
+            return weight_choice(self.__generator, self.__chest_weapon_drop)
+        return weight_choice(self.__generator, self.__chest_other_drop)
 
 
     def __get_random_cell(self, room: GridRectangle) -> Tuple[int, int]:
         WALLS_MIN_DISTANCE = 2  # нужно, чтобы объекты не спавнились прямо у стены
 
-        random_i = randint(room.top_index + WALLS_MIN_DISTANCE,
-                           room.bottom_index - WALLS_MIN_DISTANCE)
-        random_j = randint(room.left_index + WALLS_MIN_DISTANCE,
-                           room.right_index - WALLS_MIN_DISTANCE)
+        random_i = self.__generator.randint(room.top_index + WALLS_MIN_DISTANCE,
+                                            room.bottom_index - WALLS_MIN_DISTANCE)
+        random_j = self.__generator.randint(room.left_index + WALLS_MIN_DISTANCE,
+                                            room.right_index - WALLS_MIN_DISTANCE)
 
         return (random_i, random_j)
@@ -1,3 +1,5 @@
+from random import Random
+
 from map.level.rect.graph.manager import RectGraphManager
 from utils.disjoint_set import DisjointSet
 from utils.random import is_random_proc, shuffle
@@ -7,11 +9,13 @@ class RectConnecter:
     """
     делает проходы(двери) между прямоугольниками.
 
-    :return:
+    :param graph_manager: граф прямоугольников
+    :param generator: генератор случайных чисел генерации
     """
 
-    def __init__(self, graph_manager: RectGraphManager):
+    def __init__(self, graph_manager: RectGraphManager, generator: Random):
         self.arr = graph_manager.arr
+        self.__generator = generator
 
         self.edges = []
         graph_manager.save_edges_between_rects(self.edges)
@@ -27,7 +31,7 @@ class RectConnecter:
         соединяет их, удаляя стену, между клетками ребра.
         Если можно, то соединяет с некоторой вероятностью.
         """
-        shuffle(self.edges)
+        shuffle(self.__generator, self.edges)
         self.dis_set = DisjointSet(self.rects_count)
         for i in range(len(self.edges)):
             edge = self.edges[i]
@@ -37,5 +41,5 @@ class RectConnecter:
                 continue
 
             CHANCE_EXTRA_CONNECTION = 1
-            if is_random_proc(CHANCE_EXTRA_CONNECTION):
+            if is_random_proc(self.__generator, CHANCE_EXTRA_CONNECTION):
                 edge.delete(self.arr)
@@ -1,6 +1,6 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 
-from random import randint
+from random import Random
 from utils.random import is_random_proc
 
 
@@ -63,49 +63,204 @@ class GridRectangle:
             dict['bottom_right_index'][0], dict['bottom_right_index'][1])
 
 
+class SplitNode:
+    """
+    Узел дерева разбиения: прямоугольник и то, как он разбит. У разбитого прямоугольника два потомка: по
+    обе стороны от черты, черта (стена) входит в оба. Неразбитый прямоугольник - лист, это одна из комнат
+    (RectSplitter.rectangles), color - ее цвет в arr.
+
+    :param rectangle: прямоугольник узла
+    """
+    HORIZONTAL = 0  # черта - строка position
+    VERTICAL = 1  # черта - столбец position
+
+    def __init__(self, rectangle: GridRectangle):
+        self.rectangle = rectangle
+        self.axis = None
+        self.position = None
+        self.children = []
+        self.color = 0
+
+    @property
+    def is_leaf(self) -> bool:
+        return not self.children
+
+    @staticmethod
+    def from_rectangles(rectangles: List[GridRectangle]) -> 'SplitNode':
+        """
+        Восстановить дерево разбиения по его листьям (например, по комнатам из сохранения уровня) в порядке
+        прямого обхода: черта узла - линия, по одну сторону от которой лежат первые прямоугольники узла, а по
+        другую - остальные. Если таких черт несколько, берется первая, тогда дерево может отличаться от
+        исходного, но листья (и их цвета - номера в rectangles с единицы) и их порядок те же.
+        """
+        top = min(rectangle.top_index for rectangle in rectangles)
+        left = min(rectangle.left_index for rectangle in rectangles)
+        bottom = max(rectangle.bottom_index for rectangle in rectangles)
+        right = max(rectangle.right_index for rectangle in rectangles)
+        root = SplitNode(GridRectangle((top, left), (bottom, right)))
+        stack = [(root, list(enumerate(rectangles)))]
+        while stack:
+            node, items = stack.pop()
+            if len(items) == 1:
+                index, node.rectangle = items[0]
+                node.color = index + 1
+                continue
+            for axis in (SplitNode.HORIZONTAL, SplitNode.VERTICAL):
+                position = SplitNode.__find_split_position(items, axis)
+                if position is not None:
+                    break
+            else:
+                raise ValueError('rectangles are not a split of a rectangle')
+            node.split(axis, position)
+            first = [item for item in items if item[1].bottom_right_index[axis] <= position]
+            second = [item for item in items if item[1].left_top_index[axis] >= position]
+            stack.append((node.children[1], second))
+            stack.append((node.children[0], first))
+        return root
+
+    @staticmethod
+    def __find_split_position(items: List[Tuple[int, GridRectangle]], axis: int) -> Optional[int]:
+        """
+        Линия по оси axis, которая отделяет первые прямоугольники (с наименьшими номерами) от остальных, или None.
+        У соседей по черте она общая: черта - край и тех, и других.
+        """
+        items = sorted(items, key=lambda item: item[1].left_top_index[axis])
+        first_index = min(item[0] for item in items)
+        end = items[0][1].bottom_right_index[axis]
+        last_index = items[0][0]
+        for k in range(1, len(items)):
+            start = items[k][1].left_top_index[axis]
+            if start == end and last_index == first_index + k - 1:
+                return start
+            end = max(end, items[k][1].bottom_right_index[axis])
+            last_index = max(last_index, items[k][0])
+        return None
+
+    def split(self, axis: int, position: int):
+        """
+        Разбить прямоугольник узла чертой.
+        """
+        self.axis = axis
+        self.position = position
+        pos0 = self.rectangle.left_top_index
+        pos1 = self.rectangle.bottom_right_index
+        if axis == SplitNode.HORIZONTAL:
+            first = GridRectangle(pos0, (position, pos1[1]))
+            second = GridRectangle((position, pos0[1]), pos1)
+        else:
+            first = GridRectangle(pos0, (pos1[0], position))
+            second = GridRectangle((pos0[0], position), pos1)
+        self.children = [SplitNode(first), SplitNode(second)]
+
+    def get_node(self, i: int, j: int) -> Optional['SplitNode']:
+        """
+        Самый глубокий узел, в прямоугольнике которого клетка (i, j): лист - для клеток внутри и на краю
+        комнаты, разбитый узел - для клеток на его черте. None, если клетка вне прямоугольника узла.
+        """
+        if not self.rectangle.is_index_inside(i, j):
+            return None
+        node = self
+        while node.children:
+            index = (i, j)[node.axis]
+            if index == node.position:
+                return node
+            node = node.children[0] if index < node.position else node.children[1]
+        return node
+
+    def get_color(self, i: int, j: int) -> int:
+        """
+        Цвет комнаты, внутри которой клетка (i, j), как в arr после разбиения; 0 - стена.
+        """
+        node = self.get_node(i, j)
+        if node is None or not node.is_leaf:
+            return 0
+        rectangle = node.rectangle
+        if rectangle.top_index < i < rectangle.bottom_index and rectangle.left_index < j < rectangle.right_index:
+            return node.color
+        return 0
+
+    def get_leaves(self) -> List['SplitNode']:
+        """
+        Листья в порядке цветов (прямой обход).
+        """
+        result = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.is_leaf:
+                result.append(node)
+            stack.extend(reversed(node.children))
+        return result
+
+    def get_leaves_intersecting(self, rectangle: GridRectangle) -> List['SplitNode']:
+        """
+        Листья, прямоугольники которых пересекаются с rectangle (включая края).
+        """
+        result = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            current = node.rectangle
+            if current.right_index < rectangle.left_index or rectangle.right_index < current.left_index or \
+                    current.bottom_index < rectangle.top_index or rectangle.bottom_index < current.top_index:
+                continue
+            if node.is_leaf:
+                result.append(node)
+            stack.extend(reversed(node.children))
+        return result
+
+
 class RectSplitter:
     """
-    рекурсивный алгоритм разбиения:
+    алгоритм разбиения:
     выбирается направление, по которому будет
     разделяться прямоугольник (вертикальное, горизонтальное).
     Далее выбирается положение прямой (положение по горизонтали
     и по вертикали соответственно). После этого прямоугольник делится
-    на 2 прямоугольника этой прямой. Вызывается рекурсивная функция от них (split_rectangle).
+    на 2 прямоугольника этой прямой, и они разбиваются так же.
 
-    Условие выхода из рекурсии - невозможность такого разбиения (хотя бы по одному из направлений),
+    Прямоугольник не разбивается, если невозможно такое разбиение (хотя бы по одному из направлений),
     при котором для каждого прямоугольника выполняется:
     -ширина >= min_w
     -высота >= min_h
     или
     площадь текущего прямоугольника < min_area
+
+    Прямоугольники разбиваются не рекурсией, а по стеку, в том же порядке (сначала первая половина целиком,
+    потом вторая), поэтому случайные числа берутся из generator в том же порядке, а глубина разбиения не
+    ограничена стеком вызовов. Дерево разбиения остается в tree (SplitNode), листья - rectangles.
     """
 
-    def __init__(self, arr: List[List[int]], min_area: int, min_w: int, min_h: int):
+    def __init__(self, arr: List[List[int]], generator: Random, min_area: int, min_w: int, min_h: int):
         self.arr = arr
+        self.__generator = generator
         self.__min_area = min_area
         self.__min_size = [min_h, min_w]
 
         self.rectangles = []
+        self.tree = None
 
     def start_random_split(self):
         """
         Начать разбиение всего self.arr
         """
-        self.__split_rectangle(
-            [0, 0], [len(self.arr) - 1, len(self.arr[0]) - 1])
-
-    def __split_rectangle(self, pos0: List[int], pos1: List[int]):
+        self.tree = SplitNode(GridRectangle((0, 0), (len(self.arr) - 1, len(self.arr[0]) - 1)))
+        stack = [self.tree]
+        while stack:
+            node = stack.pop()
+            self.__split_node(node)
+            stack.extend(reversed(node.children))
+
+    def __split_node(self, node: SplitNode):
         """
-        Начать разбиение прямоугольника.
-
-        pos_0 - позиция левой верхней клетки прямоугольника
-        pos_1 - позиция правой нижней клетки прямоугольника
-        :return:
+        Разбить прямоугольник узла на два (потомки узла) или, если нельзя, покрасить его как комнату.
         """
+        pos0 = node.rectangle.left_top_index
+        pos1 = node.rectangle.bottom_right_index
         w = pos1[1] - pos0[1] + 1
         h = pos1[0] - pos0[0] + 1
         if w * h < self.__min_area:
-            self.__fill_rect(pos0, pos1)
+            self.__fill_rect(node)
             return
 
         wall_size = 1
@@ -118,14 +273,12 @@ class RectSplitter:
         for i in range(len(pos1)):
             max_pos.append(pos1[i] - self.__min_size[i] - wall_size)
 
-        self.__choose_direction_and_split(pos0, pos1, min_pos, max_pos)
+        self.__choose_direction_and_split(node, min_pos, max_pos)
 
-    def __choose_direction_and_split(self, pos0: List[int], pos1: List[int],
-                                     min_pos: List[int], max_pos: List[int]):
+    def __choose_direction_and_split(self, node: SplitNode, min_pos: List[int], max_pos: List[int]):
         """
 
-        :param pos0: левый верхний индекс прямоугольника, в котором происходит split
-        :param pos1: правый нижний индекс прямоугольника, в котором происходит split
+        :param node: узел, прямоугольник которого разбивается
         :param min_pos: минимальные индексы, по которым может происходить разбиение
         :param max_pos: максимальные индексы, по которым может происходить разбиение
         :return:
@@ -141,43 +294,20 @@ class RectSplitter:
                 split_directions -= 1
 
         if not split_directions:
-            self.__fill_rect(pos0, pos1)
+            self.__fill_rect(node)
             return
 
         if split_directions == 1:
             if min_pos[0] <= max_pos[0]:
-                self.__split_horizontally(
-                    pos0, pos1, randint(min_pos[0], max_pos[0]))
+                node.split(SplitNode.HORIZONTAL, self.__generator.randint(min_pos[0], max_pos[0]))
             else:
-                self.__split_vertical(
-                    pos0, pos1, randint(min_pos[1], max_pos[1]))
+                node.split(SplitNode.VERTICAL, self.__generator.randint(min_pos[1], max_pos[1]))
             return
 
-        if is_random_proc():
-            self.__split_horizontally(
-                pos0, pos1, randint(min_pos[0], max_pos[0]))
+        if is_random_proc(self.__generator):
+            node.split(SplitNode.HORIZONTAL, self.__generator.randint(min_pos[0], max_pos[0]))
         else:
-            self.__split_vertical(pos0, pos1, randint(min_pos[1], max_pos[1]))
-
-    def __split_horizontally(self, pos0: List[int], pos1: List[int], new_pos: List[int]):
-        """
-        Разбить прямоугольник горизонтальной чертой
-        :param pos0: левый верхний индекс прямоугольника, в котором происходит split
-        :param pos1: правый нижний индекс прямоугольника, в котором происходит split
-        :param new_pos: индекс, по которому идет разбиение
-        """
-        self.__split_rectangle(pos0, [new_pos, pos1[1]])
-        self.__split_rectangle([new_pos, pos0[1]], pos1)
-
-    def __split_vertical(self, pos0: List[int], pos1: List[int], new_pos: int):
-        """
-        Разбить прямоугольник вертикальной чертой
-        :param pos0: левый верхний индекс прямоугольника, в котором происходит split
-        :param pos1: правый нижний индекс прямоугольника, в котором происходит split
-        :param new_pos: индекс, по которому идет разбиение
-        """
-        self.__split_rectangle(pos0, [pos1[0], new_pos])
-        self.__split_rectangle([pos0[0], new_pos], pos1)
+            node.split(SplitNode.VERTICAL, self.__generator.randint(min_pos[1], max_pos[1]))
 
     @property
     def rects_colors_count(self) -> int:
@@ -186,19 +316,23 @@ class RectSplitter:
         """
         return len(self.rectangles) + 1
 
-    def __fill_rect(self, pos0: List[int], pos1: List[int]):
+    def __fill_rect(self, node: SplitNode):
         """
-        Заполнить прямоугольник его цветом.
-        :param pos0: левый верхний угол
-        :param pos1: правый нижний угол
+        Сделать узел комнатой: заполнить прямоугольник его цветом.
         """
-        new_rectangle = GridRectangle((pos0[0], pos0[1]),
-                                      (pos1[0], pos1[1]))
-        self.rectangles.append(new_rectangle)
+        self.rectangles.append(node.rectangle)
+        node.color = len(self.rectangles)
+        pos0 = node.rectangle.left_top_index
+        pos1 = node.rectangle.bottom_right_index
+        self._fill_cells(pos0, pos1, node.color)
 
+    def _fill_cells(self, pos0: List[int], pos1: List[int], color: int):
+        """
+        Покрасить клетки внутри прямоугольника (без его границы, там стены).
+        """
         for i in range(pos0[0] + 1, pos1[0]):
             for j in range(pos0[1] + 1, pos1[1]):
-                self.arr[i][j] = len(self.rectangles)
+                self.arr[i][j] = color
 
     def get_arr_after_split(self) -> List[List[int]]:
         """
@@ -1,3 +1,5 @@
+from random import Random
+
 from map.level.rect.graph.manager import RectGraphManager
 from utils.disjoint_set import DisjointSet
 from utils.random import is_random_proc
@@ -7,10 +9,14 @@ class RectUnioner:
     """
     делает из прямоугольников фигуры с углами 270 и 90 градусов,
     объединяя некоторые прямоугольники
+
+    :param graph_manager: граф прямоугольников
+    :param generator: генератор случайных чисел генерации
     """
 
-    def __init__(self, graph_manager: RectGraphManager):
+    def __init__(self, graph_manager: RectGraphManager, generator: Random):
         self.arr = graph_manager.arr
+        self.__generator = generator
         self.UNION_CHANCE = (len(self.arr) * len(self.arr[0])) ** (1 / 2)
 
         self.rect_graph = []
@@ -28,7 +34,7 @@ class RectUnioner:
         for i in range(len(self.rect_graph)):
             for j in self.rect_graph[i]:
                 chance = self.__get_union_chance(i, j)
-                if is_random_proc(chance):
+                if is_random_proc(self.__generator, chance):
                     self.__union_figures(i, j)
 
     def __union_figures(self, rect_num1, rect_num2):
@@ -1,6 +1,22 @@
+import argparse
+import tempfile
+
 from game import Game
+from utils.game_data_manager import GameDataManager
 
 
 if __name__ == '__main__':
-    g = Game()
+    parser = argparse.ArgumentParser(description='Space Caravan.')
+    parser.add_argument('--seed', type=int, default=None, help='seed новых космосов')
+    parser.add_argument('--record', default=None,
+                        help='записать ввод в файл для воспроизведения (simulate.py --replay); '
+                             'игра идет в новой временной папке сохранений, если не указана --storage')
+    parser.add_argument('--storage', default=None, help='папка сохранений')
+    args = parser.parse_args()
+
+    if args.storage is not None:
+        GameDataManager.STORAGE_ROOT = args.storage
+    elif args.record is not None:
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+    g = Game(seed=args.seed, record_path=args.record)
     g.main_loop()
@@ -1,12 +1,11 @@
-import pygame
-
 from constants.color import COLOR
 from geometry.point import Point
 
 
 class Scene:
     """
-    Базовый класс сцены.
+    Базовый класс сцены. Игра вызывает process_all_logic каждый тик логики и process_all_draw каждый
+    нарисованный кадр (см. FrameScheduler), тиков за кадр может быть несколько или ни одного.
 
     :param game: игра, создающая сцену
     """
@@ -30,16 +29,6 @@ class Scene:
     def center(self):
         return Point(self.width / 2, self.height / 2)
 
-    def iteration(self):
-        """
-        Итерация работы сцены - обработка логики и отрисовка. Далее команда двойной буферизации и задержка
-        между тактами.
-        """
-        self.process_all_logic()
-        self.process_all_draw()
-        pygame.display.flip()
-        pygame.time.wait(10)
-
     def interface_logic(self):
         for item in self.interface_objects:
             item.process_logic()
@@ -13,6 +13,7 @@ class ConservableScene(Scene):
     :param data_filename: имя файла, в который сохраняется сцена (расширение не указывать)
     """
     SAVING_IN_SPACE = True
+    BUILD_IN_BACKGROUND = False
 
     def __init__(self, game, data_filename: str):
         super().__init__(game)
@@ -20,8 +21,17 @@ class ConservableScene(Scene):
 
     def construct(self):
         """
-        Конструирование сцены. Вызывается автоматически игрой при установке сцены текущей. Сцена сама выбирает,
-        загружаться или инициализироваться.
+        Конструирование сцены: build, затем finalize. Вызывается автоматически игрой при установке сцены текущей.
+        Если у сцены BUILD_IN_BACKGROUND, игра с окном вызывает build в фоновом потоке, показывая LoadingScene,
+        а finalize - в главном потоке, когда build закончится.
+        """
+        self.build()
+        self.finalize()
+
+    def build(self):
+        """
+        Построение данных сцены без работы с окном. Сцена сама выбирает, загружаться или инициализироваться.
+        Может идти в фоновом потоке, поэтому не должно трогать текущую сцену игры и окно.
         """
         if self.data_filename and self.game.file_manager.file_exists(self.data_filename, self.SAVING_IN_SPACE):
             self.load()
@@ -29,6 +39,12 @@ class ConservableScene(Scene):
             self.initialize()
             self.save()
 
+    def finalize(self):
+        """
+        Завершение конструирования в главном потоке: подготовка того, что связано с окном (картинки).
+        """
+        pass
+
     def initialize(self):
         """
         Инициализация - создание сцены с нуля.
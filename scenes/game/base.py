@@ -21,10 +21,11 @@ class GameScene(ConservableScene):
 
     def load_common_data(self):
         """
-        Загрузка объекта с общими данными игры.
+        Загрузка объекта с общими данными игры. Seed космоса из них передается генераторам случайных чисел игры.
         """
         self.common_data = CommonGameData(self)
         self.common_data.load()
+        self.game.random_manager.seed = self.common_data.seed
 
     def save(self):
         super().save()
@@ -1,5 +1,7 @@
 from typing import List, Dict
 
+import numpy as np
+
 from drawable_objects.interface.ammo_display import AmmoDisplay
 from drawable_objects.interface.essence_display import EssenceDisplay
 from drawable_objects.interface.pause_manager import PauseManager
@@ -7,10 +9,11 @@ from drawable_objects.interface.player_icon import PlayerIcon
 from drawable_objects.interface.weapons_display import WeaponsDisplay
 from drawable_objects.player import Player
 from drawable_objects.usable_object import UsableObject
-from drawable_objects.base import DrawableObject
+from drawable_objects.base import DrawableObject, WallCollidingObject
 from geometry.point import Point
 from scenes.game.base import GameScene
 from utils.camera import Camera
+from utils.enemy_scheduler import EnemyScheduler
 from utils.timer import Timer
 from utils.game_plane import GamePlane
 from utils.game_data_manager import from_list_of_dicts, to_list_of_dicts
@@ -55,6 +58,7 @@ class LevelScene(GameScene):
         self.player = None
         self.pause_manager = PauseManager(self, self.game.controller)
         self.camera = Camera(self)
+        self.enemy_scheduler = EnemyScheduler(self)
 
         self.e_timer = Timer(UsableObject.ACTIVATION_COOLDOWN)  # таймер для "перезарядки" кнопки E
         self.e_timer.start()
@@ -101,9 +105,21 @@ class LevelScene(GameScene):
         essence_display = EssenceDisplay(self, self.game.controller, (1, 0), self.common_data)
         self.interface_objects.append(essence_display)
 
+    def finalize(self):
+        """
+        Куски статической графики сетки, которые будут на экране, рисуются сразу (если есть окно), а не
+        в первом кадре уровня.
+        """
+        super().finalize()
+        if self.grid is not None and not self.game.headless:
+            self.update_relative_center()
+            self.grid.prepare_static_layer()
+
     def save(self):
         super().save()
         self.player.save()
+        if self.grid is not None:
+            self.grid.save_static_layer()
 
     def pause(self, pause_object: DrawableObject):
         """
@@ -129,22 +145,51 @@ class LevelScene(GameScene):
         self.relative_center = self.camera.get_relative_center(
             not LevelScene.FIXED_CAMERA)
 
+    def cast_tragectories(self):
+        """
+        Фаза сбора: траектории всех игровых объектов, которые в этом тике пересекаются со стенами (пули, частицы),
+        пересекаются со стенами одним запросом к сетке.
+        """
+        casting_objects = []
+        tragectories = []
+        for item in self.game_objects:
+            if isinstance(item, WallCollidingObject):
+                tragectory = item.get_tragectory()
+                if tragectory is not None:
+                    casting_objects.append(item)
+                    tragectories.append(tragectory)
+        if not tragectories:
+            return
+
+        starts = np.array([(tragectory.p1.x, tragectory.p1.y) for tragectory in tragectories], dtype=float)
+        ends = np.array([(tragectory.p2.x, tragectory.p2.y) for tragectory in tragectories], dtype=float)
+        intersection_points = self.grid.intersect_segments_walls(starts, ends)
+        for item, tragectory, intersection_point in zip(casting_objects, tragectories, intersection_points):
+            item.set_wall_intersection(tragectory, intersection_point)
+
     def game_logic(self):
         """
-        Игровая логика в следующем порядке: сетка, игровые объекты и враги, игрок.
+        Игровая логика в следующем порядке: сетка, пересечение траекторий со стенами, игровые объекты и враги, игрок.
+        Каждая фаза замеряется профилировщиком игры. Логику врагов распределяет enemy_scheduler.
         """
-        self.grid.process_logic()
+        profiler = self.game.profiler
+        with profiler.measure('logic.grid'):
+            self.grid.process_logic()
+        with profiler.measure('logic.tragectories'):
+            self.cast_tragectories()
 
-        for item in self.game_objects:
-            item.process_logic()
-        for item in self.soulless_bodies:
-            item.process_logic()
-        for item in self.enemies:
-            self.grid.save_enemy_pos(item.pos)
-        for item in self.enemies:
-            item.process_logic()
+        with profiler.measure('logic.objects'):
+            for item in self.game_objects:
+                item.process_logic()
+            for item in self.soulless_bodies:
+                item.process_logic()
+        with profiler.measure('logic.enemies'):
+            for item in self.enemies:
+                self.grid.save_enemy_pos(item.pos)
+            self.enemy_scheduler.process_logic(self.enemies)
 
-        self.player.process_logic()
+        with profiler.measure('logic.player'):
+            self.player.process_logic()
 
     def interface_logic(self):
         super().interface_logic()
@@ -172,21 +217,25 @@ class LevelScene(GameScene):
         """
         Игровая отрисовка в следующем порядке: сетка, игровые объекты и враги, игрок.
         """
+        profiler = self.game.profiler
         if self.DRAW_GRID:
-            self.grid.process_draw()
+            with profiler.measure('draw.grid'):
+                self.grid.process_draw()
 
-        for item in self.game_objects:
-            item.process_draw()
-        for item in self.enemies:
-            item.process_draw()
-        for item in self.soulless_bodies:
-            item.process_draw()
+        with profiler.measure('draw.objects'):
+            for item in self.game_objects:
+                item.process_draw()
+            for item in self.enemies:
+                item.process_draw()
+            for item in self.soulless_bodies:
+                item.process_draw()
 
-        self.player.process_draw()
+            self.player.process_draw()
 
     def process_all_draw(self):
         self.clear_screen()
         self.game_draw()
-        self.interface_draw()
+        with self.game.profiler.measure('draw.interface'):
+            self.interface_draw()
         if self.pause_object:
             self.pause_object.process_draw()
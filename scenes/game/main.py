@@ -18,14 +18,27 @@ class MainScene(LevelScene):
     :param game: игра, создающая сцену
     :param planet_index: индекс планеты, создавшей уровень
     """
+    BUILD_IN_BACKGROUND = True
+    LADDER_POS = Point(85, 150)
 
     def __init__(self, game, planet_index: str):
-        super().__init__(game, 'planet' + str(planet_index))
+        super().__init__(game, self.get_data_filename(planet_index))
         self.planet_index = planet_index
         enemy_count_display = EnemyCountDisplay(self, self.game.controller,
                                                 (1, 0.1), self.enemies)
         self.interface_objects.append(enemy_count_display)
 
+    @staticmethod
+    def get_data_filename(planet_index: str) -> str:
+        return 'planet' + str(planet_index)
+
+    def build(self):
+        """
+        Если уровень планеты генерируется заранее (LevelPregenerator), сначала дожидаемся генерации.
+        """
+        self.game.level_pregenerator.finish(self.planet_index)
+        super().build()
+
     def initialize(self):
         super().initialize()
 
@@ -38,7 +51,7 @@ class MainScene(LevelScene):
         self.grid.initialize()
 
         self.game_objects.append(Ladder(
-            self, self.game.controller, Point(85, 150), 0))
+            self, self.game.controller, self.LADDER_POS, 0))
 
     def from_dict(self, data_dict: Dict):
         super().from_dict(data_dict)
@@ -1,7 +1,7 @@
 import pygame
 
 from pygame import Rect
-from typing import Dict
+from typing import Dict, List
 
 from scenes.game.base import GameScene
 from space.planets_generator import PlanetsGenerator
@@ -50,6 +50,8 @@ class SpacemapScene(GameScene):
     :param game: игра, создающая сцену
     """
     DATA_FILENAME = 'spacemap'
+    BUILD_IN_BACKGROUND = True
+    PREGENERATION_PLANETS = 4  # уровни скольких планет генерировать заранее (LevelPregenerator)
 
     PANEL_BG_COLOR = COLOR['BLUE']
     CHOICE_ALLOWED_COLOR = COLOR['GREEN']
@@ -102,6 +104,31 @@ class SpacemapScene(GameScene):
         for planet in self.planets:
             planet.add_to_common_data()
 
+    def finalize(self):
+        super().finalize()
+        self.schedule_pregeneration()
+
+    def get_pregeneration_order(self) -> List[str]:
+        """
+        Индексы планет, уровни которых стоит сгенерировать заранее: текущая и те, до которых хватает топлива,
+        по возрастанию стоимости перелета, не больше PREGENERATION_PLANETS. Пройденные планеты пропускаются.
+        """
+        candidates = []
+        for planet in self.planets:
+            if self.common_data.planet_completed[planet.index]:
+                continue
+            cost = self.travel_cost_counter.get_cost(self.current_planet, planet)
+            if cost <= self.common_data.fuel or planet is self.current_planet:
+                candidates.append((cost, planet.index))
+        candidates.sort(key=lambda candidate: candidate[0])
+        return [planet_index for cost, planet_index in candidates[:self.PREGENERATION_PLANETS]]
+
+    def schedule_pregeneration(self):
+        """
+        Постановка уровней планет в очередь заблаговременной генерации.
+        """
+        self.game.level_pregenerator.schedule(self.get_pregeneration_order())
+
     def from_dict(self, data_dict: Dict):
         super().from_dict(data_dict)
         self.planets = from_list_of_dicts(self, data_dict['planets'])
@@ -205,6 +232,7 @@ class SpacemapScene(GameScene):
                 return
             self.common_data.fuel -= self.get_current_cost()
             self.current_planet = self.choice
+            self.schedule_pregeneration()
 
     def back_to_spaceship(self):
         """
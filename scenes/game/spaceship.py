@@ -53,12 +53,14 @@ class SpaceshipScene(LevelScene):
     def initialize(self):
         """
         Инициализация для космического корабля означает создание игрока и общих данных игры (так это первая
-        сцена, появляющаяся в новом игровом мире), а также объектов на корабле.
+        сцена, появляющаяся в новом игровом мире; здесь же выбирается seed космоса), а также объектов на корабле.
         """
         self.player = Player(self, self.game.controller,
                              self.PLAYER_SPAWN_POINT)
         self.common_data = CommonGameData(self)
-        self.common_data.initialize()
+        seed = self.game.random_manager.create_space_seed()
+        self.common_data.initialize(seed)
+        self.game.random_manager.seed = seed
 
         bed_spawn_point = Point(3, 3)
         bed_spawn_point += Point(1, 1) * self.TOP_LEFT_CORNER_BIAS
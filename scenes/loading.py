@@ -0,0 +1,75 @@
+import threading
+
+from math import cos, pi, sin
+
+import pygame
+
+from constants.color import COLOR
+from drawable_objects.menu.text import Text
+from scenes.base import Scene
+
+
+class LoadingScene(Scene):
+    """
+    Сцена загрузки: показывается, пока сцена с BUILD_IN_BACKGROUND строится (build) в фоновом потоке. Главный
+    цикл игры тем временем продолжает обрабатывать события окна, поэтому система не считает его зависшим.
+    Когда построение заканчивается, игра доделывает сцену в главном потоке и делает ее текущей
+    (Game.set_built_scene). Ошибка построения поднимается в главном потоке.
+
+    Ввод на время загрузки игнорируется. Надпись рисуется шрифтом один раз при создании сцены: во время
+    загрузки шрифтами может пользоваться поток построения.
+
+    :param game: игра, создающая сцену
+    :param scene: строящаяся сцена
+    """
+    CLEAR_COLOR = (40, 40, 80)
+    TEXT = 'Загрузка...'
+    TEXT_COLOR = COLOR['WHITE']
+    FONT_NAME = 'zelekbold'
+    DOTS_COLOR = COLOR['WHITE']
+    DOTS_COUNT = 8
+    DOTS_RADIUS = 30
+    DOT_RADIUS = 5
+    DOTS_TOP = 60  # на сколько кружок из точек ниже надписи
+    TICKS_PER_DOT = 6
+
+    def __init__(self, game, scene: Scene):
+        super().__init__(game)
+        self.scene = scene
+        self.ticks = 0
+        self.__error = None
+        self.__text = Text(self, self.center, self.TEXT, self.TEXT_COLOR, 'center', self.FONT_NAME)
+        self.interface_objects.append(self.__text)
+        self.__thread = threading.Thread(target=self.__build, daemon=True)
+        self.__thread.start()
+
+    def __build(self):
+        try:
+            self.scene.build()
+        except BaseException as error:
+            self.__error = error
+
+    def save(self):
+        """
+        Сцена загрузки не сохраняется.
+        """
+        pass
+
+    def process_all_logic(self):
+        self.ticks += 1
+        if self.__thread.is_alive():
+            return
+        if self.__error is not None:
+            raise self.__error
+        self.game.set_built_scene(self.scene)
+
+    def process_all_draw(self):
+        self.__text.pos = self.center
+        super().process_all_draw()
+        current = self.ticks // self.TICKS_PER_DOT % self.DOTS_COUNT
+        for i in range(self.DOTS_COUNT):
+            angle = 2 * pi * i / self.DOTS_COUNT
+            pos = (int(self.center.x + self.DOTS_RADIUS * cos(angle)),
+                   int(self.center.y + self.DOTS_TOP + self.DOTS_RADIUS * sin(angle)))
+            radius = self.DOT_RADIUS if i == current else self.DOT_RADIUS // 2
+            pygame.draw.circle(self.screen, self.DOTS_COLOR, pos, radius)
@@ -0,0 +1,162 @@
+"""
+Безоконная симуляция уровня: игра создается в безоконном режиме (Game(headless=True)), в новом космосе
+открывается уровень планеты, и его логика гоняется заданное число тиков без отрисовки. Ввод игрока задает
+скрипт ScriptedController. Выводится скорость логики в тиках в секунду и состояние уровня.
+
+С --replay вместо этого воспроизводится запись ввода настоящей игры (run.py --record): игра начинается
+с главного меню с seed и размером окна записи, и все тики записи выполняются с максимальной скоростью.
+Время воспроизведения одной и той же записи можно сравнивать между версиями игры.
+
+Нужно для нагрузочных тестов уровней, замеров логики и запуска на машинах без дисплея (CI). Сохранения
+пишутся во временную папку, если не указана --storage. Запуск из корня проекта:
+
+python simulate.py --ticks 3000 --script fighter --seed 1
+python simulate.py --replay session.rec
+"""
+import argparse
+import random
+import tempfile
+
+from math import hypot
+from typing import Callable
+
+import pygame
+
+from constants.mouse_buttons import MouseButtonID
+from controller.input_recording import InputRecord, InputReplay
+from controller.scripted_controller import ScriptedController
+from drawable_objects.player import Player
+from game import Game
+from scenes.game.level import LevelScene
+from scenes.game.main import MainScene
+from scenes.game.spacemap import SpacemapScene
+from scenes.game.spaceship import SpaceshipScene
+from utils.game_data_manager import GameDataManager
+
+SPACE_NAME = 'simulation'
+REPORT_TICKS = 500
+
+
+def enter_level(game: Game, space_name: str = SPACE_NAME, planet_number: int = 0) -> MainScene:
+    """
+    Создание нового космоса (старый с тем же именем удаляется) и переход на уровень планеты так же, как это
+    делает игрок: корабль, звездная карта, высадка.
+
+    :param game: игра
+    :param space_name: имя космоса
+    :param planet_number: номер планеты в списке планет звездной карты
+    :return: сцена уровня
+    """
+    game.file_manager.space_name = space_name
+    game.file_manager.create_space_storage()
+    SpaceshipScene(game).construct()
+    spacemap = SpacemapScene(game)
+    game.set_scene(spacemap)
+    scene = MainScene(game, spacemap.planets[planet_number].index)
+    game.set_scene(scene)
+    return scene
+
+
+def idle_script(tick: int, controller: ScriptedController):
+    """
+    Игрок ничего не делает.
+    """
+    pass
+
+
+def create_fighter_script(seed: int) -> Callable[[int, ScriptedController], None]:
+    """
+    Игрок бродит в случайных направлениях, целится в ближайшего врага и стреляет, перезаряжается.
+    """
+    generator = random.Random(seed)
+
+    def script(tick: int, controller: ScriptedController):
+        scene = controller.game.current_scene
+        if not isinstance(scene, LevelScene) or scene.player is None:
+            return
+        if tick % 30 == 0:
+            for key in Player.CONTROLS:
+                controller.release_key(key)
+            for key in generator.sample(Player.CONTROLS, generator.randint(0, 2)):
+                controller.press_key(key)
+        if scene.enemies:
+            player_pos = scene.player.pos
+            target = min(scene.enemies, key=lambda enemy: hypot(enemy.pos.x - player_pos.x,
+                                                                enemy.pos.y - player_pos.y))
+            controller.move_mouse(target.pos - scene.relative_center)
+            controller.press_mouse(MouseButtonID.LEFT)
+            if tick % 10 == 0:
+                controller.click(MouseButtonID.LEFT)
+        else:
+            controller.release_mouse(MouseButtonID.LEFT)
+        if tick % 200 == 0:
+            controller.press_key(pygame.K_r)
+        elif tick % 200 == 1:
+            controller.release_key(pygame.K_r)
+
+    return script
+
+
+def get_level_state(scene) -> str:
+    if not isinstance(scene, LevelScene):
+        return 'scene {}'.format(scene.__class__.__name__)
+    return 'enemies {}, objects {}, player hp {}'.format(
+        len(scene.enemies), len(scene.game_objects), scene.player.hp)
+
+
+def run_ticks(game: Game, ticks: int, only_level: bool = True) -> float:
+    """
+    Выполнение тиков с отчетом каждые REPORT_TICKS тиков.
+
+    :param only_level: остановиться, если игра ушла с уровня (например, игрок погиб)
+    :return: затраченное время в секундах
+    """
+    done = 0
+    total = 0
+    while done < ticks:
+        chunk = min(REPORT_TICKS, ticks - done)
+        elapsed = game.simulate(chunk)
+        done += chunk
+        total += elapsed
+        print('{:>7} ticks  {:8.1f} ticks/s  {}'.format(done, chunk / elapsed, get_level_state(game.current_scene)))
+        if only_level and not isinstance(game.current_scene, LevelScene):
+            break
+    return total
+
+
+def replay(path: str):
+    """
+    Воспроизведение записи ввода.
+    """
+    record = InputRecord.load(path)
+    game = Game(*record.size, headless=True, seed=record.seed)
+    game.controller.script = InputReplay(record)
+    elapsed = run_ticks(game, record.ticks, only_level=False)
+    print('replay: {} ticks, {:.3f} s, {:.1f} ticks/s'.format(game.controller.tick, elapsed,
+                                                             game.controller.tick / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Безоконная симуляция уровня.')
+    parser.add_argument('--ticks', type=int, default=3000, help='сколько тиков логики выполнить')
+    parser.add_argument('--script', choices=['idle', 'fighter'], default='fighter', help='ввод игрока')
+    parser.add_argument('--seed', type=int, default=0, help='seed космоса и скрипта')
+    parser.add_argument('--planet', type=int, default=0, help='номер планеты на звездной карте')
+    parser.add_argument('--storage', default=None, help='папка сохранений (по умолчанию временная)')
+    parser.add_argument('--replay', default=None, help='воспроизвести запись ввода (run.py --record)')
+    args = parser.parse_args()
+
+    GameDataManager.STORAGE_ROOT = args.storage or tempfile.mkdtemp()
+    if args.replay is not None:
+        replay(args.replay)
+        return
+    game = Game(headless=True, seed=args.seed)
+    scene = enter_level(game, planet_number=args.planet)
+    print('level: {}, {}'.format(scene.grid.__class__.__name__, get_level_state(scene)))
+
+    game.controller.script = idle_script if args.script == 'idle' else create_fighter_script(args.seed)
+    run_ticks(game, args.ticks)
+
+
+if __name__ == '__main__':
+    main()
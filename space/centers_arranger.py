@@ -1,4 +1,4 @@
-from random import random
+from random import Random
 from typing import List
 
 from constants.planets_generation import ESTIMATED_SPACE_SIZE
@@ -15,6 +15,9 @@ class CentersArranger:
     их по пространству гравитационными силами. Константами можно установить значения этих сил. Центры планет
     отталкиваются друг от друга и от границ космоса. Силы отталкивания разбрасывают точки по
     краям, поэтому для компенсации они притягиваются к центру.
+
+    :param planets_number: количество планет
+    :param generator: генератор случайных чисел генерации
     """
 
     ITERATIONS = 200
@@ -23,7 +26,8 @@ class CentersArranger:
     SPACE_CENTER_KOEF = 1
     MIN_GRAVITY_DIST_SQUARE = 1000
 
-    def __init__(self, planets_number: int):
+    def __init__(self, planets_number: int, generator: Random):
+        self.__generator = generator
         self.__space_rectangle = Rectangle(
             0, 0, ESTIMATED_SPACE_SIZE[0], ESTIMATED_SPACE_SIZE[1])
         self.__planets_number = planets_number
@@ -44,7 +48,7 @@ class CentersArranger:
         return False
 
     def __get_random_point_inside(self, rectangle: Rectangle) -> Point:
-        result = Point(random() * rectangle.width, random() * rectangle.height)
+        result = Point(self.__generator.random() * rectangle.width, self.__generator.random() * rectangle.height)
         result += rectangle.top_left
         return result
 
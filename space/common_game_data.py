@@ -6,7 +6,7 @@ from scenes.base import Scene
 class CommonGameData:
     """
     Объект с общими данными игры, которые нужны всем игровым сценам. Здесь хранятся запасы ресурсов игрока,
-    некоторые данные о планетах.
+    некоторые данные о планетах, seed космоса (см. RandomManager).
     """
     START_FUEL = 400
     START_ESSENCE = 0
@@ -17,18 +17,21 @@ class CommonGameData:
         self.__scene = scene
         self.fuel = 0
         self.essence = 0
+        self.seed = 0
         self.planet_biom = {}
         self.planet_completed = {}
         self.__space_completed = False
         self.user_congratulated = False
 
-    def initialize(self):
+    def initialize(self, seed: int):
         self.fuel = self.START_FUEL
         self.essence = self.START_ESSENCE
+        self.seed = seed
 
     def from_dict(self, data_dict: Dict):
         self.fuel = data_dict['fuel']
         self.essence = data_dict['essence']
+        self.seed = data_dict.get('seed', 0)  # в космосах, созданных до появления seed, его нет
         self.planet_biom = data_dict['planet_biom']
         self.planet_completed = data_dict['planet_completed']
         self.user_congratulated = data_dict['user_congratulated']
@@ -37,6 +40,7 @@ class CommonGameData:
         return {
             'fuel': self.fuel,
             'essence': self.essence,
+            'seed': self.seed,
             'planet_biom': self.planet_biom,
             'planet_completed': self.planet_completed,
             'user_congratulated': self.user_congratulated,
@@ -1,5 +1,5 @@
 from typing import List
-from random import random
+from random import Random
 
 from constants.planets_generation import ESTIMATED_SPACE_SIZE
 from geometry.point import Point
@@ -48,8 +48,9 @@ class FeaturesArranger:
     ]
     START_POSITION = Point(0, ESTIMATED_SPACE_SIZE[1] / 2)
 
-    def __init__(self, controller: Controller, spacemap_scene: Scene):
+    def __init__(self, controller: Controller, spacemap_scene: Scene, generator: Random):
         self.__controller = controller
+        self.__generator = generator
         self.__spacemap_scene = spacemap_scene
 
     def __start_planet_to_front(self, planets_centers: List[Point]):
@@ -97,7 +98,7 @@ class FeaturesArranger:
         """
         values = [function.value(x) for function in self.PROBABILITY_FUNC]
         self.__transform_values(values)
-        random_number = random()
+        random_number = self.__generator.random()
         for i in range(len(values) - 1):
             if random_number < values[i]:
                 return i
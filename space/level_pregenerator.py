@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from utils.game_data_manager import GameDataManager
+
+
+class LevelPregenerator:
+    """
+    Заблаговременная генерация уровней планет в фоновых процессах, пока игрок на космической карте: при высадке
+    уровень уже лежит в хранилище космоса, и сцена уровня только загружается.
+
+    Планеты ставятся в очередь (schedule) в порядке важности. Каждый процесс-генератор держит свою безоконную
+    игру; он генерирует уровень так же, как сцена уровня при первой высадке (тот же seed, тот же генератор), и
+    записывает только файл уровня - общие данные и игрока он лишь читает. Планеты, уровни которых уже есть,
+    пропускаются.
+
+    Еще не начатые генерации отменяются (cancel) при каждой смене сцены. Если игрок высаживается на планету,
+    уровень которой генерируется, сцена уровня дожидается конца генерации (finish); если генерация еще не
+    началась, она отменяется, и сцена генерирует уровень сама.
+
+    Бюджет процессора - WORKERS процессов с пониженным приоритетом; 0 - заблаговременной генерации нет.
+    Процессы создаются при первой постановке в очередь.
+
+    :param game: игра
+    :param workers: число процессов-генераторов
+    """
+    WORKERS = max(1, (os.cpu_count() or 2) // 2)
+    WORKER_NICENESS = 10
+
+    def __init__(self, game, workers: int = WORKERS):
+        self.__game = game
+        self.workers = workers
+        self.__executor = None
+        self.__futures = dict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                  mp_context=multiprocessing.get_context('spawn'),
+                                                  initializer=init_worker,
+                                                  initargs=(GameDataManager.STORAGE_ROOT,))
+        return self.__executor
+
+    def schedule(self, planet_indices: List[str]):
+        """
+        Постановка в очередь генерации уровней планет текущего космоса. Генерации, поставленные раньше и еще
+        не начатые, отменяются.
+
+        :param planet_indices: индексы планет по убыванию важности
+        """
+        if not self.enabled:
+            return
+        from scenes.game.main import MainScene  # В обход цикличеких import'ов
+        self.cancel()
+        file_manager = self.__game.file_manager
+        space_name = file_manager.space_name
+        for planet_index in planet_indices:
+            key = (space_name, planet_index)
+            if key in self.__futures or file_manager.file_exists(MainScene.get_data_filename(planet_index)):
+                continue
+            self.__futures[key] = self.__get_executor().submit(generate_level, space_name, planet_index)
+
+    def cancel(self):
+        """
+        Отмена еще не начатых генераций. Начатые доделываются. Закончившиеся забываются.
+        """
+        for key, future in list(self.__futures.items()):
+            if future.cancel() or future.done():
+                del self.__futures[key]
+
+    def is_pending(self, planet_index: str) -> bool:
+        """
+        Стоит ли в очереди или генерируется уровень планеты текущего космоса.
+        """
+        future = self.__futures.get((self.__game.file_manager.space_name, planet_index))
+        return future is not None and not future.done()
+
+    def finish(self, planet_index: str):
+        """
+        Вызывается перед конструированием уровня планеты текущего космоса: если его генерация идет, дождаться ее,
+        если еще не началась - отменить. Может вызываться из потока построения сцены (LoadingScene). Ошибка
+        генерации только выводится: тогда сцена сгенерирует уровень сама.
+        """
+        future = self.__futures.pop((self.__game.file_manager.space_name, planet_index), None)
+        if future is None or future.cancel():
+            return
+        try:
+            future.result()
+        except Exception as error:
+            print('Заблаговременная генерация уровня планеты {} не удалась: {!r}'.format(planet_index, error))
+
+    def shutdown(self):
+        """
+        Отмена очереди и остановка процессов (начатые генерации доделываются).
+        """
+        # shutdown(cancel_futures=True) есть только с Python 3.9
+        for future in self.__futures.values():
+            future.cancel()
+        self.__futures.clear()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+
+
+worker_game = None
+
+
+def init_worker(storage_root: str):
+    """
+    Создание безоконной игры процесса-генератора.
+    """
+    global worker_game
+    if hasattr(os, 'nice'):
+        os.nice(LevelPregenerator.WORKER_NICENESS)
+    GameDataManager.STORAGE_ROOT = storage_root
+    import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+    from game import Game
+    worker_game = Game(headless=True)
+
+
+def generate_level(space_name: str, planet_index: str) -> Optional[str]:
+    """
+    Генерация уровня планеты в процессе-генераторе: то же, что делает Game.set_scene и сцена уровня при первой
+    высадке, но сохраняется только файл уровня.
+
+    :return: имя файла уровня или None, если уровень уже был
+    """
+    from scenes.game.main import MainScene  # В обход цикличеких import'ов
+    game = worker_game
+    game.file_manager.space_name = space_name
+    scene = MainScene(game, planet_index)
+    if game.file_manager.file_exists(scene.data_filename):
+        return None
+    scene.load_common_data()
+    game.random_manager.start_gameplay(scene.data_filename)
+    scene.load_player()
+    scene.initialize()
+    game.file_manager.write_data(scene.data_filename, scene.to_dict())
+    return scene.data_filename
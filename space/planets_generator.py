@@ -10,15 +10,20 @@ from drawable_objects.planet import Planet
 class PlanetsGenerator:
     """
     Генератор планет на космической карте. Собирает воедино функционал CentersArranger'а и FeaturesArranger'a.
+    Оба берут случайные числа из одного генератора, зависящего от seed космоса.
     """
 
     PLANETS_NUMBER = 20
 
     def __init__(self, controller: Controller, spacemap_scene: Scene):
-        self.__centers_arranger = CentersArranger(self.PLANETS_NUMBER)
-        self.__features_arranger = FeaturesArranger(controller, spacemap_scene)
+        generator = spacemap_scene.game.random_manager.get_generator(spacemap_scene.data_filename)
+        self.__centers_arranger = CentersArranger(self.PLANETS_NUMBER, generator)
+        self.__features_arranger = FeaturesArranger(controller, spacemap_scene, generator)
 
     def generate(self) -> List[Planet]:
+        # номера планет нужны только внутри космоса; с нуля - чтобы имена файлов уровней, а с ними и генерация
+        # уровней, не зависели от того, сколько космосов создано до этого
+        Planet.COUNTER = 0
         planets_centers = self.__centers_arranger.generate()
         planets = self.__features_arranger.generate(planets_centers)
         return planets
@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+import simulate
+from constants.grid import CELL_SIZE
+from game import Game
+from geometry.point import Point
+from utils.enemy_scheduler import EnemyScheduler
+from utils.game_data_manager import GameDataManager
+from utils.sound import SoundManager
+
+SEED = 1
+
+
+class StubEnemy:
+    def __init__(self, pos: Point, is_engaged: bool = False, is_in_vision_sector: bool = True):
+        self.pos = pos
+        self.is_engaged = is_engaged
+        self.is_in_vision_sector = is_in_vision_sector
+        self.ticks = []
+        self.vision_sectors = []
+
+    def process_logic(self, is_vision_checked: bool = True, is_suspended: bool = False,
+                      is_in_vision_sector: bool = None):
+        self.ticks.append((is_vision_checked, is_suspended))
+        self.vision_sectors.append(is_in_vision_sector)
+
+
+class StubGrid:
+    def get_index_by_pos(self, pos: Point):
+        return int(pos.y / CELL_SIZE), int(pos.x / CELL_SIZE)
+
+    def get_vision_candidates(self, enemies, radius: float) -> np.ndarray:
+        return np.array([enemy.is_in_vision_sector for enemy in enemies], dtype=bool)
+
+
+class StubPlayer:
+    def __init__(self, pos: Point):
+        self.pos = pos
+
+
+class StubScene:
+    def __init__(self):
+        self.grid = StubGrid()
+        self.player = StubPlayer(Point(0, 0))
+
+
+class FullRateScheduler:
+    """
+    Прежняя логика врагов: все враги проверяют зрение каждый тик.
+    """
+
+    def process_logic(self, enemies):
+        for enemy in enemies:
+            enemy.process_logic()
+
+
+def get_cell_pos(i: int, j: int) -> Point:
+    return Point((j + 0.5) * CELL_SIZE, (i + 0.5) * CELL_SIZE)
+
+
+class TestEnemyScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scene = StubScene()
+
+    def test_levels_of_detail(self):
+        scheduler = EnemyScheduler(self.scene, far_distance=10 * CELL_SIZE, far_vision_interval=4)
+        engaged = StubEnemy(get_cell_pos(30, 30), is_engaged=True)
+        near = StubEnemy(get_cell_pos(5, 5))
+        far = StubEnemy(get_cell_pos(0, 20))
+        suspended = StubEnemy(get_cell_pos(0, 100))
+        enemies = [engaged, near, far, suspended]
+        for tick in range(40):
+            scheduler.process_logic(enemies)
+        self.assertEqual(engaged.ticks, [(True, False)] * 40)
+        self.assertEqual(near.ticks, [(True, False)] * 40)
+        self.assertEqual(sum(is_checked for is_checked, is_suspended in far.ticks), 10)
+        self.assertFalse(any(is_suspended for is_checked, is_suspended in far.ticks))
+        self.assertEqual(suspended.ticks, [(False, True)] * 40)
+        self.assertEqual(scheduler.get_stats()['processed'], 3)
+        self.assertEqual(scheduler.get_stats()['suspended'], 1)
+
+    def test_vision_checks_are_capped(self):
+        scheduler = EnemyScheduler(self.scene, max_vision_checks=3)
+        engaged = [StubEnemy(get_cell_pos(3, i), is_engaged=True) for i in range(5)]
+        near = [StubEnemy(get_cell_pos(1, i)) for i in range(2)]
+        for tick in range(10):
+            scheduler.process_logic(near + engaged)
+            self.assertEqual(scheduler.get_stats()['vision_checks'], 3)
+            self.assertEqual(scheduler.get_stats()['vision_deferred'], 4)
+        # занятые враги проверяют зрение по очереди, до бездействующих очередь не доходит
+        for enemy in engaged:
+            self.assertEqual(sum(is_checked for is_checked, is_suspended in enemy.ticks), 6)
+        for enemy in near:
+            self.assertEqual(len(enemy.ticks), 10)
+            self.assertFalse(any(is_checked for is_checked, is_suspended in enemy.ticks))
+
+    def test_only_candidates_check_walls(self):
+        scheduler = EnemyScheduler(self.scene, max_vision_checks=3)
+        candidates = [StubEnemy(get_cell_pos(3, i), is_engaged=True) for i in range(2)]
+        others = [StubEnemy(get_cell_pos(1 + i // 10, i % 10), is_engaged=i % 2 == 0, is_in_vision_sector=False)
+                  for i in range(20)]
+        for tick in range(10):
+            scheduler.process_logic(others + candidates)
+            self.assertEqual(scheduler.get_stats()['vision_candidates'], 2)
+            self.assertEqual(scheduler.get_stats()['vision_checks'], 2)
+            self.assertEqual(scheduler.get_stats()['vision_deferred'], 0)
+        # не кандидаты не тратят проверки стен и сразу не видят игрока
+        for enemy in candidates:
+            self.assertEqual(enemy.ticks, [(True, False)] * 10)
+            self.assertEqual(enemy.vision_sectors, [True] * 10)
+        for enemy in others:
+            self.assertEqual(enemy.ticks, [(True, False)] * 10)
+            self.assertEqual(enemy.vision_sectors, [False] * 10)
+
+
+class TestEnemySchedulerInGame(unittest.TestCase):
+    def setUp(self):
+        self.storage_root = GameDataManager.STORAGE_ROOT
+        self.environ = dict(os.environ)
+
+    def tearDown(self):
+        GameDataManager.STORAGE_ROOT = self.storage_root
+        SoundManager.enabled = True
+        os.environ.clear()
+        os.environ.update(self.environ)
+
+    def play(self, create_scheduler):
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        game = Game(headless=True, seed=SEED)
+        scene = simulate.enter_level(game, planet_number=1)
+        scene.enemy_scheduler = create_scheduler(scene)
+        for tick in range(150):
+            game.simulate(1)
+        return scene
+
+    def test_suspension_does_not_change_game(self):
+        # без ограничения проверок зрения и с проверкой у дальних врагов каждый тик от прежней логики врагов
+        # может отличаться только приостановка
+        scene = self.play(lambda scene: EnemyScheduler(scene, far_vision_interval=1, max_vision_checks=10 ** 6))
+        self.assertGreater(scene.enemy_scheduler.get_stats()['suspended'], 0)
+        expected_scene = self.play(lambda scene: FullRateScheduler())
+        self.assertEqual([(enemy.pos.x, enemy.pos.y, enemy.angle, enemy.hp) for enemy in scene.enemies],
+                         [(enemy.pos.x, enemy.pos.y, enemy.angle, enemy.hp) for enemy in expected_scene.enemies])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import pstats
+import tempfile
+import unittest
+
+import pygame
+
+from utils.frame_profiler import FrameProfiler
+from utils.game_data_manager import GameDataManager
+
+
+class FakeTimer:
+    def __init__(self):
+        self.time = 0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.profiler = FrameProfiler(timer=self.timer)
+
+    def run_frame(self, grid: float, enemies: list):
+        """
+        Кадр: фаза сетки и по замеру зрения на каждого врага.
+        """
+        self.profiler.begin_frame()
+        with self.profiler.measure('logic.grid'):
+            self.timer.time += grid
+        for vision in enemies:
+            with self.profiler.measure('logic.enemies.vision'):
+                self.timer.time += vision
+        self.profiler.end_frame()
+
+    def test_disabled_measures_nothing(self):
+        self.run_frame(0.01, [0.001])
+        self.assertEqual(self.profiler.get_stats()['logic.grid'], (0, 0))
+
+    def test_average_and_worst(self):
+        self.profiler.toggle_overlay()
+        self.assertTrue(self.profiler.enabled)
+        self.run_frame(0.001, [0.001, 0.002])
+        self.run_frame(0.003, [])
+        stats = self.profiler.get_stats()
+        self.assertAlmostEqual(stats['logic.grid'][0], 2)
+        self.assertAlmostEqual(stats['logic.grid'][1], 3)
+        self.assertAlmostEqual(stats['logic.enemies.vision'][0], 1.5)
+        self.assertAlmostEqual(stats['logic.enemies.vision'][1], 3)
+        self.assertAlmostEqual(stats['frame'][1], 4)
+
+    def test_window(self):
+        self.profiler.toggle_overlay()
+        self.run_frame(1, [])
+        for frame in range(FrameProfiler.WINDOW):
+            self.run_frame(0.001, [])
+        self.assertAlmostEqual(self.profiler.get_stats()['logic.grid'][1], 1)
+
+    def test_spike_lines(self):
+        self.profiler.toggle_overlay()
+        for frame in range(10):
+            self.run_frame(0.001, [])
+        self.run_frame(0.05, [])
+        lines = self.profiler.get_lines()
+        spikes = [text for text, is_spike in lines if is_spike]
+        self.assertEqual(len(lines), len(FrameProfiler.PHASES) + 1)
+        self.assertEqual(len(spikes), 2)  # сетка и кадр целиком
+
+    def test_overlay_draw(self):
+        pygame.font.init()
+        self.profiler.toggle_overlay()
+        self.run_frame(0.001, [0.001])
+        screen = pygame.Surface((800, 600))
+        screen.fill((255, 255, 255))
+        self.profiler.draw_overlay(screen)
+        self.assertLess(screen.get_at((799, 599))[0], 255)  # правый нижний угол затемнен
+        self.assertEqual(screen.get_at((0, 0))[0], 255)
+
+    def test_cprofile_dump(self):
+        storage_root = GameDataManager.STORAGE_ROOT
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        try:
+            self.assertIsNone(self.profiler.toggle_cprofile())
+            self.assertTrue(self.profiler.is_cprofile_running())
+            sorted(range(1000))
+            path = self.profiler.toggle_cprofile()
+            self.assertFalse(self.profiler.is_cprofile_running())
+            self.assertTrue(os.path.exists(path))
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+        finally:
+            GameDataManager.STORAGE_ROOT = storage_root
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from utils.frame_scheduler import FrameScheduler
+
+
+class FakeTimer:
+    def __init__(self):
+        self.time = 0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+class TestFrameScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.scheduler = FrameScheduler(tick_rate=100, fps_cap=0, max_ticks_per_frame=5, max_frame_skip=2,
+                                        timer=self.timer)
+
+    def run_frame(self, duration: float) -> (int, bool):
+        self.timer.time += duration
+        ticks = self.scheduler.begin_frame()
+        drawn = self.scheduler.should_draw()
+        self.scheduler.end_frame()
+        return ticks, drawn
+
+    def test_first_frame_runs_one_tick(self):
+        self.assertEqual(self.scheduler.begin_frame(), 1)
+
+    def test_fixed_tick_rate(self):
+        self.run_frame(0)
+        ticks = sum(self.run_frame(0.013)[0] for frame in range(1000))
+        self.assertAlmostEqual(ticks, 1300, delta=1)
+
+    def test_small_jitter_gives_one_tick_per_frame(self):
+        self.run_frame(0)
+        for frame in range(100):
+            self.assertEqual(self.run_frame(0.0095 if frame % 2 else 0.0105)[0], 1)
+
+    def test_spiral_of_death_cap(self):
+        self.run_frame(0)
+        self.assertEqual(self.run_frame(1)[0], 5)
+        self.assertEqual(self.run_frame(0.01)[0], 1)
+
+    def test_frame_skip(self):
+        self.run_frame(0)
+        drawn = [self.run_frame(0.03)[1] for frame in range(6)]
+        self.assertEqual(drawn, [False, False, True, False, False, True])
+        self.assertTrue(self.run_frame(0.01)[1])
+
+    def test_stats(self):
+        self.run_frame(0)
+        for frame in range(FrameScheduler.REPORT_INTERVAL * 50 + 1):
+            self.run_frame(0.02)
+        stats = self.scheduler.get_stats()
+        self.assertAlmostEqual(stats['tick_rate'], 100, delta=1)
+        self.assertAlmostEqual(stats['frame_rate'], 50 / 3, delta=1)
+        self.assertFalse(self.scheduler.is_lagging())
+
+    def test_lagging(self):
+        self.run_frame(0)
+        for frame in range(FrameScheduler.REPORT_INTERVAL * 10 + 1):
+            self.run_frame(0.1)
+        self.assertTrue(self.scheduler.is_lagging())
+        self.assertGreater(self.scheduler.get_stats()['dropped_ticks'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
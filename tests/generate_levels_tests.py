@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+import generate_levels
+from game import Game
+from scenes.game.main import MainScene
+from scenes.game.spacemap import SpacemapScene
+from scenes.game.spaceship import SpaceshipScene
+from utils.game_data_manager import GameDataManager
+from utils.image import ImageManager
+from utils.sound import SoundManager
+
+SEED = 2
+
+
+class TestGenerateLevels(unittest.TestCase):
+    def setUp(self):
+        self.storage_root = GameDataManager.STORAGE_ROOT
+        self.environ = dict(os.environ)
+        ImageManager.load_all()
+
+    def tearDown(self):
+        GameDataManager.STORAGE_ROOT = self.storage_root
+        SoundManager.enabled = True
+        os.environ.clear()
+        os.environ.update(self.environ)
+
+    def test_same_level_as_in_game(self):
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        game = Game(headless=True, seed=SEED)
+        game.file_manager.space_name = 'generation'
+        game.file_manager.create_space_storage()
+        SpaceshipScene(game).construct()
+        game.set_scene(SpacemapScene(game))
+        planet = next(planet for planet in game.current_scene.planets if planet.biom != 0)
+        data_filename = MainScene.get_data_filename(planet.index)
+        game.set_scene(MainScene(game, planet.index))
+
+        output = tempfile.mkdtemp()
+        stats = generate_levels.generate_level(planet.biom, 100, 100, SEED, data_filename, output)
+        GameDataManager.STORAGE_ROOT = output
+        generated = GameDataManager().read_data(stats['file_name'], in_space=False)
+        self.assertEqual(generated, game.file_manager.read_data(data_filename))
+        self.assertEqual(stats['enemies'], len(generated['enemies']))
+
+    def test_connectivity(self):
+        stats = generate_levels.generate_level(1, 60, 40, SEED)
+        self.assertGreater(stats['rooms'], 0)
+        self.assertGreaterEqual(stats['components'], 1)
+        self.assertGreater(stats['reachable'], 0)
+        self.assertLessEqual(stats['reachable'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
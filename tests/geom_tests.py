@@ -1,10 +1,15 @@
+import random
 import unittest
+from math import pi
+
+import numpy as np
 
 from geometry.circle import Circle
 from geometry.distances import dist, dist_point_line
 from geometry.line import Line, line_from_points, point_on_line
 from geometry.point import Point, tuple_to_point, point_to_tuple
 from geometry.rectangle import Rectangle, get_rectangle_copy
+from geometry.sector import Sector, get_inside_sectors_mask
 from geometry.segment import Segment, point_on_segment
 
 
@@ -175,5 +180,25 @@ class TestRectangle(unittest.TestCase):
         self.assertFalse(self.rect.is_empty())
 
 
+class TestSector(unittest.TestCase):
+    def test_is_inside(self):
+        sector = Sector(10, Point(0, 0), 0, pi)
+        self.assertTrue(sector.is_inside(Point(5, 1)))
+        self.assertFalse(sector.is_inside(Point(-5, 1)))
+        self.assertFalse(sector.is_inside(Point(11, 0)))
+
+    def test_mask_same_as_is_inside(self):
+        random.seed(1)
+        centers = np.array([(random.uniform(0, 500), random.uniform(0, 500)) for i in range(2000)])
+        angles = np.array([random.uniform(-2 * pi, 2 * pi) for i in range(2000)])
+        for arc_angle in (pi / 2, pi):
+            p = Point(250, 250)
+            mask = get_inside_sectors_mask(centers, angles, 200, arc_angle, p)
+            expected = [Sector(200, Point(x, y), angle, arc_angle).is_inside(p)
+                        for (x, y), angle in zip(centers.tolist(), angles.tolist())]
+            self.assertEqual(mask.tolist(), expected)
+            self.assertTrue(any(expected) and not all(expected))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,107 @@
+import random
+import unittest
+
+import numpy as np
+
+from math import cos, sin, pi
+
+from benchmarks.level_stub import StubLevel
+from geometry.point import Point
+from geometry.segment import Segment
+from map.collision_grid.intersection_manager import GridIntersectionManager
+
+
+class TestGridIntersection(unittest.TestCase):
+    """
+    Проход по клеткам вдоль отрезка должен находить те же точки, что и bfs.
+    """
+
+    def setUp(self):
+        self.level = StubLevel(40, 40, seed=5)
+        self.manager = GridIntersectionManager(self.level)
+        self.size = 40 * self.level.cell_width
+        random.seed(5)
+
+    def assert_same_as_bfs(self, seg: Segment):
+        expected = self.manager.intersect_seg_walls_bfs(seg)
+        result = self.manager.intersect_seg_walls(seg)
+        if expected is None:
+            self.assertIsNone(result)
+        else:
+            self.assertIsNotNone(result)
+            self.assertEqual(result, expected)
+
+    def random_segment(self, p1: Point, angle: float) -> Segment:
+        length = random.choice([5, 30, 150, 600])
+        p2 = p1 + Point(cos(angle), sin(angle)) * length
+        p2 = Point(min(max(p2.x, 1), self.size - 1), min(max(p2.y, 1), self.size - 1))
+        return Segment(p1, p2)
+
+    def test_random_segments(self):
+        for k in range(1000):
+            p1 = Point(random.uniform(1, self.size - 1), random.uniform(1, self.size - 1))
+            self.assert_same_as_bfs(self.random_segment(p1, random.uniform(0, 2 * pi)))
+
+    def test_segments_along_grid_lines(self):
+        cell = self.level.cell_width
+        for k in range(300):
+            p1 = Point(random.randint(1, 39) * cell, random.randint(1, 39) * cell + random.choice([0, cell / 2]))
+            angle = random.choice([0, pi / 4, pi / 2, pi, 3 * pi / 2])
+            self.assert_same_as_bfs(self.random_segment(p1, angle))
+
+    def test_batch_same_as_one_by_one(self):
+        cell = self.level.cell_width
+        segments = []
+        for k in range(600):
+            p1 = Point(random.uniform(1, self.size - 1), random.uniform(1, self.size - 1))
+            segments.append(self.random_segment(p1, random.uniform(0, 2 * pi)))
+            p1 = Point(random.randint(1, 39) * cell, random.uniform(1, self.size - 1))
+            segments.append(self.random_segment(p1, random.choice([0, pi / 4, pi / 2])))
+
+        for count in (len(segments), GridIntersectionManager.VECTORIZED_MIN_COUNT - 1):
+            starts = np.array([(seg.p1.x, seg.p1.y) for seg in segments[:count]])
+            ends = np.array([(seg.p2.x, seg.p2.y) for seg in segments[:count]])
+            result = self.manager.intersect_segments_walls(starts, ends)
+            for seg, point in zip(segments, result):
+                expected = self.manager.intersect_seg_walls(seg)
+                if expected is None:
+                    self.assertIsNone(point)
+                else:
+                    self.assertEqual(point, expected)
+
+    def test_hit_point_is_on_first_wall(self):
+        # стена слева от клетки (2, 1) - вертикальная линия x = 1 * cell_width
+        self.level.arr = [[0] * 5 for i in range(5)]
+        for i in range(1, 4):
+            for j in range(1, 4):
+                self.level.arr[i][j] = 1
+        self.level.fill_passability()
+        manager = GridIntersectionManager(self.level)
+        cell = self.level.cell_width
+
+        seg = Segment(Point(2.5 * cell, 2.3 * cell), Point(-0.5 * cell, 2.3 * cell))
+        self.assertEqual(manager.intersect_seg_walls(seg), Point(cell, 2.3 * cell))
+
+        seg = Segment(Point(1.5 * cell, 1.5 * cell), Point(3.7 * cell, 3.2 * cell))
+        self.assertIsNone(manager.intersect_seg_walls(seg))
+
+    def test_first_crossing_at_corner(self):
+        # отрезок сразу проходит через угол клетки (1, 1): клетка (0, 1) справа от угла - стена
+        self.level.arr = [[1] * 3 for i in range(3)]
+        self.level.arr[0][1] = 0
+        self.level.fill_passability()
+        manager = GridIntersectionManager(self.level)
+        cell = self.level.cell_width
+        seg = Segment(Point(0.4 * cell, 0.4 * cell), Point(1.6 * cell, 1.6 * cell))
+        expected = Point(cell, cell)
+        self.assertEqual(manager.intersect_seg_walls_bfs(seg), expected)
+        self.assertEqual(manager.intersect_seg_walls(seg), expected)
+
+        count = GridIntersectionManager.VECTORIZED_MIN_COUNT
+        starts = np.array([(seg.p1.x, seg.p1.y)] * count)
+        ends = np.array([(seg.p2.x, seg.p2.y)] * count)
+        self.assertEqual(manager.intersect_segments_walls(starts, ends), [expected] * count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+import pygame
+
+from utils.image import ImageHandle, ImageManager
+
+
+class TestIsNeedAlpha(unittest.TestCase):
+
+    def test_surface_without_alpha(self):
+        self.assertFalse(ImageManager.is_need_alpha(pygame.Surface((4, 4))))
+
+    def test_opaque_surface_with_alpha_channel(self):
+        surface = pygame.Surface((4, 4), pygame.SRCALPHA)
+        surface.fill((10, 20, 30, 255))
+        self.assertFalse(ImageManager.is_need_alpha(surface))
+
+    def test_transparent_pixel(self):
+        surface = pygame.Surface((4, 4), pygame.SRCALPHA)
+        surface.fill((10, 20, 30, 255))
+        surface.set_at((2, 3), (10, 20, 30, 100))
+        self.assertTrue(ImageManager.is_need_alpha(surface))
+
+    def test_colorkey(self):
+        surface = pygame.Surface((4, 4))
+        surface.fill((255, 255, 255))
+        surface.set_at((0, 0), (0, 0, 0))
+        surface.set_colorkey((0, 0, 0))
+        self.assertTrue(ImageManager.is_need_alpha(surface))
+
+
+class TestImageHandle(unittest.TestCase):
+    NAME = 'test_handle_dir.image'
+
+    def setUp(self):
+        self.surface = pygame.Surface((6, 4))
+        ImageManager.images['test_handle_dir'] = {'image': self.surface}
+
+    def tearDown(self):
+        ImageManager.images.pop('test_handle_dir')
+        ImageManager.handles.pop(self.NAME, None)
+
+    def test_same_handle_for_name(self):
+        handle = ImageManager.get_handle(self.NAME)
+        self.assertIsInstance(handle, ImageHandle)
+        self.assertIs(handle, ImageManager.get_handle(self.NAME))
+        self.assertIs(handle, ImageManager.get_handle(handle))
+        self.assertEqual(handle.name, self.NAME)
+        self.assertIs(handle.surface, self.surface)
+
+    def test_size(self):
+        handle = ImageManager.get_handle(self.NAME)
+        self.assertEqual((handle.width, handle.height), (6, 4))
+        self.assertEqual(ImageManager.get_width(handle, 0.5), 3)
+        self.assertEqual(ImageManager.get_height(self.NAME, 2), 8)
+
+    def test_set_surface(self):
+        handle = ImageManager.get_handle(self.NAME)
+        surface = pygame.Surface((2, 3))
+        handle.set_surface(surface)
+        self.assertIs(handle.surface, surface)
+        self.assertEqual((handle.width, handle.height), (2, 3))
+
+    def test_transformed_from_cache(self):
+        handle = ImageManager.get_handle(self.NAME)
+        image = handle.get_transformed(2, 0)
+        self.assertIs(image, handle.get_transformed(2, 0))
+        self.assertIs(image, ImageManager.get_transformed_image(self.NAME, 2, 0))
+
+    def test_not_found(self):
+        with self.assertRaises(ValueError):
+            ImageManager.get_handle('test_handle_dir.missing')
+        with self.assertRaises(ValueError):
+            ImageManager.get_handle('test_handle_dir')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import tempfile
+import unittest
+
+import pygame
+
+from constants.mouse_buttons import MouseButtonID
+from controller.controller import Controller
+from controller.input_recording import InputRecord, InputRecorder, InputReplay
+from controller.scripted_controller import ScriptedController
+from geometry.point import Point
+
+
+class StubGame:
+    size = (1000, 700)
+
+
+def fighter_script(tick, controller):
+    if tick == 0:
+        controller.press_key(pygame.K_w)
+        controller.move_mouse(Point(100, 50))
+    if tick == 2:
+        controller.click(MouseButtonID.LEFT)
+        controller.press_mouse(MouseButtonID.LEFT)
+    if tick == 5:
+        controller.release_key(pygame.K_w)
+        controller.release_mouse(MouseButtonID.LEFT)
+
+
+def get_controller_state(controller):
+    return (sorted(controller.pressed_keys), controller.mouse_pos, controller.click_pos, controller.click_button,
+            controller.bumped_key, controller.is_mouse_pressed(MouseButtonID.LEFT))
+
+
+class TestInputRecording(unittest.TestCase):
+    def record(self, ticks):
+        controller = ScriptedController(StubGame(), fighter_script)
+        recorder = InputRecorder(controller, InputRecord(7, StubGame.size))
+        states = []
+        for tick in range(ticks):
+            controller.iteration()
+            recorder.record_tick()
+            states.append(get_controller_state(controller))
+        return recorder.record, states
+
+    def test_only_changes_are_stored(self):
+        record, states = self.record(10)
+        self.assertEqual(record.ticks, 10)
+        self.assertEqual([tick for tick, change in record.changes], [0, 2, 5])
+        self.assertEqual(record.changes[1][1], {'buttons': [MouseButtonID.LEFT], 'click': [100, 50, 1]})
+
+    def test_save_load(self):
+        record, states = self.record(10)
+        path = os.path.join(tempfile.mkdtemp(), 'session.rec')
+        record.save(path)
+        loaded = InputRecord.load(path)
+        self.assertEqual(loaded.to_dict(), record.to_dict())
+        self.assertEqual(loaded.size, StubGame.size)
+
+    def test_replay_repeats_states(self):
+        record, states = self.record(10)
+        replay = InputReplay(record)
+        controller = ScriptedController(StubGame(), replay)
+        replayed = []
+        for tick in range(10):
+            controller.iteration()
+            replayed.append(get_controller_state(controller))
+        self.assertEqual(replayed, states)
+        self.assertTrue(replay.is_finished)
+
+    def test_pygame_controller(self):
+        environ = dict(os.environ)
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        try:
+            pygame.display.init()
+            pygame.display.set_mode((10, 10))
+            controller = Controller(StubGame())
+            recorder = InputRecorder(controller, InputRecord(0, StubGame.size))
+            pygame.event.clear()
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode='a',
+                                                 scancode=0))
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(3, 4), button=MouseButtonID.RIGHT))
+            controller.iteration()
+            recorder.record_tick()
+            controller.iteration()
+            recorder.record_tick()
+            change = recorder.record.changes[0][1]
+            self.assertEqual(change['keys'], [pygame.K_a])
+            self.assertEqual(change['bumped'], pygame.K_a)
+            self.assertEqual(change['click'], [3, 4, MouseButtonID.RIGHT])
+            self.assertEqual(len(recorder.record.changes), 1)
+        finally:
+            pygame.display.quit()
+            os.environ.clear()
+            os.environ.update(environ)
+
+
+class TestReplayedLevel(unittest.TestCase):
+    """
+    Запись ввода и seed повторяют игру на уровне: после воспроизведения уровень в том же состоянии.
+    """
+
+    def play(self, script, recorder_factory=None):
+        import simulate
+        from game import Game
+        from utils.game_data_manager import GameDataManager
+
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        game = Game(headless=True, seed=3)
+        scene = simulate.enter_level(game, planet_number=1)
+        game.controller.script = script
+        recorder = recorder_factory(game) if recorder_factory else None
+        for tick in range(150):
+            game.simulate(1)
+            if recorder is not None:
+                recorder.record_tick()
+        state = (scene.player.pos, scene.player.hp, sorted((enemy.pos.x, enemy.pos.y) for enemy in scene.enemies),
+                 len(scene.game_objects))
+        return state, recorder
+
+    def test_replay(self):
+        import simulate
+        from utils.game_data_manager import GameDataManager
+        from utils.sound import SoundManager
+
+        storage_root = GameDataManager.STORAGE_ROOT
+        environ = dict(os.environ)
+        try:
+            state, recorder = self.play(simulate.create_fighter_script(0),
+                                        lambda game: InputRecorder(game.controller, InputRecord(3, game.size)))
+            replayed_state, _ = self.play(InputReplay(recorder.record))
+            self.assertGreater(len(recorder.record.changes), 0)
+            self.assertEqual(replayed_state, state)
+        finally:
+            GameDataManager.STORAGE_ROOT = storage_root
+            SoundManager.enabled = True
+            os.environ.clear()
+            os.environ.update(environ)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+from game import Game
+from scenes.game.main import MainScene
+from scenes.game.spacemap import SpacemapScene
+from scenes.game.spaceship import SpaceshipScene
+from space.level_pregenerator import LevelPregenerator
+from utils.game_data_manager import GameDataManager
+from utils.sound import SoundManager
+
+SEED = 2
+
+
+class TestLevelPregenerator(unittest.TestCase):
+    def setUp(self):
+        self.storage_root = GameDataManager.STORAGE_ROOT
+        self.environ = dict(os.environ)
+        self.pregenerator = None
+
+    def tearDown(self):
+        if self.pregenerator is not None:
+            self.pregenerator.shutdown()
+        GameDataManager.STORAGE_ROOT = self.storage_root
+        SoundManager.enabled = True
+        os.environ.clear()
+        os.environ.update(self.environ)
+
+    def create_space(self) -> Game:
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        game = Game(headless=True, seed=SEED)
+        game.file_manager.space_name = 'pregeneration'
+        game.file_manager.create_space_storage()
+        SpaceshipScene(game).construct()
+        game.set_scene(SpacemapScene(game))
+        return game
+
+    def test_pregenerated_level_is_the_same(self):
+        game = self.create_space()
+        planet_index = game.current_scene.planets[1].index
+        data_filename = MainScene.get_data_filename(planet_index)
+        self.pregenerator = LevelPregenerator(game, workers=1)
+        self.pregenerator.schedule([planet_index])
+        self.assertTrue(self.pregenerator.is_pending(planet_index))
+        self.pregenerator.finish(planet_index)
+        self.assertFalse(self.pregenerator.is_pending(planet_index))
+        pregenerated = game.file_manager.read_data(data_filename)
+
+        game = self.create_space()
+        game.set_scene(MainScene(game, planet_index))
+        self.assertEqual(pregenerated, game.file_manager.read_data(data_filename))
+
+    def test_queued_generation_is_cancelled(self):
+        game = self.create_space()
+        planet_indices = [planet.index for planet in game.current_scene.planets[:3]]
+        self.pregenerator = LevelPregenerator(game, workers=1)
+        self.pregenerator.schedule(planet_indices)
+        # у единственного процесса в работе первые две планеты, третья в очереди
+        self.pregenerator.finish(planet_indices[2])
+        self.assertFalse(self.pregenerator.is_pending(planet_indices[2]))
+        self.pregenerator.finish(planet_indices[0])
+        self.pregenerator.finish(planet_indices[1])
+        file_exists = [game.file_manager.file_exists(MainScene.get_data_filename(planet_index))
+                       for planet_index in planet_indices]
+        self.assertEqual(file_exists, [True, True, False])
+
+    def test_shutdown_cancels_queue(self):
+        game = self.create_space()
+        planet_indices = [planet.index for planet in game.current_scene.planets[:3]]
+        self.pregenerator = LevelPregenerator(game, workers=1)
+        self.pregenerator.schedule(planet_indices)
+        futures = list(self.pregenerator._LevelPregenerator__futures.values())
+        self.pregenerator.shutdown()
+        # у единственного процесса в работе первые две планеты, третья в очереди
+        self.assertTrue(futures[2].cancelled())
+        self.assertFalse(self.pregenerator.is_pending(planet_indices[0]))
+
+    def test_pregeneration_order(self):
+        game = self.create_space()
+        spacemap = game.current_scene
+        order = spacemap.get_pregeneration_order()
+        self.assertEqual(order[0], spacemap.current_planet.index)
+        self.assertLessEqual(len(order), SpacemapScene.PREGENERATION_PLANETS)
+        planets = {planet.index: planet for planet in spacemap.planets}
+        costs = [spacemap.travel_cost_counter.get_cost(spacemap.current_planet, planets[planet_index])
+                 for planet_index in order]
+        self.assertEqual(costs, sorted(costs))
+        self.assertTrue(all(cost <= spacemap.common_data.fuel for cost in costs))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import time
+import unittest
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+from game import Game
+from scenes.conservable import ConservableScene
+from scenes.game.main import MainScene
+from scenes.game.spacemap import SpacemapScene
+from scenes.game.spaceship import SpaceshipScene
+from scenes.loading import LoadingScene
+from utils.game_data_manager import GameDataManager
+from utils.sound import SoundManager
+
+TIMEOUT = 30
+
+
+class FailingScene(ConservableScene):
+    BUILD_IN_BACKGROUND = True
+
+    def __init__(self, game):
+        super().__init__(game, None)
+
+    def initialize(self):
+        raise ValueError('build failed')
+
+
+def wait_built(game: Game):
+    """
+    Тики логики сцены загрузки, пока она не установит построенную сцену.
+    """
+    start = time.perf_counter()
+    while isinstance(game.current_scene, LoadingScene):
+        game.current_scene.process_all_logic()
+        game.current_scene.process_all_draw()
+        if time.perf_counter() - start > TIMEOUT:
+            raise TimeoutError()
+        time.sleep(0.001)
+
+
+class TestLoadingScene(unittest.TestCase):
+    def setUp(self):
+        self.storage_root = GameDataManager.STORAGE_ROOT
+        self.environ = dict(os.environ)
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+
+    def tearDown(self):
+        GameDataManager.STORAGE_ROOT = self.storage_root
+        SoundManager.enabled = True
+        os.environ.clear()
+        os.environ.update(self.environ)
+
+    def create_space(self, game: Game) -> SpacemapScene:
+        game.file_manager.space_name = 'loading'
+        game.file_manager.create_space_storage()
+        SpaceshipScene(game).construct()
+        spacemap = SpacemapScene(game)
+        game.set_scene(spacemap)
+        return spacemap
+
+    def test_background_construction(self):
+        game = Game(seed=2)
+        spacemap = self.create_space(game)
+        self.assertIsInstance(game.current_scene, LoadingScene)
+        wait_built(game)
+        self.assertIs(game.current_scene, spacemap)
+
+        scene = MainScene(game, spacemap.planets[1].index)
+        game.set_scene(scene)
+        self.assertIsInstance(game.current_scene, LoadingScene)
+        wait_built(game)
+        self.assertIs(game.current_scene, scene)
+        self.assertGreater(len(scene.enemies), 0)
+        self.assertGreater(len(list(scene.grid.static_draw_manager.chunks.items())), 0)
+        scene.process_all_logic()
+        scene.process_all_draw()
+
+    def test_build_error_is_raised(self):
+        game = Game(seed=2)
+        game.set_scene(FailingScene(game))
+        with self.assertRaises(ValueError):
+            wait_built(game)
+
+    def test_headless_construction_is_immediate(self):
+        game = Game(headless=True, seed=2)
+        spacemap = self.create_space(game)
+        self.assertIs(game.current_scene, spacemap)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from random import Random
+
+from map.level.map_generator import LevelGenerator
+from map.level.numpy_generator import NumpyLevelGenerator
+
+SIZES = [(100, 100), (50, 75), (30, 200), (17, 17)]
+SEEDS = range(10)
+
+
+def generate(generator_class, seed: int, height: int, width: int):
+    arr = [[0] * width for i in range(height)]
+    generator = generator_class(arr, Random(seed))
+    generator.generate()
+    rectangles = [rectangle.to_dict() for rectangle in generator.rect_splitter.rectangles]
+    return arr, generator.arr_after_split, rectangles, [type(value) for row in arr for value in row[:1]]
+
+
+class TestNumpyLevelGenerator(unittest.TestCase):
+    def test_same_as_level_generator(self):
+        for height, width in SIZES:
+            for seed in SEEDS:
+                with self.subTest(seed=seed, size=(height, width)):
+                    self.assertEqual(generate(NumpyLevelGenerator, seed, height, width),
+                                     generate(LevelGenerator, seed, height, width))
+
+    def test_big_level(self):
+        expected = generate(LevelGenerator, 5, 300, 300)
+        self.assertEqual(generate(NumpyLevelGenerator, 5, 300, 300), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
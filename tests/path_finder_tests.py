@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from benchmarks.level_stub import StubLevel, StubEnemy
+from enemy_interaction_with_grid.hearing.path_finder import GridPathFinder
+
+MAX_DISTANCE = 20
+
+
+class TestIncrementalPathFinder(unittest.TestCase):
+    """
+    Поле, которое переиспользуется между тиками, должно совпадать с полем, построенным с нуля.
+    """
+
+    def setUp(self):
+        self.level = StubLevel(60, 60, seed=3)
+        self.floor = self.level.get_floor_cells()
+        random.seed(3)
+        self.level.scene.player.pos = random.choice(self.floor)
+        self.enemies = [StubEnemy(random.choice(self.floor)) for i in range(15)]
+        self.path_finder = GridPathFinder(self.level)
+
+    def tick(self) -> GridPathFinder:
+        """
+        Тик для постоянного GridPathFinder'а и для нового. Возвращает новый.
+        """
+        fresh_path_finder = GridPathFinder(self.level)
+        for path_finder in (self.path_finder, fresh_path_finder):
+            for enemy in self.enemies:
+                path_finder.save_enemy_pos(enemy.pos)
+            path_finder.update_path_to_enemies(MAX_DISTANCE)
+        return fresh_path_finder
+
+    def assert_same_field(self, fresh_path_finder: GridPathFinder):
+        for pos in self.floor:
+            probe = StubEnemy(pos)
+            self.assertEqual(self.path_finder.is_hearing_player(probe), fresh_path_finder.is_hearing_player(probe))
+            self.assertEqual(self.path_finder.get_pos_to_move(probe), fresh_path_finder.get_pos_to_move(probe))
+
+    def test_enemies_move(self):
+        """ Test player stands still, enemies move """
+        for i in range(30):
+            random.choice(self.enemies).pos = random.choice(self.floor)
+            self.assert_same_field(self.tick())
+
+    def test_player_and_enemies_move(self):
+        """ Test player moves sometimes """
+        for i in range(30):
+            if i % 5 == 0:
+                self.level.scene.player.pos = random.choice(self.floor)
+            random.choice(self.enemies).pos = random.choice(self.floor)
+            self.assert_same_field(self.tick())
+
+    def test_enemy_near_player(self):
+        """ Test enemy steps on and off the player cell """
+        player_pos = self.level.scene.player.pos
+        for i in range(6):
+            self.enemies[0].pos = player_pos if i % 2 else random.choice(self.floor)
+            self.assert_same_field(self.tick())
+
+
+if __name__ == '__main__':
+    unittest.main()
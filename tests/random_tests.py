@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+from random import Random
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+from map.level.map_generator import LevelGenerator
+from utils.random import RandomManager, shuffle, weight_choice
+
+
+class TestRandomManager(unittest.TestCase):
+    def test_generation_depends_on_seed_and_keys(self):
+        manager = RandomManager()
+        manager.seed = 7
+        first = manager.get_generator('planet1').random()
+        manager.get_generator('planet2').random()
+        self.assertEqual(manager.get_generator('planet1').random(), first)
+        self.assertNotEqual(manager.get_generator('planet2').random(), first)
+        manager.seed = 8
+        self.assertNotEqual(manager.get_generator('planet1').random(), first)
+
+    def test_gameplay_restarts(self):
+        manager = RandomManager()
+        manager.seed = 7
+        manager.start_gameplay('planet1')
+        first = [manager.gameplay.random() for i in range(5)]
+        manager.start_gameplay('planet1')
+        self.assertEqual([manager.gameplay.random() for i in range(5)], first)
+
+    def test_space_seed(self):
+        self.assertEqual(RandomManager(42).create_space_seed(), 42)
+        self.assertLess(RandomManager().create_space_seed(), RandomManager.SEED_LIMIT)
+
+    def test_helpers_use_generator(self):
+        arr = list(range(20))
+        shuffle(Random(1), arr)
+        other = list(range(20))
+        shuffle(Random(1), other)
+        self.assertEqual(arr, other)
+        choices = [(50, 'a'), (50, 'b')]
+        generator, other_generator = Random(2), Random(2)
+        self.assertEqual([weight_choice(generator, choices) for i in range(20)],
+                         [weight_choice(other_generator, choices) for i in range(20)])
+
+
+class TestDeterministicGeneration(unittest.TestCase):
+    @staticmethod
+    def generate(seed: int):
+        arr = [[0] * 80 for i in range(60)]
+        generator = LevelGenerator(arr, Random(seed))
+        generator.generate()
+        return arr, [rectangle.to_dict() for rectangle in generator.rect_splitter.rectangles]
+
+    def test_same_seed_same_level(self):
+        self.assertEqual(self.generate(3), self.generate(3))
+        self.assertNotEqual(self.generate(3)[0], self.generate(4)[0])
+
+
+class TestDeterministicLevel(unittest.TestCase):
+    """
+    Два безоконных запуска с одним seed дают одинаковый уровень и одинаковое поведение врагов.
+    """
+
+    @staticmethod
+    def run_level(seed: int):
+        import simulate
+        from game import Game
+
+        game = Game(headless=True, seed=seed)
+        scene = simulate.enter_level(game, planet_number=1)
+        arr = [bytes(row) for row in scene.grid.arr]
+        game.simulate(120)
+        enemies = [(enemy.pos.x, enemy.pos.y, enemy.angle) for enemy in scene.enemies]
+        return arr, enemies
+
+    def test_same_seed_same_level(self):
+        from utils.game_data_manager import GameDataManager
+        from utils.sound import SoundManager
+
+        storage_root = GameDataManager.STORAGE_ROOT
+        environ = dict(os.environ)
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        try:
+            self.assertEqual(self.run_level(5), self.run_level(5))
+        finally:
+            GameDataManager.STORAGE_ROOT = storage_root
+            SoundManager.enabled = True
+            os.environ.clear()
+            os.environ.update(environ)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import random
+import tempfile
+import unittest
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+import simulate
+from constants.grid import CELL_SIZE
+from drawable_objects.enemy import CommandHumanoid
+from enemy_interaction_with_grid.vision.room.visibility import RoomsVisibility
+from game import Game
+from geometry.optimized.segment import StaticSegment
+from geometry.point import Point
+from map.collision_grid.collision_grid import CollisionGrid
+from map.level.grid import LevelGrid
+from map.level.rect.splitter import GridRectangle, SplitNode
+from utils.game_data_manager import GameDataManager
+from utils.sound import SoundManager
+
+SEED = 1
+ROOMS = [GridRectangle((0, 0), (6, 6)), GridRectangle((0, 6), (6, 12))]
+
+
+def create_grid(door_rows) -> CollisionGrid:
+    """
+    Две комнаты 5x5 рядом, стена между ними - столбец 6, в строках door_rows в ней проходы.
+    """
+    arr = [[0] * 13 for i in range(7)]
+    for i in range(1, 6):
+        for j in range(1, 12):
+            arr[i][j] = 0 if j == 6 and i not in door_rows else 1
+    grid = CollisionGrid(None, None, Point(0, 0))
+    grid.arr = arr
+    grid._arr_initialize(CELL_SIZE, CELL_SIZE)
+    grid.transform_ints_to_tiles()
+    return grid
+
+
+class TestRoomsVisibility(unittest.TestCase):
+    def test_wall_between_rooms(self):
+        expected = {(): RoomsVisibility.HIDDEN,
+                    (3,): RoomsVisibility.PARTIAL,
+                    (1, 2, 3, 4, 5): RoomsVisibility.VISIBLE}
+        for door_rows, visibility in expected.items():
+            grid = create_grid(door_rows)
+            rooms_visibility = RoomsVisibility(ROOMS, SplitNode.from_rectangles(ROOMS), grid, 100 * CELL_SIZE)
+            expected_table = [[0, 0, RoomsVisibility.VISIBLE], [0, 1, visibility], [1, 1, RoomsVisibility.VISIBLE]]
+            # пары PARTIAL не хранятся
+            self.assertEqual(rooms_visibility.table,
+                             [pair for pair in expected_table if pair[2] != RoomsVisibility.PARTIAL])
+            self.assertEqual(rooms_visibility.get_visibility(grid.get_center_of_cell_by_indexes(2, 2),
+                                                             grid.get_center_of_cell_by_indexes(4, 10)), visibility)
+            # клетки краев комнат в таблицу не входят
+            self.assertEqual(rooms_visibility.get_visibility(grid.get_center_of_cell_by_indexes(3, 6),
+                                                             grid.get_center_of_cell_by_indexes(4, 10)),
+                             RoomsVisibility.PARTIAL)
+
+    def test_far_rooms_are_not_computed(self):
+        grid = create_grid(())
+        rooms_visibility = RoomsVisibility(ROOMS, SplitNode.from_rectangles(ROOMS), grid, CELL_SIZE / 2)
+        self.assertEqual(rooms_visibility.table, [[0, 0, RoomsVisibility.VISIBLE], [1, 1, RoomsVisibility.VISIBLE]])
+        self.assertEqual(rooms_visibility.get_visibility(grid.get_center_of_cell_by_indexes(2, 2),
+                                                         grid.get_center_of_cell_by_indexes(4, 10)),
+                         RoomsVisibility.PARTIAL)
+
+
+class TestLevelRoomsVisibility(unittest.TestCase):
+    def setUp(self):
+        self.storage_root = GameDataManager.STORAGE_ROOT
+        self.environ = dict(os.environ)
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        self.game = Game(headless=True, seed=SEED)
+        self.scene = simulate.enter_level(self.game, planet_number=1)
+
+    def tearDown(self):
+        GameDataManager.STORAGE_ROOT = self.storage_root
+        SoundManager.enabled = True
+        os.environ.clear()
+        os.environ.update(self.environ)
+
+    def test_same_as_rooms_graph(self):
+        grid = self.scene.grid
+        vision_manager = grid.enemy_interaction_manager._GridInteractionWithEnemyManager__vision_manager
+        random.seed(SEED)
+        cells = [(i, j) for i in range(len(grid.arr)) for j in range(len(grid.arr[0])) if grid.is_passable(i, j)]
+        half = CELL_SIZE / 2 - 1
+        found = 0
+        for k in range(3000):
+            p1, p2 = [grid.get_center_of_cell_by_indexes(*random.choice(cells)) +
+                      Point(random.uniform(-half, half), random.uniform(-half, half)) for point in range(2)]
+            visibility = vision_manager.rooms_visibility.get_visibility(p1, p2)
+            if visibility == RoomsVisibility.PARTIAL:
+                continue
+            found += 1
+            is_intersect = vision_manager.rooms_graph.is_seg_intersect_wall(StaticSegment(p1, p2))
+            self.assertEqual(visibility == RoomsVisibility.HIDDEN, is_intersect)
+        self.assertGreater(found, 0)
+
+    def test_set_cell_updates_enemy_data(self):
+        grid = self.scene.grid
+        vision_manager = grid.enemy_interaction_manager._GridInteractionWithEnemyManager__vision_manager
+        rooms_visibility = vision_manager.rooms_visibility
+        # клетка внутри комнаты, вокруг которой один пол: враг может в ней стоять, а комната видна сама из себя
+        i, j = next((i, j) for i in range(2, len(grid.arr) - 2) for j in range(2, len(grid.arr[0]) - 2)
+                    if all(grid.is_passable(i + di, j + dj) for di in range(-2, 3) for dj in range(-2, 3)) and
+                    rooms_visibility.get_visibility(grid.get_center_of_cell_by_indexes(i - 1, j),
+                                                    grid.get_center_of_cell_by_indexes(i + 1, j)) ==
+                    RoomsVisibility.VISIBLE)
+        p1 = grid.get_center_of_cell_by_indexes(i - 1, j)
+        p2 = grid.get_center_of_cell_by_indexes(i + 1, j)
+        self.assertTrue(grid.is_enemy_can_stay(i, j))
+        self.assertFalse(vision_manager.rooms_graph.is_seg_intersect_wall(StaticSegment(p1, p2)))
+
+        grid.set_cell(i, j, 0)
+        self.assertFalse(grid.is_enemy_can_stay(i, j))
+        self.assertFalse(grid.is_enemy_can_stay(i + 1, j + 1))
+        self.assertTrue(vision_manager.rooms_graph.is_seg_intersect_wall(StaticSegment(p1, p2)))
+        self.assertNotEqual(rooms_visibility.get_visibility(p1, p2), RoomsVisibility.VISIBLE)
+        # таблица такая же, как посчитанная заново
+        rectangles = []
+        for item in grid.to_dict()['room_rectangles']:
+            rectangle = GridRectangle((0, 0), (0, 0))
+            rectangle.from_dict(item)
+            rectangles.append(rectangle)
+        expected = RoomsVisibility(rectangles, SplitNode.from_rectangles(rectangles), grid,
+                                   CommandHumanoid.VISION_RADIUS)
+        self.assertEqual(rooms_visibility.table, expected.table)
+
+        grid.set_cell(i, j, 1)
+        self.assertTrue(grid.is_enemy_can_stay(i, j))
+        self.assertFalse(vision_manager.rooms_graph.is_seg_intersect_wall(StaticSegment(p1, p2)))
+
+    def test_table_is_saved(self):
+        self.scene.save()
+        data = self.game.file_manager.read_data(self.scene.data_filename)
+        table = self.scene.grid.enemy_interaction_manager.get_rooms_visibility_table()
+        self.assertEqual(data['grid']['rooms_visibility_pairs'], table)
+        self.assertNotIn(RoomsVisibility.PARTIAL, [visibility for index1, index2, visibility in table])
+
+        # при загрузке таблица берется из сохранения, а не считается заново
+        grid_data = self.scene.grid.to_dict()
+        grid_data['rooms_visibility_pairs'] = table[:1]
+        grid = LevelGrid(self.scene, self.game.controller, Point(0, 0))
+        grid.from_dict(grid_data)
+        self.assertEqual(grid.enemy_interaction_manager.get_rooms_visibility_table(), table[:1])
+
+        # в старых сохранениях пар нет, а есть полная таблица
+        del grid_data['rooms_visibility_pairs']
+        grid_data['rooms_visibility'] = [[RoomsVisibility.PARTIAL] * len(table) for pair in table]
+        grid.from_dict(grid_data)
+        self.assertEqual(grid.enemy_interaction_manager.get_rooms_visibility_table(), table)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import unittest
+
+from benchmarks.scenarios import SEED, SaveLoadScenario, compare, get_percentile
+from scenes.game.main import MainScene
+from utils.game_data_manager import GameDataManager
+from utils.sound import SoundManager
+
+
+def result(median: float, p95: float):
+    return {'median_ms': median, 'p95_ms': p95}
+
+
+class TestScenariosCompare(unittest.TestCase):
+    def test_percentile(self):
+        times = [float(i) for i in range(100, 0, -1)]
+        self.assertEqual(get_percentile(times, 0.5), 51)
+        self.assertEqual(get_percentile(times, 0.95), 96)
+        self.assertEqual(get_percentile([3.0], 0.95), 3)
+
+    def test_regressions(self):
+        baseline = {'a': result(10, 20), 'b': result(10, 20)}
+        results = {'a': result(11, 21), 'b': result(10, 30), 'new': result(1, 1)}
+        regressions = compare(results, baseline, 0.15)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('b: p95_ms'))
+        self.assertEqual(compare(results, baseline, 0.6), [])
+
+
+class TestSaveLoadScenario(unittest.TestCase):
+    def setUp(self):
+        self.storage_root = GameDataManager.STORAGE_ROOT
+        self.environ = dict(os.environ)
+
+    def tearDown(self):
+        GameDataManager.STORAGE_ROOT = self.storage_root
+        SoundManager.enabled = True
+        os.environ.clear()
+        os.environ.update(self.environ)
+
+    def test_every_planet_is_saved_in_setup(self):
+        # замеряется загрузка уровней, а не их генерация
+        scenario = SaveLoadScenario(SEED)
+        scenario.setup()
+        game = scenario.game
+        self.assertGreater(len(scenario.planet_indexes), 1)
+        for index in scenario.planet_indexes:
+            self.assertTrue(game.file_manager.file_exists(MainScene(game, index).data_filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
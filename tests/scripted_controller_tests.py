@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+import pygame
+
+from constants.mouse_buttons import MouseButtonID
+from controller.scripted_controller import ScriptedController
+from geometry.point import Point
+
+
+class StubGame:
+    pass
+
+
+class TestScriptedController(unittest.TestCase):
+    def test_single_events_reset_each_tick(self):
+        def script(tick, controller):
+            if tick == 0:
+                controller.press_key(pygame.K_w)
+                controller.click(MouseButtonID.LEFT, Point(10, 20))
+
+        controller = ScriptedController(StubGame(), script)
+        controller.iteration()
+        self.assertEqual(controller.bumped_key, pygame.K_w)
+        self.assertEqual(controller.click_button, MouseButtonID.LEFT)
+        self.assertEqual(controller.click_pos, Point(10, 20))
+        controller.iteration()
+        self.assertIsNone(controller.bumped_key)
+        self.assertIsNone(controller.click_button)
+        self.assertIsNone(controller.click_pos)
+        self.assertTrue(controller.is_key_pressed(pygame.K_w))
+        self.assertEqual(controller.get_mouse_pos(), Point(10, 20))
+        self.assertEqual(controller.tick, 2)
+
+    def test_held_buttons(self):
+        controller = ScriptedController(StubGame())
+        controller.press_mouse(MouseButtonID.LEFT)
+        controller.iteration()
+        self.assertTrue(controller.is_mouse_pressed(MouseButtonID.LEFT))
+        controller.release_mouse(MouseButtonID.LEFT)
+        controller.release_key(pygame.K_w)
+        self.assertFalse(controller.is_mouse_pressed(MouseButtonID.LEFT))
+        self.assertFalse(controller.is_key_pressed(pygame.K_w))
+
+
+class TestHeadlessSimulation(unittest.TestCase):
+    """
+    Уровень планеты запускается без окна и живет несколько секунд игрового времени.
+    """
+
+    def test_level_runs(self):
+        import simulate
+        from game import Game
+        from scenes.game.level import LevelScene
+        from utils.game_data_manager import GameDataManager
+        from utils.sound import SoundManager
+
+        storage_root = GameDataManager.STORAGE_ROOT
+        environ = dict(os.environ)
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        try:
+            game = Game(headless=True)
+            scene = simulate.enter_level(game, planet_number=1)
+            game.controller.script = simulate.create_fighter_script(0)
+            elapsed = game.simulate(120)
+            self.assertIsInstance(game.current_scene, LevelScene)
+            self.assertIs(game.current_scene, scene)
+            self.assertEqual(game.controller.tick, 120)
+            self.assertGreater(elapsed, 0)
+        finally:
+            GameDataManager.STORAGE_ROOT = storage_root
+            SoundManager.enabled = True
+            os.environ.clear()
+            os.environ.update(environ)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import unittest
+
+from random import Random
+
+from map.level.rect.splitter import GridRectangle, RectSplitter, SplitNode
+
+# прямоугольники рекурсивного разбиения 30x40 с Random(1)
+EXPECTED_RECTANGLES = [((0, 0), (9, 11)), ((9, 0), (18, 11)), ((0, 11), (9, 27)), ((0, 27), (9, 39)),
+                       ((9, 11), (18, 27)), ((9, 27), (18, 39)), ((18, 0), (29, 15)), ((18, 15), (29, 29)),
+                       ((18, 29), (29, 39))]
+
+
+def split(height: int, width: int, seed: int, min_area: int = 100, min_size: int = 8) -> RectSplitter:
+    arr = [[0] * width for i in range(height)]
+    splitter = RectSplitter(arr, Random(seed), min_area, min_size, min_size)
+    splitter.start_random_split()
+    return splitter
+
+
+class TestRectSplitter(unittest.TestCase):
+    def test_same_rectangles_as_recursive_split(self):
+        splitter = split(30, 40, 1)
+        self.assertEqual([(rectangle.left_top_index, rectangle.bottom_right_index)
+                          for rectangle in splitter.rectangles], EXPECTED_RECTANGLES)
+
+    def test_deep_split_without_recursion(self):
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(50)
+        try:
+            splitter = split(300, 300, 2, min_area=4, min_size=1)
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertGreater(len(splitter.rectangles), 1000)
+
+    def test_tree(self):
+        splitter = split(60, 80, 3)
+        tree = splitter.tree
+        self.assertEqual([leaf.rectangle for leaf in tree.get_leaves()], splitter.rectangles)
+        self.assertEqual([leaf.color for leaf in tree.get_leaves()], list(range(1, len(splitter.rectangles) + 1)))
+        for i in range(len(splitter.arr)):
+            for j in range(len(splitter.arr[0])):
+                self.assertEqual(tree.get_color(i, j), splitter.arr[i][j])
+        self.assertIsNone(tree.get_node(60, 0))
+        wall_node = tree.get_node(*[tree.position if axis == tree.axis else 5 for axis in range(2)])
+        self.assertIs(wall_node, tree)
+
+    def test_tree_from_rectangles(self):
+        splitter = split(60, 80, 3)
+        tree = SplitNode.from_rectangles(splitter.rectangles)
+        self.assertEqual([leaf.rectangle for leaf in tree.get_leaves()], splitter.rectangles)
+        self.assertEqual([leaf.color for leaf in tree.get_leaves()], list(range(1, len(splitter.rectangles) + 1)))
+        for i in range(len(splitter.arr)):
+            for j in range(len(splitter.arr[0])):
+                self.assertEqual(tree.get_color(i, j), splitter.arr[i][j])
+        with self.assertRaises(ValueError):
+            SplitNode.from_rectangles([GridRectangle((0, 0), (5, 5)), GridRectangle((3, 3), (8, 8))])
+
+    def test_leaves_intersecting(self):
+        splitter = split(60, 80, 3)
+        query = GridRectangle((10, 10), (30, 25))
+        expected = [rectangle for rectangle in splitter.rectangles
+                    if not (rectangle.right_index < 10 or rectangle.left_index > 25 or
+                            rectangle.bottom_index < 10 or rectangle.top_index > 30)]
+        self.assertEqual([leaf.rectangle for leaf in splitter.tree.get_leaves_intersecting(query)], expected)
+        self.assertEqual(SplitNode(query).get_leaves_intersecting(query)[0].rectangle, query)
+
+
+if __name__ == '__main__':
+    unittest.main()
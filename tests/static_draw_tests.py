@@ -0,0 +1,185 @@
+import shutil
+import tempfile
+import unittest
+
+import pygame
+
+from geometry.point import Point
+from map.collision_grid.draw_static_manager import GridDrawStaticManager
+from map.collision_grid.static_layer_storage import StaticLayerStorage
+from utils.game_data_manager import GameDataManager
+from utils.image import ImageManager
+from utils.transform_cache import get_surface_bytes
+
+
+class StubGame:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+
+class StubScene:
+    def __init__(self, width: int, height: int):
+        self.game = StubGame(width, height)
+        self.relative_center = Point(0, 0)
+        self.screen = pygame.Surface((width, height))
+
+    @property
+    def width(self) -> int:
+        return self.game.width
+
+    @property
+    def height(self) -> int:
+        return self.game.height
+
+
+class StubGrid:
+    """
+    Сетка 30x20 из клеток 10x10 в шахматном порядке с двумя картинками.
+    """
+    PALETTE = ['test_static_draw.dark', 'test_static_draw.light']
+
+    def __init__(self, scene: StubScene):
+        self.scene = scene
+        self.controller = None
+        self.pos = Point(0, 0)
+        self.cell_width = 10
+        self.cell_height = 10
+        self.arr = [bytearray((i + j) % 2 for j in range(30)) for i in range(20)]
+        self.width = 300
+        self.height = 200
+
+    def _get_tile_palette(self):
+        return self.PALETTE
+
+    def get_tile_image_name(self, i: int, j: int) -> str:
+        return self.PALETTE[self.arr[i][j]]
+
+    def get_center_of_cell_by_indexes(self, i: int, j: int) -> Point:
+        return Point(j * 10 + 5, i * 10 + 5)
+
+
+class TestGridDrawStaticManager(unittest.TestCase):
+
+    def setUp(self):
+        dark = pygame.Surface((10, 10))
+        dark.fill((20, 20, 20))
+        light = pygame.Surface((10, 10))
+        light.fill((200, 100, 0))
+        ImageManager.images['test_static_draw'] = {'dark': dark, 'light': light}
+        self.scene = StubScene(100, 60)
+        self.grid = StubGrid(self.scene)
+        self.manager = GridDrawStaticManager(self.grid)
+
+    def tearDown(self):
+        ImageManager.images.pop('test_static_draw')
+        for name in StubGrid.PALETTE:
+            ImageManager.handles.pop(name, None)
+
+    def render_all(self) -> pygame.Surface:
+        res = pygame.Surface((self.grid.width + self.manager.cell_width, self.grid.height + self.manager.cell_height))
+        for i in range(len(self.grid.arr)):
+            for j in range(len(self.grid.arr[i])):
+                ImageManager.process_draw(self.grid.get_tile_image_name(i, j),
+                                          self.grid.get_center_of_cell_by_indexes(i, j), res, 1, 0)
+        return res
+
+    def assert_chunks_as_full_render(self):
+        full = self.render_all()
+        width, height = self.manager.cell_width, self.manager.cell_height
+        for i in range(len(self.manager.arr)):
+            for j in range(len(self.manager.arr[i])):
+                expected = full.subsurface((j * width, i * height, width, height))
+                chunk = self.manager.render_chunk(i, j)
+                self.assertEqual(pygame.image.tostring(chunk, 'RGB'), pygame.image.tostring(expected, 'RGB'))
+
+    def test_nothing_is_rendered_before_draw(self):
+        self.assertEqual(len(self.manager.chunks), 0)
+        self.assertEqual((self.manager.cell_width, self.manager.cell_height), (50, 30))
+
+    def test_chunks_as_full_render(self):
+        self.assert_chunks_as_full_render()
+
+    def test_draw_renders_chunks_on_screen(self):
+        self.manager.process_draw()
+        self.assertIn((0, 0), self.manager.chunks)
+        self.assertIn((1, 1), self.manager.chunks)
+        self.assertNotIn((5, 5), self.manager.chunks)
+        self.assertEqual(self.scene.screen.get_at((0, 0)), pygame.Color(20, 20, 20))
+        self.assertEqual(self.scene.screen.get_at((15, 5)), pygame.Color(200, 100, 0))
+
+    def test_memory_is_bounded(self):
+        chunk_bytes = get_surface_bytes(self.manager.render_chunk(0, 0))
+        self.manager.chunks.max_bytes = chunk_bytes * 12
+        for k in range(20):
+            self.scene.relative_center = Point(k * 10, k * 7)
+            self.manager.process_draw()
+        self.assertLessEqual(self.manager.chunks.bytes, chunk_bytes * 12)
+        self.assertNotIn((0, 0), self.manager.chunks)
+
+    def test_resize(self):
+        self.manager.process_draw()
+        self.scene.game.width, self.scene.game.height = 60, 40
+        self.scene.screen = pygame.Surface((60, 40))
+        self.manager.process_draw()
+        self.assertEqual((self.manager.cell_width, self.manager.cell_height), (30, 20))
+        self.assertEqual((len(self.manager.arr), len(self.manager.arr[0])), (10, 10))
+        self.assert_chunks_as_full_render()
+
+    def test_invalidate_cell(self):
+        self.manager.process_draw()
+        self.grid.arr[1][2] = 0
+        self.manager.invalidate_cell(1, 2)
+        self.assertNotIn((0, 0), self.manager.chunks)
+        self.assert_chunks_as_full_render()
+
+
+class TestStaticLayerStorage(TestGridDrawStaticManager):
+
+    def setUp(self):
+        super().setUp()
+        self.storage_root = GameDataManager.STORAGE_ROOT
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        self.file_manager = GameDataManager()
+        self.file_manager.space_name = 'test'
+        self.file_manager.create_space_storage()
+        self.manager = self.create_manager()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(GameDataManager.STORAGE_ROOT)
+        GameDataManager.STORAGE_ROOT = self.storage_root
+
+    def create_manager(self) -> GridDrawStaticManager:
+        return GridDrawStaticManager(self.grid, storage=StaticLayerStorage(self.file_manager, 'level'))
+
+    def test_chunks_are_loaded_from_disk(self):
+        self.manager.process_draw()
+        self.manager.save_chunks()
+        saved = [key for key, surface in self.manager.chunks.items()]
+
+        manager = self.create_manager()
+        for i, j in saved:
+            self.assertTrue(manager.storage.is_saved(i, j))
+            loaded = manager.storage.load(i, j, (manager.cell_width, manager.cell_height))
+            self.assertEqual(pygame.image.tostring(loaded, 'RGB'),
+                             pygame.image.tostring(manager.render_chunk(i, j), 'RGB'))
+
+    def test_changed_cells_invalidate_disk(self):
+        self.manager.process_draw()
+        self.manager.save_chunks()
+        self.grid.arr[1][2] = 0
+        manager = self.create_manager()
+        self.assertFalse(manager.storage.is_saved(0, 0))
+        self.assertEqual(self.file_manager.get_file_names('level' + StaticLayerStorage.DIR_SUFFIX), [])
+
+    def test_changed_image_invalidates_disk(self):
+        self.manager.process_draw()
+        self.manager.save_chunks()
+        ImageManager.get_handle('test_static_draw.dark').surface.fill((0, 0, 200))
+        manager = self.create_manager()
+        self.assertFalse(manager.storage.is_saved(0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from math import pi
+
+import pygame
+
+from utils.transform_cache import TransformCache, get_surface_bytes
+
+
+class TestTransformCache(unittest.TestCase):
+
+    def setUp(self):
+        self.surface = pygame.Surface((10, 10), pygame.SRCALPHA)
+        self.surface_bytes = get_surface_bytes(self.surface)
+        self.cache = TransformCache(angle_steps=8, max_bytes=self.surface_bytes * 3)
+
+    def test_quantize_angle(self):
+        self.assertEqual(self.cache.quantize_angle(0), 0)
+        self.assertEqual(self.cache.quantize_angle(pi / 4 + 0.1), 1)
+        self.assertEqual(self.cache.quantize_angle(2 * pi - 0.1), 0)
+        self.assertEqual(self.cache.quantize_angle(-pi / 2), 6)
+        self.assertAlmostEqual(self.cache.get_angle(2), pi / 2)
+
+    def test_hits_and_misses(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.put('a', self.surface)
+        self.assertIs(self.cache.get('a'), self.surface)
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['bytes'], self.surface_bytes)
+
+    def test_least_recently_used_is_evicted(self):
+        for key in 'abc':
+            self.cache.put(key, self.surface.copy())
+        self.cache.get('a')
+        self.cache.put('d', self.surface.copy())
+
+        self.assertIsNone(self.cache.get('b'))
+        for key in 'acd':
+            self.assertIsNotNone(self.cache.get(key))
+        self.assertEqual(self.cache.get_stats()['evictions'], 1)
+        self.assertLessEqual(self.cache.bytes, self.cache.max_bytes)
+
+    def test_too_big_surface_is_not_stored(self):
+        self.cache.put('a', pygame.Surface((100, 100), pygame.SRCALPHA))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_configure_clears_cache(self):
+        self.cache.put('a', self.surface)
+        self.cache.configure(angle_steps=16)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.quantize_angle(pi / 8), 1)
+
+    def test_pop(self):
+        self.cache.put('a', self.surface)
+        self.assertIn('a', self.cache)
+        self.cache.pop('a')
+        self.cache.pop('b')
+        self.assertNotIn('a', self.cache)
+        self.assertEqual(self.cache.bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import unittest
+
+from benchmarks.level_stub import StubLevel
+from constants.grid import CELL_SIZE
+from geometry.point import Point
+from map.collision_grid.collision_grid import CollisionGrid
+from map.collision_grid.wall_mesh import GridWallMesh, mesh_walls
+
+RING = [[0, 0, 0, 0, 0],
+        [0, 1, 1, 1, 0],
+        [0, 1, 1, 1, 0],
+        [0, 1, 1, 1, 0],
+        [0, 0, 0, 0, 0]]
+
+
+def get_covering(rectangles, width: int, height: int):
+    covering = [[0] * width for i in range(height)]
+    for top, left, bottom, right in rectangles:
+        for i in range(top, bottom + 1):
+            for j in range(left, right + 1):
+                covering[i][j] += 1
+    return covering
+
+
+class TestMeshWalls(unittest.TestCase):
+    def test_walls_covered_once(self):
+        level = StubLevel(60, 40, seed=3)
+        rectangles = mesh_walls(level.passability, 60, 0, 0, 39, 59)
+        covering = get_covering(rectangles, 60, 40)
+        for i in range(40):
+            for j in range(60):
+                self.assertEqual(covering[i][j], 0 if level.is_passable(i, j) else 1)
+        walls = len(level.passability) - sum(level.passability)
+        self.assertLess(len(rectangles), walls / 5)
+
+    def test_region(self):
+        level = StubLevel(60, 40, seed=3)
+        rectangles = mesh_walls(level.passability, 60, 5, 7, 20, 30)
+        covering = get_covering(rectangles, 60, 40)
+        for i in range(40):
+            for j in range(60):
+                inside = 5 <= i <= 20 and 7 <= j <= 30
+                self.assertEqual(covering[i][j], 1 if inside and not level.is_passable(i, j) else 0)
+
+    def test_straight_walls(self):
+        level = StubLevel(5, 5)
+        level.arr = [list(row) for row in RING]
+        level.fill_passability()
+        self.assertEqual(mesh_walls(level.passability, 5, 0, 0, 4, 4),
+                         [(0, 0, 0, 4), (1, 0, 4, 0), (1, 4, 4, 4), (4, 1, 4, 3)])
+
+
+class TestGridWallMesh(unittest.TestCase):
+    def test_rects_nearby(self):
+        level = StubLevel(50, 50, seed=4)
+        mesh = GridWallMesh(level)
+        random.seed(4)
+        for k in range(200):
+            center_i, center_j = random.randrange(50), random.randrange(50)
+            expected = set()
+            for rect_id, (top, left, bottom, right) in enumerate(mesh.rectangles):
+                if top <= center_i + 2 and center_i - 2 <= bottom and left <= center_j + 2 and center_j - 2 <= right:
+                    expected.add(rect_id)
+            found = mesh.get_rects_nearby(center_i, center_j, 2)
+            self.assertEqual(len(found), len(expected))
+            self.assertEqual({id(rect) for rect in found}, {id(mesh.collision_rects[i]) for i in expected})
+
+    def test_collision_grid_rebuilds_after_set_cell(self):
+        grid = CollisionGrid(None, None, Point(0, 0))
+        grid.arr = [list(row) for row in RING]
+        grid._arr_initialize(CELL_SIZE, CELL_SIZE)
+        grid.transform_ints_to_tiles()
+        self.assertEqual(len(grid.wall_mesh.rectangles), 4)
+        center = grid.get_center_of_cell_by_indexes(2, 2)
+        self.assertEqual(len(grid.get_collision_rects_nearby(center)), 4)
+        rect = grid.get_collision_rects_nearby(grid.get_center_of_cell_by_indexes(0, 2))[0]
+        self.assertEqual((rect.left, rect.top, rect.right, rect.bottom), (0, 0, 5 * CELL_SIZE, CELL_SIZE))
+        grid.set_cell(2, 2, 0)
+        self.assertEqual(len(grid.wall_mesh.rectangles), 5)
+
+    def test_is_passable_out_of_grid(self):
+        grid = CollisionGrid(None, None, Point(0, 0))
+        grid.arr = [list(row) for row in RING]
+        grid._arr_initialize(CELL_SIZE, CELL_SIZE)
+        grid.transform_ints_to_tiles()
+        self.assertTrue(grid.is_passable(1, 3))
+        # j за краем не переходит в соседнюю строку
+        for i, j in ((1, 5), (1, -1), (5, 1), (-1, 1)):
+            with self.assertRaises(IndexError):
+                grid.is_passable(i, j)
+
+
+if __name__ == '__main__':
+    unittest.main()
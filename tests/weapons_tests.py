@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+import weapons.weapons  # не удалять: без этого import drawable_objects.enemy ломается на цикле
+
+import simulate
+from drawable_objects.drop.chest_drop import create_drop
+from game import Game
+from utils.game_data_manager import GameDataManager
+from utils.sound import SoundManager
+from weapons.weapons import WEAPON_ON_FLOOR_IMAGE, WEAPON_VOCABULARY, weapon_to_dict
+
+SEED = 1
+
+
+class TestWeapons(unittest.TestCase):
+    def setUp(self):
+        self.storage_root = GameDataManager.STORAGE_ROOT
+        self.environ = dict(os.environ)
+        GameDataManager.STORAGE_ROOT = tempfile.mkdtemp()
+        self.game = Game(headless=True, seed=SEED)
+        self.scene = simulate.enter_level(self.game, planet_number=1)
+
+    def tearDown(self):
+        GameDataManager.STORAGE_ROOT = self.storage_root
+        SoundManager.enabled = True
+        os.environ.clear()
+        os.environ.update(self.environ)
+
+    def test_every_weapon_can_be_created(self):
+        # картинка оружия ищется сразу при создании, даже если оружие в руках и не рисуется
+        owners = [self.scene.player] + self.scene.enemies[:1]
+        for name, weapon_class in WEAPON_VOCABULARY.items():
+            for owner in owners:
+                with self.subTest(weapon=name, owner=owner.__class__.__name__):
+                    weapon = weapon_class(owner)
+                    self.assertEqual(weapon_to_dict(weapon)['weapon'], name)
+
+    def test_every_weapon_drop_can_be_created(self):
+        player = self.scene.player
+        for name in WEAPON_ON_FLOOR_IMAGE:
+            with self.subTest(weapon=name):
+                drop = create_drop(name, self.scene, self.game.controller, player.pos)
+                self.assertEqual(drop.to_dict()['weapon'], name)
+                player.set_weapon(weapon_to_dict(WEAPON_VOCABULARY[name](player)))
+                self.assertIsInstance(player.weapon, WEAPON_VOCABULARY[name])
+
+
+if __name__ == '__main__':
+    unittest.main()
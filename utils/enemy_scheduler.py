@@ -0,0 +1,138 @@
+"""
+Планирование логики врагов по расстоянию до игрока
+"""
+from math import ceil
+from typing import Dict, List
+
+from constants.grid import CELL_SIZE
+from geometry.vector import length_squared
+
+
+class EnemyScheduler:
+    """
+    Планировщик логики врагов уровня (уровни детализации). Логика каждого врага идет каждый тик, но дорогая ее
+    часть - проверка зрения (пересечение отрезка со стенами) - выполняется не у всех.
+
+    Бездействующий враг, от которого игрок дальше слышимости и видимости (по клеткам), приостанавливается: он не
+    может ни увидеть, ни услышать игрока, поэтому зрение, слух и команды у него не выполняются вовсе.
+
+    Остальные враги проверяют зрение:
+
+    - враг, занятый игроком (is_engaged: агрессивен, выполняет команду, услышал выстрел), - каждый тик;
+    - бездействующий враг ближе far_distance к игроку - тоже каждый тик;
+    - бездействующий враг дальше far_distance - раз в far_vision_interval тиков.
+
+    У всех, кому пора проверять зрение, разом проверяется, в секторе ли обзора игрок
+    (LevelGrid.get_vision_candidates, один проход NumPy). Кто не видит игрока по сектору, сразу его не видит.
+    Стены проверяются только у кандидатов, так что время зрения за тик растет с числом врагов рядом с игроком,
+    а не со всеми врагами уровня.
+
+    Всего за тик стены проверяются не больше max_vision_checks раз: сначала у занятых врагов, потом у ближних,
+    потом у дальних; в каждой группе - у тех, кто дольше не проверял. Остальные оставляют результат прошлой
+    проверки и проверяют в следующие тики. Поворот бездействующих врагов и таймеры идут каждый тик у всех, так
+    что поворот выглядит непрерывным.
+
+    Сколько врагов обработано за последний тик, показывает get_stats.
+
+    :param scene: сцена уровня
+    :param far_distance: расстояние до игрока, дальше которого бездействующий враг проверяет зрение реже
+    :param far_vision_interval: раз во сколько тиков проверяет зрение дальний бездействующий враг
+    :param max_vision_checks: наибольшее число проверок стен за тик
+    """
+    FAR_DISTANCE = 12 * CELL_SIZE
+    FAR_VISION_INTERVAL = 6
+    MAX_VISION_CHECKS = 24
+
+    def __init__(self, scene, far_distance: float = FAR_DISTANCE, far_vision_interval: int = FAR_VISION_INTERVAL,
+                 max_vision_checks: int = MAX_VISION_CHECKS):
+        self.__scene = scene
+        self.far_distance = far_distance
+        self.far_vision_interval = far_vision_interval
+        self.max_vision_checks = max_vision_checks
+        self.__tick = 0
+        self.__last_vision_tick = dict()
+        self.__stats = {
+            'enemies': 0,
+            'processed': 0,
+            'suspended': 0,
+            'vision_candidates': 0,
+            'vision_checks': 0,
+            'vision_deferred': 0,
+        }
+
+    def process_logic(self, enemies: List):
+        """
+        Тик логики всех врагов (в порядке списка).
+        """
+        from drawable_objects.enemy import CommandHumanoid  # В обход цикличеких import'ов
+        self.__tick += 1
+        tick = self.__tick
+        grid = self.__scene.grid
+        player_pos = self.__scene.player.pos
+        player_i, player_j = grid.get_index_by_pos(player_pos)
+        # дальше этого числа клеток враг не услышит игрока (поиск пути идет по соседним клеткам) и не увидит его
+        suspend_range = max(CommandHumanoid.HEARING_RANGE, ceil(CommandHumanoid.VISION_RADIUS / CELL_SIZE))
+        far_distance_squared = self.far_distance * self.far_distance
+
+        last_vision_tick = dict()
+        groups = ([], [], [])  # занятые, ближние, дальние
+        suspended = set()
+        for enemy in enemies:
+            # новые враги проверяют зрение вразнобой, а не все в один тик
+            last_tick, order = self.__last_vision_tick.get(
+                enemy, (tick - 1 - len(last_vision_tick) % self.far_vision_interval, 0))
+            last_vision_tick[enemy] = last_tick, order
+            if enemy.is_engaged:
+                groups[0].append(enemy)
+                continue
+            i, j = grid.get_index_by_pos(enemy.pos)
+            if max(abs(i - player_i), abs(j - player_j)) > suspend_range:
+                suspended.add(enemy)
+            elif length_squared(enemy.pos - player_pos) <= far_distance_squared:
+                groups[1].append(enemy)
+            elif tick - last_tick >= self.far_vision_interval:
+                groups[2].append(enemy)
+
+        # сектор обзора проверяется сразу у всех, кому пора проверять зрение; кто не видит игрока по сектору, не
+        # тратит проверку стен
+        due = [enemy for group in groups for enemy in group]
+        is_in_vision_sector = dict(zip(due, grid.get_vision_candidates(due, CommandHumanoid.VISION_RADIUS).tolist()))
+        for enemy in due:
+            if not is_in_vision_sector[enemy]:
+                last_vision_tick[enemy] = tick, 0
+        groups = [[enemy for enemy in group if is_in_vision_sector[enemy]] for group in groups]
+
+        checked = set()
+        for group in groups:
+            group.sort(key=lambda item: last_vision_tick[item])
+            for enemy in group[:self.max_vision_checks - len(checked)]:
+                # при равном тике раньше пойдет тот, кто раньше проверял в нем: очередь по кругу
+                last_vision_tick[enemy] = tick, len(checked)
+                checked.add(enemy)
+        self.__last_vision_tick = last_vision_tick
+
+        for enemy in enemies:
+            if enemy in suspended:
+                enemy.process_logic(False, True)
+            elif enemy in is_in_vision_sector:
+                enemy.process_logic(enemy in checked or not is_in_vision_sector[enemy], False,
+                                    is_in_vision_sector[enemy])
+            else:
+                enemy.process_logic(False, False)
+
+        self.__stats = {
+            'enemies': len(enemies),
+            'processed': len(enemies) - len(suspended),
+            'suspended': len(suspended),
+            'vision_candidates': sum(is_in_vision_sector.values()),
+            'vision_checks': len(checked),
+            'vision_deferred': sum(len(group) for group in groups) - len(checked),
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Статистика последнего тика: всего врагов, обработанных (не приостановленных), приостановленных,
+        кандидатов в видящие игрока по сектору обзора, проверок стен и проверок, отложенных из-за
+        max_vision_checks.
+        """
+        return dict(self.__stats)
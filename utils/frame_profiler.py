@@ -0,0 +1,186 @@
+"""
+Профилировщик кадров по подсистемам
+"""
+import cProfile
+import os
+import time
+
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pygame
+
+from constants.color import COLOR
+from utils.font import FontManager
+from utils.game_data_manager import GameDataManager
+
+
+class FrameProfiler:
+    """
+    Профилировщик кадров: сколько времени за кадр занимает каждая фаза логики и отрисовки (PHASES). Время фазы
+    за кадр - сумма по всем ее замерам в кадре (тиков логики за кадр может быть несколько, враги замеряются
+    каждый по отдельности). По последним WINDOW кадрам считаются среднее и худший кадр (get_stats).
+
+    Замеры идут, только когда профилировщик включен (enabled); выключенный стоит одну проверку на замер.
+    Включается вместе с показом статистики поверх экрана (toggle_overlay).
+
+    Отдельно можно записать профиль cProfile всех функций (toggle_cprofile): первый вызов начинает запись,
+    второй заканчивает и сохраняет ее в файл .prof в папке PROFILES_DIR хранилища игры. Файл читается pstats,
+    snakeviz, flameprof (flamegraph).
+
+    :param timer: функция текущего времени в секундах
+    """
+    WINDOW = 120
+    PHASES = [
+        ('logic.grid', 'сетка (поиск пути)'),
+        ('logic.tragectories', 'траектории'),
+        ('logic.objects', 'игровые объекты'),
+        ('logic.enemies', 'враги'),
+        ('logic.enemies.vision', '  зрение'),
+        ('logic.enemies.command', '  команды'),
+        ('logic.player', 'игрок'),
+        ('draw.grid', 'отрисовка сетки'),
+        ('draw.objects', 'отрисовка объектов'),
+        ('draw.interface', 'отрисовка интерфейса'),
+        ('frame', 'кадр целиком'),
+    ]
+    PROFILES_DIR = 'profiles'
+
+    FONT_NAME = 'consolas'
+    FONT_SIZE = 14
+    TEXT_COLOR = COLOR['WHITE']
+    SPIKE_COLOR = COLOR['RED']
+    SPIKE_RATIO = 2  # худший кадр фазы выделяется, если он во столько раз дольше среднего
+    BACKGROUND_COLOR = COLOR['BLACK']
+    BACKGROUND_ALPHA = 180
+    INDENT = 5
+
+    def __init__(self, timer: Callable[[], float] = perf_counter):
+        self.enabled = False
+        self.overlay_shown = False
+        self.__timer = timer
+        self.__phase_names = [phase for phase, title in self.PHASES]
+        self.__frame_times = {phase: 0.0 for phase in self.__phase_names}
+        self.__history = {phase: deque(maxlen=self.WINDOW) for phase in self.__phase_names}
+        self.__frame_start = None
+        self.__null_context = nullcontext()
+        self.__cprofile = None
+        self.__font = None
+
+    @contextmanager
+    def __measure(self, phase: str):
+        start = self.__timer()
+        yield
+        self.__frame_times[phase] += self.__timer() - start
+
+    def measure(self, phase: str):
+        """
+        Замер фазы: with profiler.measure('logic.grid'): ...
+        """
+        if self.enabled:
+            return self.__measure(phase)
+        return self.__null_context
+
+    def begin_frame(self):
+        if self.enabled:
+            self.__frame_start = self.__timer()
+
+    def end_frame(self):
+        """
+        Конец кадра: времена фаз за кадр уходят в историю.
+        """
+        if not self.enabled or self.__frame_start is None:
+            return
+        self.__frame_times['frame'] = self.__timer() - self.__frame_start
+        for phase in self.__phase_names:
+            self.__history[phase].append(self.__frame_times[phase])
+            self.__frame_times[phase] = 0.0
+
+    def reset(self):
+        """
+        Забыть историю, например, при смене сцены.
+        """
+        for phase in self.__phase_names:
+            self.__history[phase].clear()
+            self.__frame_times[phase] = 0.0
+        self.__frame_start = None
+
+    def get_stats(self) -> Dict[str, Tuple[float, float]]:
+        """
+        :return: для каждой фазы (среднее, худший кадр) в миллисекундах по последним WINDOW кадрам
+        """
+        result = {}
+        for phase in self.__phase_names:
+            history = self.__history[phase]
+            if history:
+                result[phase] = (sum(history) / len(history) * 1000, max(history) * 1000)
+            else:
+                result[phase] = (0.0, 0.0)
+        return result
+
+    def get_lines(self) -> List[Tuple[str, bool]]:
+        """
+        Строки статистики для показа и выделены ли они (худший кадр намного дольше среднего).
+        """
+        stats = self.get_stats()
+        lines = [('{:<22}{:>8}{:>8}'.format('фаза, мс', 'среднее', 'худший'), False)]
+        for phase, title in self.PHASES:
+            average, worst = stats[phase]
+            is_spike = worst > average * self.SPIKE_RATIO and worst > 1
+            lines.append(('{:<22}{:>8.2f}{:>8.2f}'.format(title, average, worst), is_spike))
+        if self.is_cprofile_running():
+            lines.append(('запись cProfile...', True))
+        return lines
+
+    def toggle_overlay(self):
+        """
+        Показать или скрыть статистику; профилировщик включается и выключается вместе с ней.
+        """
+        self.overlay_shown = not self.overlay_shown
+        self.enabled = self.overlay_shown
+        self.reset()
+
+    def draw_overlay(self, screen: pygame.Surface):
+        if not self.overlay_shown:
+            return
+        if self.__font is None:
+            self.__font = FontManager.get_font(self.FONT_NAME, self.FONT_SIZE)
+        rendered = [self.__font.render(text, True, self.SPIKE_COLOR if is_spike else self.TEXT_COLOR)
+                    for text, is_spike in self.get_lines()]
+        width = max(surface.get_width() for surface in rendered) + 2 * self.INDENT
+        height = sum(surface.get_height() for surface in rendered) + 2 * self.INDENT
+        background = pygame.Surface((width, height))
+        background.set_alpha(self.BACKGROUND_ALPHA)
+        background.fill(self.BACKGROUND_COLOR)
+        # в правом нижнем углу: сверху справа показатели уровня
+        left = screen.get_width() - width
+        top = screen.get_height() - height
+        screen.blit(background, (left, top))
+        top += self.INDENT
+        for surface in rendered:
+            screen.blit(surface, (left + self.INDENT, top))
+            top += surface.get_height()
+
+    def is_cprofile_running(self) -> bool:
+        return self.__cprofile is not None
+
+    def toggle_cprofile(self) -> Optional[str]:
+        """
+        Начать или закончить запись cProfile.
+
+        :return: путь к сохраненному файлу, если запись закончена, иначе None
+        """
+        if self.__cprofile is None:
+            self.__cprofile = cProfile.Profile()
+            self.__cprofile.enable()
+            return None
+        self.__cprofile.disable()
+        profiles_dir = os.path.join(GameDataManager.STORAGE_ROOT, self.PROFILES_DIR)
+        if not os.path.exists(profiles_dir):
+            os.makedirs(profiles_dir)
+        path = os.path.join(profiles_dir, time.strftime('profile_%Y%m%d_%H%M%S.prof'))
+        self.__cprofile.dump_stats(path)
+        self.__cprofile = None
+        return path
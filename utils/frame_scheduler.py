@@ -0,0 +1,150 @@
+"""
+Планирование тиков логики и кадров отрисовки главного цикла
+"""
+from time import perf_counter
+from typing import Callable, Dict
+
+import pygame
+
+
+class FrameScheduler:
+    """
+    Планировщик главного цикла. Логика идет фиксированными тиками: tick_rate тиков в секунду независимо от
+    того, сколько времени занимает отрисовка. Время, прошедшее с прошлого кадра, копится, и за кадр выполняется
+    столько тиков, сколько в нем поместилось; остаток переходит на следующий кадр.
+
+    Если машина не успевает, тиков за кадр становится все больше, а кадры от этого - все дольше. Поэтому за кадр
+    выполняется не больше max_ticks_per_frame тиков, остальные отбрасываются (игра замедляется, но не
+    зависает). При отставании можно пропускать отрисовку: не больше max_frame_skip кадров подряд.
+
+    Частота кадров ограничивается fps_cap через pygame.time.Clock (0 - без ограничения).
+
+    Достигнутые частоты тиков и кадров считаются за каждые REPORT_INTERVAL секунд (get_stats).
+
+    Использование за один кадр: begin_frame (сколько тиков выполнить), should_draw, end_frame.
+
+    :param tick_rate: тиков логики в секунду
+    :param fps_cap: наибольшее число кадров в секунду (0 - без ограничения)
+    :param max_ticks_per_frame: наибольшее число тиков за кадр
+    :param max_frame_skip: сколько кадров подряд можно не рисовать при отставании (0 - рисовать всегда)
+    :param timer: функция текущего времени в секундах
+    """
+    TICK_RATE = 60
+    FPS_CAP = 60
+    MAX_TICKS_PER_FRAME = 5
+    MAX_FRAME_SKIP = 0
+    REPORT_INTERVAL = 5
+    LAG_THRESHOLD = 0.95  # доля tick_rate, ниже которой считается, что машина не успевает
+    # доля тика, на которую можно выполнить тик раньше времени: кадры, ограниченные fps_cap, приходят
+    # с небольшим разбросом, и без запаса тиков за кадр было бы то 0, то 2 вместо 1
+    TICK_TOLERANCE = 0.25
+
+    def __init__(self, tick_rate: int = TICK_RATE, fps_cap: int = FPS_CAP,
+                 max_ticks_per_frame: int = MAX_TICKS_PER_FRAME, max_frame_skip: int = MAX_FRAME_SKIP,
+                 timer: Callable[[], float] = perf_counter):
+        self.tick_rate = tick_rate
+        self.tick_duration = 1 / tick_rate
+        self.fps_cap = fps_cap
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.max_frame_skip = max_frame_skip
+        self.__timer = timer
+        self.__clock = pygame.time.Clock()
+        self.__ticks_this_frame = 0
+        self.__skipped_in_row = 0
+        self.__stats = {
+            'tick_rate': 0,
+            'frame_rate': 0,
+            'dropped_ticks': 0,
+            'skipped_frames': 0,
+        }
+        self.reset()
+
+    def reset(self):
+        """
+        Начать отсчет времени заново, например, после долгой загрузки сцены, чтобы ее время не догонялось
+        тиками. Следующий кадр выполнит один тик.
+        """
+        self.__last_time = self.__timer()
+        self.__accumulator = self.tick_duration
+        self.__reset_window()
+
+    def __reset_window(self):
+        self.__window_start = self.__timer()
+        self.__window_ticks = 0
+        self.__window_frames = 0
+        self.__window_dropped = 0
+        self.__window_skipped = 0
+
+    def begin_frame(self) -> int:
+        """
+        Начало кадра.
+
+        :return: сколько тиков логики выполнить в этом кадре
+        """
+        now = self.__timer()
+        self.__accumulator += now - self.__last_time
+        self.__last_time = now
+
+        ticks = int(self.__accumulator / self.tick_duration + self.TICK_TOLERANCE)
+        if ticks > self.max_ticks_per_frame:
+            self.__window_dropped += ticks - self.max_ticks_per_frame
+            ticks = self.max_ticks_per_frame
+            self.__accumulator = ticks * self.tick_duration
+        self.__accumulator -= ticks * self.tick_duration
+        self.__ticks_this_frame = ticks
+        self.__window_ticks += ticks
+        return ticks
+
+    def should_draw(self) -> bool:
+        """
+        Рисовать ли этот кадр. Кадр пропускается, если за него понадобилось больше одного тика (логика
+        отстает) и подряд пропущено меньше max_frame_skip кадров.
+        """
+        if self.__ticks_this_frame > 1 and self.__skipped_in_row < self.max_frame_skip:
+            self.__skipped_in_row += 1
+            self.__window_skipped += 1
+            return False
+        self.__skipped_in_row = 0
+        self.__window_frames += 1
+        return True
+
+    def end_frame(self) -> bool:
+        """
+        Конец кадра: ожидание, чтобы частота кадров не превышала fps_cap.
+
+        :return: обновилась ли статистика (прошло REPORT_INTERVAL секунд)
+        """
+        self.__clock.tick(self.fps_cap)
+        elapsed = self.__timer() - self.__window_start
+        if elapsed < self.REPORT_INTERVAL:
+            return False
+        self.__stats = {
+            'tick_rate': self.__window_ticks / elapsed,
+            'frame_rate': self.__window_frames / elapsed,
+            'dropped_ticks': self.__window_dropped,
+            'skipped_frames': self.__window_skipped,
+        }
+        self.__reset_window()
+        return True
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Статистика за последние REPORT_INTERVAL секунд: тиков и нарисованных кадров в секунду, отброшенных
+        тиков и пропущенных кадров.
+        """
+        return dict(self.__stats)
+
+    def is_lagging(self) -> bool:
+        """
+        Не успевает ли машина выполнять tick_rate тиков в секунду.
+        """
+        return self.__stats['tick_rate'] < self.tick_rate * self.LAG_THRESHOLD
+
+    def get_report(self) -> str:
+        """
+        Статистика одной строкой.
+        """
+        stats = self.__stats
+        return 'frame scheduler: {:.1f}/{} ticks/s, {:.1f} frames/s, {} ticks dropped, {} frames skipped'.format(
+            stats['tick_rate'], self.tick_rate, stats['frame_rate'], stats['dropped_ticks'],
+            stats['skipped_frames'])
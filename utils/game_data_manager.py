@@ -62,13 +62,53 @@ class GameDataManager:
 
     def write_data(self, file_name: str, data_dict: Dict, in_space: bool = True):
         """
-        Запись словаря в файл в формате json.
+        Запись словаря в файл в формате json. Файл пишется под временным именем и потом заменяет старый, поэтому
+        читающий его (в том числе другой процесс, см. LevelPregenerator) никогда не видит его недописанным.
         """
         data_str = json.dumps(data_dict, sort_keys=True, indent=2)
         file_path = self.__get_file_path(file_name, in_space)
-        file = open(file_path, 'w')
+        temp_path = '{}.{}.tmp'.format(file_path, os.getpid())
+        file = open(temp_path, 'w')
         file.write(data_str)
         file.close()
+        os.replace(temp_path, file_path)
+
+    def __get_dir_path(self, dir_name: str) -> str:
+        return os.path.join(self.__space_path, dir_name)
+
+    def write_bytes(self, dir_name: str, file_name: str, data: bytes):
+        """
+        Запись двоичных данных в файл в папке хранилища космоса. Папка создается, если ее нет.
+        """
+        dir_path = self.__get_dir_path(dir_name)
+        if not os.path.exists(dir_path):
+            os.mkdir(dir_path)
+        file = open(os.path.join(dir_path, file_name), 'wb')
+        file.write(data)
+        file.close()
+
+    def read_bytes(self, dir_name: str, file_name: str) -> bytes:
+        """
+        Чтение двоичных данных из файла в папке хранилища космоса.
+        """
+        file = open(os.path.join(self.__get_dir_path(dir_name), file_name), 'rb')
+        data = file.read()
+        file.close()
+        return data
+
+    def get_file_names(self, dir_name: str) -> List[str]:
+        """
+        Имена файлов в папке хранилища космоса; если папки нет, список пустой.
+        """
+        dir_path = self.__get_dir_path(dir_name)
+        if not os.path.isdir(dir_path):
+            return []
+        return os.listdir(dir_path)
+
+    def delete_file(self, dir_name: str, file_name: str):
+        file_path = os.path.join(self.__get_dir_path(dir_name), file_name)
+        if os.path.exists(file_path):
+            os.remove(file_path)
 
     def get_all_space_names(self) -> List[str]:
         files_and_folders = os.listdir(self.STORAGE_ROOT)
@@ -5,8 +5,54 @@ import os
 
 import pygame
 from math import degrees
+from typing import Union
 from geometry.point import Point
 from geometry.rectangle import intersect, Rectangle
+from utils.transform_cache import TransformCache
+
+
+class ImageHandle:
+    """
+    Картинка, найденная по имени один раз: хранит поверхность и ее размеры, а увеличенные и повернутые версии
+    берет из ImageManager.transform_cache. Сами объекты не создаются, их выдает ImageManager.get_handle, поэтому на
+    одно имя приходится один handle. При перезагрузке или переводе картинок в формат окна поверхность в handle'е
+    подменяется, так что хранить его можно сколько угодно.
+
+    :param name: название картинки (путь до нее)
+    :param surface: сама картинка
+    """
+
+    def __init__(self, name: str, surface: pygame.Surface):
+        self.name = name
+        self.set_surface(surface)
+
+    def set_surface(self, surface: pygame.Surface):
+        self.surface = surface
+        self.width, self.height = surface.get_size()
+
+    def get_transformed(self, resize_percents: float, rotate_angle: float,
+                        rotate_offset: list = None) -> pygame.Surface:
+        """
+        Увеличенная и повернутая картинка из transform_cache. При промахе считается через resize и rotate.
+
+        :param resize_percents: доля исходного размера
+        :param rotate_angle: угол поворота, округляется до шага кэша
+        :param rotate_offset: оффсет относительно центра для точки поворота
+        """
+        cache = ImageManager.transform_cache
+        angle_index = cache.quantize_angle(rotate_angle or 0)
+        key = (self, resize_percents, angle_index, tuple(rotate_offset) if rotate_offset else None)
+        image = cache.get(key)
+        if image is not None:
+            return image
+
+        image = ImageManager.resize(self.surface, resize_percents)
+        image = ImageManager.rotate(image, cache.get_angle(angle_index), rotate_offset)
+        cache.put(key, image)
+        return image
+
+    def __repr__(self) -> str:
+        return 'ImageHandle({})'.format(self.name)
 
 
 class ImageManager:
@@ -14,9 +60,22 @@ class ImageManager:
     """
     Загружает все картинки и осуществляет быстрый доступ к ним а так же работу с ними
     Возможна рекурсивная загруска всех png картинок
+
+    Увеличенные и повернутые картинки хранятся в transform_cache, поэтому в process_draw угол поворота
+    округляется до шага кэша (TransformCache.ANGLE_STEPS).
+
+    После создания окна картинки переводятся в формат пикселей экрана (convert_all), иначе этот перевод
+    делается заново при каждом blit'е и повороте.
+
+    Везде, где нужна картинка, можно передать как ее название, так и ImageHandle (get_handle). Handle находит
+    картинку по пути один раз, поэтому в отрисовке каждый кадр лучше передавать его.
     """
     images = {}  # получить по ключу pygame картинку
     IMAGE_PATH = 'images'
+    transform_cache = TransformCache()
+    # загруженные картинки в исходном формате и нужна ли им прозрачность: {путь через точку: (картинка, bool)}
+    source_images = {}
+    handles = {}  # {путь через точку: ImageHandle}
 
     @staticmethod
     def load_all():
@@ -24,6 +83,34 @@ class ImageManager:
         по умолчанию считает, что все картинки png.
         """
         ImageManager.load_dir(ImageManager.IMAGE_PATH)
+        ImageManager.convert_all()
+
+    @staticmethod
+    def convert_all():
+        """
+        Перевод всех картинок в формат пикселей окна: convert_alpha для картинок, в которых есть
+        непрозрачные не все пиксели, convert для остальных. Переводятся исходные картинки, поэтому вызывать
+        можно сколько угодно раз, например, после пересоздания окна. Без окна ничего не делает.
+        """
+        if pygame.display.get_surface() is None:
+            return
+        for path, (image, is_need_alpha) in ImageManager.source_images.items():
+            directory, name = path.rsplit('.', 1) if '.' in path else ('', path)
+            image = image.convert_alpha() if is_need_alpha else image.convert()
+            ImageManager.get_image(directory)[name] = image
+            if path in ImageManager.handles:
+                ImageManager.handles[path].set_surface(image)
+        ImageManager.transform_cache.clear()
+
+    @staticmethod
+    def is_need_alpha(image: pygame.Surface) -> bool:
+        """
+        Есть ли в картинке не полностью непрозрачные пиксели.
+        """
+        if not image.get_flags() & pygame.SRCALPHA and image.get_colorkey() is None:
+            return False
+        w, h = image.get_size()
+        return pygame.mask.from_surface(image, 254).count() != w * h
 
     @staticmethod
     def load_dir(directory: str):
@@ -42,7 +129,31 @@ class ImageManager:
             elif '.png' in item:
                 manager_dir = ImageManager.get_image(short_dir, os.sep)
                 item = item.replace('.png', '')
-                manager_dir[item] = pygame.image.load(full_item)
+                image = pygame.image.load(full_item)
+                manager_dir[item] = image
+                path = '.'.join(short_dir.split(os.sep) + [item]) if short_dir else item
+                ImageManager.source_images[path] = (image, ImageManager.is_need_alpha(image))
+                if path in ImageManager.handles:
+                    ImageManager.handles[path].set_surface(image)
+                    ImageManager.transform_cache.clear()
+
+    @staticmethod
+    def get_handle(image: Union[str, ImageHandle]) -> ImageHandle:
+        """
+        Handle картинки. Путь разбирается только при первом запросе, дальше handle берется из handles.
+
+        :param image: название картинки (путь до нее) или уже готовый handle
+        """
+        if isinstance(image, ImageHandle):
+            return image
+        handle = ImageManager.handles.get(image)
+        if handle is None:
+            surface = ImageManager.get_image(image)
+            if isinstance(surface, dict):
+                raise ValueError(image + ' is a dir, not a file')
+            handle = ImageHandle(image, surface)
+            ImageManager.handles[image] = handle
+        return handle
 
     @staticmethod
     def get_image(path: str, delimiter: str = '.'):
@@ -74,16 +185,24 @@ class ImageManager:
         screen.blit(surface, rect)
 
     @staticmethod
-    def process_draw(img_str: str, pos_center: Point, screen,
+    def process_draw(image: Union[str, ImageHandle], pos_center: Point, screen,
                      resize_percents: float, rotate_angle: float, rotate_offset: list = None):
-        image = ImageManager.get_image(img_str)
-        if isinstance(image, dict):
-            raise ValueError(img_str + ' is a dir, not a file')
-        image = ImageManager.resize(image, resize_percents)
-        image = ImageManager.rotate(image, rotate_angle, rotate_offset)
-
+        image = ImageManager.get_handle(image).get_transformed(resize_percents, rotate_angle, rotate_offset)
         ImageManager.draw_surface(image, pos_center, screen)
 
+    @staticmethod
+    def get_transformed_image(image: Union[str, ImageHandle], resize_percents: float, rotate_angle: float,
+                              rotate_offset: list = None) -> pygame.Surface:
+        """
+        Увеличенная и повернутая картинка из transform_cache (см. ImageHandle.get_transformed).
+
+        :param image: название картинки (путь до нее) или ее handle
+        :param resize_percents: доля исходного размера
+        :param rotate_angle: угол поворота, округляется до шага кэша
+        :param rotate_offset: оффсет относительно центра для точки поворота
+        """
+        return ImageManager.get_handle(image).get_transformed(resize_percents, rotate_angle, rotate_offset)
+
     @staticmethod
     def resize(image: pygame.Surface, percents: float) -> pygame.Surface:
         """
@@ -121,7 +240,7 @@ class ImageManager:
         return pygame.transform.rotate(img, degrees(angle))
 
     @staticmethod
-    def is_out_of_screen(image_name: str, zoom: float,
+    def is_out_of_screen(image: Union[str, ImageHandle], zoom: float,
                          relative_pos: Point, screen_rectangle: Rectangle):
         """
         relative_pos - координаты относительно центра экрана.
@@ -129,39 +248,32 @@ class ImageManager:
         если прямоугольник картинки не пересекается с прямоугольником экрана(и не находится
         внутри), то картинка все экрана.
         :param screen_rectangle: прямоугольник, задающий размеры экрана
-        :param image_name: название картинки (путь до нее)
+        :param image: название картинки (путь до нее) или ее handle
         :param zoom: во сколько раз увеличить картинку, если нужно
         :param relative_pos: позиция относительно окна
         :return:
         """
-        w = ImageManager.get_width(image_name, zoom)
-        h = ImageManager.get_height(image_name, zoom)
-        rectangle = Rectangle(0, 0, w, h)
+        handle = ImageManager.get_handle(image)
+        rectangle = Rectangle(0, 0, handle.width * zoom, handle.height * zoom)
         rectangle.center = relative_pos
         return intersect(rectangle, screen_rectangle).is_empty()
 
     @staticmethod
-    def get_width(image_str: str, percents: float) -> float:
+    def get_width(image: Union[str, ImageHandle], percents: float) -> float:
         """
         Получить длинну изображения
-        :param image_str: название картинки (путь до нее)
+        :param image: название картинки (путь до нее) или ее handle
         :param percents: во сколько раз увеличить картинку, если нужно
         :return: длинна изображения
         """
-        image = ImageManager.get_image(image_str)
-        if isinstance(image, dict):
-            raise ValueError(image_str + ' is a dir, not a file')
-        return image.get_width() * percents
+        return ImageManager.get_handle(image).width * percents
 
     @staticmethod
-    def get_height(image_str: str, percents: float) -> float:
+    def get_height(image: Union[str, ImageHandle], percents: float) -> float:
         """
         Получить высоту изображения
-        :param image_str: название картинки (путь до нее)
+        :param image: название картинки (путь до нее) или ее handle
         :param percents: во сколько раз увеличить картинку, если нужно
         :return: высота изображения
         """
-        image = ImageManager.get_image(image_str)
-        if isinstance(image, dict):
-            raise ValueError(image_str + ' is a dir, not a file')
-        return image.get_height() * percents
+        return ImageManager.get_handle(image).height * percents
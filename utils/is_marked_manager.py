@@ -56,6 +56,13 @@ class IsMarkedManagerAbstract:
         """
         self._set_by_indexes(self._mark_counter, *indexes)
 
+    def unmark(self, *indexes):
+        """
+        Снять отметку со значения в текущей итерации. Нужно, когда часть результата откатывается назад.
+        Обычно 0(1) памяти
+        """
+        self._set_by_indexes(0, *indexes)
+
     def is_marked(self, *indexes) -> bool:
         """
         Ответить на запрос. Местонахождение определяется по indexes.
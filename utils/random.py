@@ -1,24 +1,68 @@
-from typing import List, Tuple
-from random import randint
-from random import random
+from typing import List, Tuple, Optional
+from random import Random, SystemRandom
 
 
-def is_random_proc(chance: int = 50) -> bool:
+class RandomManager:
+    """
+    Генераторы случайных чисел игры. Все случайное в игре зависит только от seed космоса (хранится в
+    CommonGameData), поэтому при том же seed уровень генерируется тем же самым, а враги ведут себя так же.
+
+    Потоков два. Генерационный (get_generator) - отдельный генератор на каждую генерацию: уровня, карты космоса;
+    он зависит от seed и ключа (например, имени файла сцены), а не от того, что генерировалось раньше. Игровой
+    (gameplay) - поведение врагов, разброс пуль, частицы, дроп; он заново начинается (start_gameplay) при каждом
+    конструировании игровой сцены.
+
+    :param space_seed: seed новых космосов; None - для каждого нового космоса случайный
+    """
+    SEED_LIMIT = 2 ** 32
+
+    def __init__(self, space_seed: Optional[int] = None):
+        self.space_seed = space_seed
+        self.seed = 0
+        self.gameplay = Random()
+        self.start_gameplay()
+
+    def create_space_seed(self) -> int:
+        """
+        Seed для нового космоса.
+        """
+        if self.space_seed is not None:
+            return self.space_seed
+        return SystemRandom().randrange(self.SEED_LIMIT)
+
+    def __get_stream_seed(self, stream: str, keys: Tuple) -> str:
+        return ':'.join([str(self.seed), stream] + [str(key) for key in keys])
+
+    def get_generator(self, *keys) -> Random:
+        """
+        Новый генератор для генерации, определяемой ключами.
+        """
+        return Random(self.__get_stream_seed('generation', keys))
+
+    def start_gameplay(self, *keys):
+        """
+        Начать игровой поток заново для сцены, определяемой ключами.
+        """
+        self.gameplay.seed(self.__get_stream_seed('gameplay', keys))
+
+
+def is_random_proc(generator: Random, chance: int = 50) -> bool:
     """
     min chance value = 0
     max chance value = 100
     """
-    return randint(0, 99) < chance
+    return generator.randint(0, 99) < chance
 
 
-def weight_choice(arr: List[Tuple[int, any]]) -> any:
+def weight_choice(generator: Random, arr: List[Tuple[int, any]]) -> any:
     """
     Выбрать случайный элемент из списка arr. O(arr)
 
+    :param generator: генератор случайных чисел
     :param l: Список[(вероятность, элемент)]. Сумма вероятностей должна быть равна 100
     :return: выбранный элемент
     """
-    choice_int = randint(0, 99)
+    choice_int = generator.randint(0, 99)
 
     chance = 0
     for item in arr:
@@ -29,16 +73,16 @@ def weight_choice(arr: List[Tuple[int, any]]) -> any:
     raise Exception('sum of arr not equal 100')
 
 
-def is_accurate_random_proc(chance: float) -> bool:
+def is_accurate_random_proc(generator: Random, chance: float) -> bool:
     """
     min chance value = 0
     max chance value = 100
     """
-    return random() * 100.0 < chance
+    return generator.random() * 100.0 < chance
 
 
-def shuffle(arr):
+def shuffle(generator: Random, arr):
     for i in range(len(arr) - 1, 0, -1):
-        j = randint(0, i)
+        j = generator.randint(0, i)
 
         arr[i], arr[j] = arr[j], arr[i]
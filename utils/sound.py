@@ -11,7 +11,10 @@ class SoundManager:
     """
     Загружает все звуки/музыку и осуществляет быстрый доступ к ним а так же работу с ними
     Возможна рекурсивная загруска всех wav картинок
+
+    Если enabled ложно (безоконный режим игры), звуки не загружаются и не проигрываются, микшер не нужен.
     """
+    enabled = True
     sounds = {}
     SOUND_PATH = 'sounds'
     VOLUME = {
@@ -47,6 +50,8 @@ class SoundManager:
         Установка конкретных значений, что бы звуки были
         примерно одной громкости
         """
+        if not SoundManager.enabled:
+            return
         for name, volume in SoundManager.VOLUME.items():
             SoundManager.set_volume(name, volume)
 
@@ -55,6 +60,8 @@ class SoundManager:
         """
         по умолчанию считает, что все звуки wav.
         """
+        if not SoundManager.enabled:
+            return
         SoundManager.load_dir(SoundManager.SOUND_PATH)
 
     @staticmethod
@@ -102,6 +109,8 @@ class SoundManager:
 
     @staticmethod
     def play_sound(sound_path: str):
+        if not SoundManager.enabled:
+            return
         sound = SoundManager.get_sound(sound_path)
         if isinstance(sound, dict):
             raise ValueError(sound + ' is a dir, not a file')
@@ -0,0 +1,156 @@
+"""
+LRU-кэши картинок с ограничением по памяти: увеличенные и повернутые картинки ImageManager, куски
+предотрисованной сетки и т.п.
+"""
+from collections import OrderedDict
+from math import pi
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+
+def get_surface_bytes(surface: pygame.Surface) -> int:
+    """
+    Сколько памяти занимают пиксели поверхности.
+    """
+    w, h = surface.get_size()
+    return w * h * surface.get_bytesize()
+
+
+class SurfaceCache:
+    """
+    LRU-кэш поверхностей по произвольному ключу. Объем ограничен max_bytes (сумма размеров поверхностей):
+    при переполнении удаляются картинки, которые дольше всего не запрашивались.
+
+    :param max_bytes: ограничение памяти под картинки в байтах
+    """
+    MAX_BYTES = 64 * 2 ** 20
+    NAME = 'surface cache'
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        """
+        Удалить все картинки и обнулить статистику.
+        """
+        self.__surfaces = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[pygame.Surface]:
+        """
+        :return: картинка или None, если ее нет в кэше
+        """
+        surface = self.__surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__surfaces.move_to_end(key)
+        return surface
+
+    def put(self, key: Hashable, surface: pygame.Surface):
+        """
+        Добавить картинку. Если она больше всего кэша, она не сохраняется.
+        """
+        surface_bytes = get_surface_bytes(surface)
+        if surface_bytes > self.max_bytes:
+            return
+        if key in self.__surfaces:
+            self.bytes -= get_surface_bytes(self.__surfaces.pop(key))
+        self.__surfaces[key] = surface
+        self.bytes += surface_bytes
+
+        while self.bytes > self.max_bytes:
+            key, old_surface = self.__surfaces.popitem(last=False)
+            self.bytes -= get_surface_bytes(old_surface)
+            self.evictions += 1
+
+    def pop(self, key: Hashable):
+        """
+        Удалить картинку, если она есть.
+        """
+        surface = self.__surfaces.pop(key, None)
+        if surface is not None:
+            self.bytes -= get_surface_bytes(surface)
+
+    def items(self) -> List[Tuple[Hashable, pygame.Surface]]:
+        """
+        Все картинки с ключами, от давно запрошенных к недавним. Порядок и статистика не меняются.
+        """
+        return list(self.__surfaces.items())
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__surfaces
+
+    def __len__(self) -> int:
+        return len(self.__surfaces)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Статистика с последней очистки: попадания, промахи, доля попаданий, вытеснения, количество картинок и
+        занятая память.
+        """
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0,
+            'evictions': self.evictions,
+            'entries': len(self),
+            'bytes': self.bytes,
+        }
+
+    def get_report(self) -> str:
+        """
+        Статистика одной строкой.
+        """
+        stats = self.get_stats()
+        return '{}: {} hits, {} misses ({:.1%} hits), {} evicted, {} images, {:.1f} MB'.format(
+            self.NAME, stats['hits'], stats['misses'], stats['hit_rate'], stats['evictions'], stats['entries'],
+            stats['bytes'] / 2 ** 20)
+
+
+class TransformCache(SurfaceCache):
+    """
+    LRU-кэш результатов ImageManager.resize и ImageManager.rotate.
+
+    Угол квантуется: полный оборот делится на angle_steps частей, и картинка поворачивается на ближайший
+    к нужному угол из них. Чем больше частей, тем точнее поворот и тем больше разных картинок в кэше.
+
+    :param angle_steps: на сколько частей делится полный оборот
+    :param max_bytes: ограничение памяти под картинки в байтах
+    """
+    ANGLE_STEPS = 360
+    NAME = 'transform cache'
+
+    def __init__(self, angle_steps: int = ANGLE_STEPS, max_bytes: int = SurfaceCache.MAX_BYTES):
+        self.angle_steps = angle_steps
+        super().__init__(max_bytes)
+
+    def configure(self, angle_steps: int = None, max_bytes: int = None):
+        """
+        Поменять настройки кэша. Кэш очищается, т.к. старые углы квантованы иначе.
+        """
+        if angle_steps is not None:
+            self.angle_steps = angle_steps
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self.clear()
+
+    def quantize_angle(self, angle: float) -> int:
+        """
+        :param angle: угол в радианах
+        :return: номер ближайшего угла из angle_steps
+        """
+        return round(angle * self.angle_steps / (2 * pi)) % self.angle_steps
+
+    def get_angle(self, angle_index: int) -> float:
+        """
+        Угол в радианах по его номеру.
+        """
+        return angle_index * 2 * pi / self.angle_steps
@@ -4,7 +4,6 @@ from geometry.segment import Segment
 from geometry.vector import vector_from_length_angle
 from geometry.point import Point
 from utils.sound import SoundManager
-from random import randrange
 from drawable_objects.slash import PlayerSlash, EnemySlash
 
 
@@ -188,6 +187,7 @@ class RangedWeapon(Weapon):
         :param pos: откуда производится выстрел -> Point
         :param angle: под каким углом производится выстрел -> float
         """
+        randrange = self.scene.game.random_manager.gameplay.randrange
         for _ in range(self.shells):
             bullet = BULLET_CLASS[self.ammo_type](self, pos, angle + randrange(-100, 100) /
                                                   (self.accuracy ** 2 - self.accuracy * 20 + 100), self.damage)
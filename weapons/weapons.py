@@ -282,7 +282,7 @@ class Knife(MeleeWeapon):
     """
     Нож(только для Player)
     """
-    IMAGE_NAME = 'weapons.knife'
+    IMAGE_NAME = 'weapons_on_floor.knife'
     ANIMATION = [
         'moving_objects.player.knife1',
         'moving_objects.player.knife2',